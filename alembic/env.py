@@ -22,6 +22,15 @@ def get_url():
     return settings.DATABASE_URL
 
 
+# Maintained only by migrations (generated tsvector columns and their GIN
+# indexes are intentionally not mapped on the models)
+UNMAPPED_OBJECTS = {"search_vector", "ix_tasks_search_vector", "ix_comments_search_vector"}
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name in UNMAPPED_OBJECTS)
+
+
 async def run_migrations_online() -> None:
     connectable = async_engine_from_config(
         config.get_section(config.config_ini_section),
@@ -42,6 +51,7 @@ def do_run_migrations(connection: Connection) -> None:
         target_metadata=target_metadata,
         compare_type=True,
         compare_server_default=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -54,6 +64,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
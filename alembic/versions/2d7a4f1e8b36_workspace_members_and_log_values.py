@@ -0,0 +1,44 @@
+"""workspace members and activity log values
+
+Revision ID: 2d7a4f1e8b36
+Revises: 5b3d4c5ceff5
+Create Date: 2026-10-17 09:05:31.402217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d7a4f1e8b36'
+down_revision: Union[str, Sequence[str], None] = '5b3d4c5ceff5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The models gained these after the initial revision was generated
+    op.create_table('workspace_members',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('workspace_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_workspace_members_id'), 'workspace_members', ['id'], unique=False)
+    op.add_column('activity_logs', sa.Column('old_value', sa.Text(), nullable=True))
+    op.add_column('activity_logs', sa.Column('new_value', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('activity_logs', 'new_value')
+    op.drop_column('activity_logs', 'old_value')
+    op.drop_index(op.f('ix_workspace_members_id'), table_name='workspace_members')
+    op.drop_table('workspace_members')
@@ -0,0 +1,119 @@
+"""project task stats
+
+Revision ID: 3f8a6c1d9e20
+Revises: e71f0b9a4c2d
+Create Date: 2026-10-17 12:41:05.803116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a6c1d9e20'
+down_revision: Union[str, Sequence[str], None] = 'e71f0b9a4c2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers with transition tables: one upsert per statement,
+# so bulk UPDATEs, multi-row INSERTs and COPY imports stay cheap and exact.
+DELTAS = """
+    SELECT project_id,
+           sum(sign * (status = 'TODO')::int)        AS todo,
+           sum(sign * (status = 'IN_PROGRESS')::int) AS in_progress,
+           sum(sign * (status = 'DONE')::int)        AS done
+    FROM ({rows}) changed
+    GROUP BY project_id
+"""
+
+UPSERT = """
+    INSERT INTO project_task_stats AS s
+        (project_id, todo_count, in_progress_count, done_count, updated_at)
+    SELECT project_id, todo, in_progress, done, timezone('utc', now())
+    FROM ({deltas}) d
+    WHERE todo <> 0 OR in_progress <> 0 OR done <> 0
+    ON CONFLICT (project_id) DO UPDATE SET
+        todo_count = s.todo_count + EXCLUDED.todo_count,
+        in_progress_count = s.in_progress_count + EXCLUDED.in_progress_count,
+        done_count = s.done_count + EXCLUDED.done_count,
+        updated_at = EXCLUDED.updated_at;
+"""
+
+NEW_ROWS = "SELECT project_id, status::text AS status, 1 AS sign FROM new_rows"
+OLD_ROWS = "SELECT project_id, status::text AS status, -1 AS sign FROM old_rows"
+
+
+def _upsert(rows: str) -> str:
+    return UPSERT.format(deltas=DELTAS.format(rows=rows))
+
+
+FUNCTION = f"""
+CREATE OR REPLACE FUNCTION project_task_stats_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_upsert(NEW_ROWS)}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_upsert(OLD_ROWS)}
+    ELSE
+        {_upsert(NEW_ROWS + " UNION ALL " + OLD_ROWS)}
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = [
+    ("project_task_stats_ins", "AFTER INSERT", "REFERENCING NEW TABLE AS new_rows"),
+    ("project_task_stats_upd", "AFTER UPDATE", "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("project_task_stats_del", "AFTER DELETE", "REFERENCING OLD TABLE AS old_rows"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_task_stats',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('todo_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('in_progress_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('done_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+    op.execute(FUNCTION)
+    for name, when, referencing in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} {when} ON tasks {referencing} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION project_task_stats_apply()"
+        )
+
+    # Backfill (triggers are already live, so nothing written from here on is missed)
+    op.execute(
+        """
+        INSERT INTO project_task_stats (project_id, todo_count, in_progress_count, done_count, updated_at)
+        SELECT project_id,
+               count(*) FILTER (WHERE status = 'TODO'),
+               count(*) FILTER (WHERE status = 'IN_PROGRESS'),
+               count(*) FILTER (WHERE status = 'DONE'),
+               timezone('utc', now())
+        FROM tasks
+        GROUP BY project_id
+        ON CONFLICT (project_id) DO UPDATE SET
+            todo_count = EXCLUDED.todo_count,
+            in_progress_count = EXCLUDED.in_progress_count,
+            done_count = EXCLUDED.done_count,
+            updated_at = EXCLUDED.updated_at
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS project_task_stats_apply()")
+    op.drop_table('project_task_stats')
@@ -0,0 +1,53 @@
+"""task listing index include columns
+
+Revision ID: 4c8e1d6b9a73
+Revises: d8f2b6a1c4e7
+Create Date: 2026-10-17 22:14:06.913540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e1d6b9a73'
+down_revision: Union[str, Sequence[str], None] = 'd8f2b6a1c4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name -> (key columns, INCLUDE columns); see Task.__table_args__
+INDEXES = {
+    'ix_tasks_project_id_created_at': (
+        ['project_id', 'created_at', 'id'], ['status', 'assignee_id', 'title'],
+    ),
+    'ix_tasks_project_id_status_created_at': (
+        ['project_id', 'status', 'created_at', 'id'], ['assignee_id', 'title'],
+    ),
+}
+
+
+def _rebuild(include: bool) -> None:
+    # Build the replacement next to the old index, then swap names, so the
+    # listing keeps an index to use throughout and writes are never blocked
+    with op.get_context().autocommit_block():
+        for name, (columns, extra) in INDEXES.items():
+            op.create_index(
+                f'{name}_new', 'tasks', columns,
+                postgresql_include=extra if include else [],
+                postgresql_concurrently=True,
+            )
+            op.drop_index(name, table_name='tasks', postgresql_concurrently=True)
+            op.execute(sa.text(f'ALTER INDEX {name}_new RENAME TO {name}'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rebuild(include=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild(include=False)
@@ -0,0 +1,63 @@
+"""row versions
+
+Revision ID: 6b2e8f4a0d17
+Revises: a4d9e2f7c1b5
+Create Date: 2026-10-17 14:20:37.915402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b2e8f4a0d17'
+down_revision: Union[str, Sequence[str], None] = 'a4d9e2f7c1b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('workspaces', 'projects', 'tasks', 'comments', 'workspace_members')
+
+# One sequence shared by every table: a new row always gets a version above any
+# existing one, so (count, max(version)) is a cheap change detector for ETags.
+FUNCTION = """
+CREATE OR REPLACE FUNCTION row_version_touch() RETURNS trigger AS $$
+BEGIN
+    NEW.version := nextval('row_version_seq');
+    NEW.updated_at := timezone('utc', now());
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE IF NOT EXISTS row_version_seq AS bigint")
+    op.execute(FUNCTION)
+
+    for table in TABLES:
+        # Constant / stable defaults: no table rewrite, existing rows start at version 0
+        op.add_column(table, sa.Column(
+            'version', sa.BigInteger(), server_default=sa.text('0'), nullable=False,
+        ))
+        op.add_column(table, sa.Column(
+            'updated_at', sa.DateTime(),
+            server_default=sa.text("timezone('utc', now())"), nullable=False,
+        ))
+        op.execute(
+            f"CREATE TRIGGER {table}_row_version BEFORE INSERT OR UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION row_version_touch()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_row_version ON {table}")
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'version')
+    op.execute("DROP FUNCTION IF EXISTS row_version_touch()")
+    op.execute("DROP SEQUENCE IF EXISTS row_version_seq")
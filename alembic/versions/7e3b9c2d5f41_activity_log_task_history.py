@@ -0,0 +1,48 @@
+"""activity logs outlive their task
+
+Revision ID: 7e3b9c2d5f41
+Revises: 4c8e1d6b9a73
+Create Date: 2026-10-18 10:12:44.218305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3b9c2d5f41'
+down_revision: Union[str, Sequence[str], None] = '4c8e1d6b9a73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # task_id becomes a plain reference so deleting a task keeps its history
+    op.drop_constraint('activity_logs_task_id_fkey', 'activity_logs', type_='foreignkey')
+    op.add_column('activity_logs', sa.Column('project_id', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE activity_logs l SET project_id = t.project_id FROM tasks t WHERE t.id = l.task_id"
+    )
+    # Deletes logged while the foreign key forced task_id to NULL carry the id in old_value
+    op.execute(
+        "UPDATE activity_logs SET task_id = (old_value::json ->> 'id')::int "
+        "WHERE action = 'TASK_DELETED' AND task_id IS NULL AND old_value LIKE '{\"id\" : %'"
+    )
+    op.create_index(
+        'ix_activity_logs_project_id_created_at', 'activity_logs',
+        ['project_id', 'created_at', 'id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activity_logs_project_id_created_at', table_name='activity_logs')
+    op.drop_column('activity_logs', 'project_id')
+    op.execute(
+        "UPDATE activity_logs l SET task_id = NULL "
+        "WHERE task_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM tasks t WHERE t.id = l.task_id)"
+    )
+    op.create_foreign_key('activity_logs_task_id_fkey', 'activity_logs', 'tasks', ['task_id'], ['id'])
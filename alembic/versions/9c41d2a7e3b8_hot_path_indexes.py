@@ -0,0 +1,83 @@
+"""hot path indexes
+
+Revision ID: 9c41d2a7e3b8
+Revises: 2d7a4f1e8b36
+Create Date: 2026-10-17 09:12:44.120311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41d2a7e3b8'
+down_revision: Union[str, Sequence[str], None] = '2d7a4f1e8b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, extra kwargs)
+INDEXES = [
+    # routes_activity_logs: filter by task/user, newest first (id breaks ties for keyset paging)
+    ('ix_activity_logs_task_id_created_at', 'activity_logs', ['task_id', 'created_at', 'id'], {}),
+    ('ix_activity_logs_user_id_created_at', 'activity_logs', ['user_id', 'created_at', 'id'], {}),
+    # date_from/date_to range scans; activity_logs is append-only so BRIN stays tiny
+    ('ix_activity_logs_created_at_brin', 'activity_logs', ['created_at'], {'postgresql_using': 'brin'}),
+    # routes_comments.get_comments
+    ('ix_comments_task_id_created_at', 'comments', ['task_id', 'created_at'], {}),
+    # project log join (activity_logs -> tasks.project_id)
+    ('ix_tasks_project_id', 'tasks', ['project_id'], {}),
+    # project listing / ownership checks
+    ('ix_projects_workspace_id', 'projects', ['workspace_id'], {}),
+    ('ix_workspaces_owner_id', 'workspaces', ['owner_id'], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One membership row per (workspace, user); drop duplicates before enforcing it
+    op.execute(
+        """
+        DELETE FROM workspace_members a
+        USING workspace_members b
+        WHERE a.workspace_id = b.workspace_id
+          AND a.user_id = b.user_id
+          AND a.id > b.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_workspace_members_workspace_id_user_id',
+        'workspace_members',
+        ['workspace_id', 'user_id'],
+    )
+
+    # Build the hot-path indexes without blocking writes on large tables
+    with op.get_context().autocommit_block():
+        for name, table, columns, kw in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                **kw,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+
+    op.drop_constraint(
+        'uq_workspace_members_workspace_id_user_id',
+        'workspace_members',
+        type_='unique',
+    )
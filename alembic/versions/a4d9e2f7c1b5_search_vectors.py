@@ -0,0 +1,59 @@
+"""search vectors
+
+Revision ID: a4d9e2f7c1b5
+Revises: 3f8a6c1d9e20
+Create Date: 2026-10-17 13:42:10.281734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9e2f7c1b5'
+down_revision: Union[str, Sequence[str], None] = '3f8a6c1d9e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Title ranks above description (weights A / B). Adding a STORED generated
+    # column rewrites the table once; Postgres keeps it current from then on.
+    op.execute(
+        """
+        ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE comments ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_search_vector', 'tasks', ['search_vector'],
+            postgresql_using='gin', if_not_exists=True, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_comments_search_vector', 'comments', ['search_vector'],
+            postgresql_using='gin', if_not_exists=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_comments_search_vector', table_name='comments',
+                      if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_tasks_search_vector', table_name='tasks',
+                      if_exists=True, postgresql_concurrently=True)
+    op.execute("ALTER TABLE comments DROP COLUMN IF EXISTS search_vector")
+    op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector")
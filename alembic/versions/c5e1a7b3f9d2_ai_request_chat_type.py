@@ -0,0 +1,30 @@
+"""ai request chat type
+
+Revision ID: c5e1a7b3f9d2
+Revises: 6b2e8f4a0d17
+Create Date: 2026-10-17 15:48:02.447129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e1a7b3f9d2'
+down_revision: Union[str, Sequence[str], None] = '6b2e8f4a0d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # New enum values can't be used inside the transaction that adds them
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE airequesttype ADD VALUE IF NOT EXISTS 'CHAT'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres cannot drop a single enum value; CHAT rows would have to go first.
+    pass
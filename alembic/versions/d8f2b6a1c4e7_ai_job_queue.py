@@ -0,0 +1,56 @@
+"""ai job queue
+
+Revision ID: d8f2b6a1c4e7
+Revises: c5e1a7b3f9d2
+Create Date: 2026-10-17 17:05:31.628104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f2b6a1c4e7'
+down_revision: Union[str, Sequence[str], None] = 'c5e1a7b3f9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ai_requests', sa.Column('payload', sa.JSON(), nullable=True))
+    op.add_column('ai_requests', sa.Column('error', sa.Text(), nullable=True))
+    op.add_column('ai_requests', sa.Column(
+        'attempts', sa.Integer(), server_default=sa.text('0'), nullable=False,
+    ))
+    op.add_column('ai_requests', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('ai_requests', sa.Column('finished_at', sa.DateTime(), nullable=True))
+
+    # Partial indexes stay as small as the queue, not the whole history
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_ai_requests_pending', 'ai_requests', ['id'],
+            postgresql_where=sa.text("status = 'PENDING'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_ai_requests_processing', 'ai_requests', ['started_at'],
+            postgresql_where=sa.text("status = 'PROCESSING'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_ai_requests_processing', table_name='ai_requests',
+                      if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_ai_requests_pending', table_name='ai_requests',
+                      if_exists=True, postgresql_concurrently=True)
+    op.drop_column('ai_requests', 'finished_at')
+    op.drop_column('ai_requests', 'started_at')
+    op.drop_column('ai_requests', 'attempts')
+    op.drop_column('ai_requests', 'error')
+    op.drop_column('ai_requests', 'payload')
@@ -0,0 +1,58 @@
+"""project task listing indexes
+
+Revision ID: e71f0b9a4c2d
+Revises: 9c41d2a7e3b8
+Create Date: 2026-10-17 11:03:27.554102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e71f0b9a4c2d'
+down_revision: Union[str, Sequence[str], None] = '9c41d2a7e3b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_project_id_created_at', 'tasks',
+            ['project_id', 'created_at', 'id'],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tasks_project_id_status_created_at', 'tasks',
+            ['project_id', 'status', 'created_at', 'id'],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tasks_project_id_lower_title', 'tasks',
+            ['project_id', sa.text('lower(title) text_pattern_ops')],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+        # (project_id, created_at, id) covers every lookup the plain index served
+        op.drop_index(
+            'ix_tasks_project_id', table_name='tasks',
+            if_exists=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_project_id', 'tasks', ['project_id'],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+        for name in (
+            'ix_tasks_project_id_lower_title',
+            'ix_tasks_project_id_status_created_at',
+            'ix_tasks_project_id_created_at',
+        ):
+            op.drop_index(name, table_name='tasks', if_exists=True, postgresql_concurrently=True)
@@ -1,21 +1,82 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, and_
+from sqlalchemy import select, desc, and_, exists, or_
 
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.models.activity_log import ActivityLog
 from app.models.task import Task
 from app.schemas.activity_log_schema import ActivityLogResponse
+from app.utils import fast_json
 from app.utils.dependencies import get_current_user  # ensures auth
-from app.utils.pagination import get_pagination_params
+from app.utils.pagination import (
+    get_pagination_params,
+    keyset_predicate,
+    encode_cursor,
+    estimate_count,
+)
 
 router = APIRouter(prefix="/logs", tags=["Activity Logs"])
 
+CURSOR_DESCRIPTION = "Opaque cursor from X-Next-Cursor; when set, `page` is ignored"
 
-# Helper: base query builder (ActivityLog table)
+
+# Helper: base query builder (ActivityLog table).
+# Plain columns (exactly ActivityLogResponse's fields) rather than ORM entities:
+# no identity-map bookkeeping, and rows can go straight to orjson.
 def _base_logs_select():
-    return select(ActivityLog)
+    return select(
+        ActivityLog.id, ActivityLog.action, ActivityLog.old_value, ActivityLog.new_value,
+        ActivityLog.user_id, ActivityLog.task_id, ActivityLog.created_at,
+    )
+
+
+# Helper: logs of a project's tasks, including tasks deleted since.
+# Task mutations record project_id on the log and deleting a task fills it in
+# on the rest of its history; other logs of live tasks are found via tasks.
+def _in_project(project_id: int):
+    return or_(
+        ActivityLog.project_id == project_id,
+        ActivityLog.task_id.in_(select(Task.id).where(Task.project_id == project_id)),
+    )
+
+
+# Helper: apply page/page_size OR cursor paging, newest first.
+# Sets X-Next-Cursor (and X-Total-Estimate when asked) on the response.
+async def _paginate(
+    db: AsyncSession,
+    stmt,
+    response: Response,
+    page: int | None,
+    page_size: int | None,
+    cursor: str | None,
+    estimate_total: bool,
+):
+    offset, limit = get_pagination_params(page, page_size)
+
+    if estimate_total:
+        response.headers["X-Total-Estimate"] = str(await estimate_count(db, stmt))
+
+    if cursor:
+        stmt = stmt.where(keyset_predicate(ActivityLog.created_at, ActivityLog.id, cursor))
+        offset = 0
+
+    stmt = (
+        stmt.order_by(desc(ActivityLog.created_at), desc(ActivityLog.id))
+        .offset(offset)
+        .limit(limit)
+    )
+
+    result = await db.execute(stmt)
+    logs = result.all()
+
+    if len(logs) == limit:
+        last = logs[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+
+    if fast_json.enabled():
+        return fast_json.json_response(fast_json.encode_rows(logs), response)
+    return logs
 
 
 # ---------------------------------------------------------
@@ -23,6 +84,7 @@ def _base_logs_select():
 # ---------------------------------------------------------
 @router.get("", response_model=list[ActivityLogResponse])
 async def get_logs(
+    response: Response,
     action: str | None = Query(None, description="Filter by action name, e.g. STATUS_CHANGED"),
     user_id: int | None = Query(None),
     project_id: int | None = Query(None),
@@ -31,17 +93,15 @@ async def get_logs(
     date_to: datetime | None = Query(None),
     page: int | None = Query(1, ge=1),
     page_size: int | None = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    estimate_total: bool = Query(False, description="Return planner row estimate in X-Total-Estimate"),
+    db: AsyncSession = Depends(get_read_db),
     _ = Depends(get_current_user),
 ):
-    offset, limit = get_pagination_params(page, page_size)
-
     stmt = _base_logs_select()
 
-    # If project filter present, join via Task
     if project_id is not None:
-        stmt = stmt.join(Task, ActivityLog.task_id == Task.id)
-        stmt = stmt.where(Task.project_id == project_id)
+        stmt = stmt.where(_in_project(project_id))
 
     # Build other filters
     filters = []
@@ -59,11 +119,7 @@ async def get_logs(
     if filters:
         stmt = stmt.where(and_(*filters))
 
-    stmt = stmt.order_by(desc(ActivityLog.created_at)).offset(offset).limit(limit)
-
-    result = await db.execute(stmt)
-    logs = result.scalars().all()
-    return logs
+    return await _paginate(db, stmt, response, page, page_size, cursor, estimate_total)
 
 
 # ---------------------------------------------------------
@@ -72,29 +128,24 @@ async def get_logs(
 @router.get("/tasks/{task_id}", response_model=list[ActivityLogResponse])
 async def get_task_logs(
     task_id: int,
+    response: Response,
     page: int | None = Query(1, ge=1),
     page_size: int | None = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    estimate_total: bool = Query(False),
+    db: AsyncSession = Depends(get_read_db),
     _ = Depends(get_current_user),
 ):
-    offset, limit = get_pagination_params(page, page_size)
-
-    # Ensure task exists (optional sanity check)
-    res = await db.execute(select(Task).where(Task.id == task_id))
-    task = res.scalar_one_or_none()
-    if not task:
+    # Ensure the task exists, or existed (a deleted task keeps its history)
+    known = await db.scalar(select(
+        exists().where(Task.id == task_id) | exists().where(ActivityLog.task_id == task_id)
+    ))
+    if not known:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    stmt = (
-        select(ActivityLog)
-        .where(ActivityLog.task_id == task_id)
-        .order_by(desc(ActivityLog.created_at))
-        .offset(offset)
-        .limit(limit)
-    )
+    stmt = _base_logs_select().where(ActivityLog.task_id == task_id)
 
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    return await _paginate(db, stmt, response, page, page_size, cursor, estimate_total)
 
 
 # ---------------------------------------------------------
@@ -103,25 +154,17 @@ async def get_task_logs(
 @router.get("/projects/{project_id}", response_model=list[ActivityLogResponse])
 async def get_project_logs(
     project_id: int,
+    response: Response,
     page: int | None = Query(1, ge=1),
     page_size: int | None = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    estimate_total: bool = Query(False),
+    db: AsyncSession = Depends(get_read_db),
     _ = Depends(get_current_user),
 ):
-    offset, limit = get_pagination_params(page, page_size)
+    stmt = _base_logs_select().where(_in_project(project_id))
 
-    # join ActivityLog -> Task -> filter by project_id
-    stmt = (
-        select(ActivityLog)
-        .join(Task, ActivityLog.task_id == Task.id)
-        .where(Task.project_id == project_id)
-        .order_by(desc(ActivityLog.created_at))
-        .offset(offset)
-        .limit(limit)
-    )
-
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    return await _paginate(db, stmt, response, page, page_size, cursor, estimate_total)
 
 
 # ---------------------------------------------------------
@@ -130,20 +173,14 @@ async def get_project_logs(
 @router.get("/users/{user_id}", response_model=list[ActivityLogResponse])
 async def get_user_logs(
     user_id: int,
+    response: Response,
     page: int | None = Query(1, ge=1),
     page_size: int | None = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    estimate_total: bool = Query(False),
+    db: AsyncSession = Depends(get_read_db),
     _ = Depends(get_current_user),
 ):
-    offset, limit = get_pagination_params(page, page_size)
+    stmt = _base_logs_select().where(ActivityLog.user_id == user_id)
 
-    stmt = (
-        select(ActivityLog)
-        .where(ActivityLog.user_id == user_id)
-        .order_by(desc(ActivityLog.created_at))
-        .offset(offset)
-        .limit(limit)
-    )
-
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    return await _paginate(db, stmt, response, page, page_size, cursor, estimate_total)
@@ -1,17 +1,55 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.db.session import get_db
-from app.services.ai_service import chat
+from app.schemas.ai_schema import AIChatRequest, AIJobCreate, AIJobResponse
+from app.services import ai_job_service
+from app.services.ai_service import chat, chat_stream
 from app.utils.dependencies import get_current_user
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # don't let nginx buffer the stream
+}
+
 
 @router.post("/chat")
-async def ai_chat(payload: dict, 
+async def ai_chat(payload: AIChatRequest,
                   user=Depends(get_current_user),
                   db: AsyncSession = Depends(get_db)):
 
-    messages = payload.get("messages", [])
+    messages = [m.model_dump() for m in payload.messages]
+
+    if payload.stream:
+        events = await chat_stream(messages, user.id, db)
+        return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
+
     result = await chat(messages, user.id, db)
     return result
+
+
+# ---------------------------------------------------------
+# Background jobs: enqueue, then poll / long-poll for the result
+# ---------------------------------------------------------
+@router.post("/jobs", response_model=AIJobResponse, status_code=202)
+async def enqueue_ai_job(payload: AIJobCreate,
+                         user=Depends(get_current_user),
+                         db: AsyncSession = Depends(get_db)):
+    job = await ai_job_service.enqueue(db, user.id, payload)
+    await db.commit()
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=AIJobResponse)
+async def get_ai_job(job_id: int,
+                     wait: float = Query(0, ge=0, le=settings.AI_JOB_MAX_WAIT_SECONDS,
+                                         description="Seconds to wait for the job to finish"),
+                     user=Depends(get_current_user),
+                     db: AsyncSession = Depends(get_db)):
+    job = await ai_job_service.wait_for_job(db, user.id, job_id, wait)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    return job
@@ -5,12 +5,21 @@ from sqlalchemy import select
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.user_schema import UserCreate, UserLogin, TokenResponse, UserOut
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.hashing_pool import HashingPoolBusy
+from app.core.security import hash_password_async, verify_password_async, create_access_token
 from app.utils.dependencies import get_current_user
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
+def _hashing_busy():
+    return HTTPException(
+        status_code=503,
+        detail="Too many authentication requests, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/signup", response_model=UserOut, status_code=201)
 async def signup(data: UserCreate, db: AsyncSession = Depends(get_db)):
     # check existing user
@@ -18,10 +27,15 @@ async def signup(data: UserCreate, db: AsyncSession = Depends(get_db)):
     if r.scalar_one_or_none():
         raise HTTPException(status_code=400, detail="Email already exists")
 
+    try:
+        hashed = await hash_password_async(data.password)
+    except HashingPoolBusy:
+        raise _hashing_busy()
+
     new_user = User(
         email=data.email,
         full_name=data.full_name,
-        hashed_password=hash_password(data.password)
+        hashed_password=hashed
     )
 
     db.add(new_user)
@@ -36,7 +50,15 @@ async def login(data: UserLogin, db: AsyncSession = Depends(get_db)):
     r = await db.execute(select(User).where(User.email == data.email))
     user = r.scalar_one_or_none()
 
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    try:
+        valid = await verify_password_async(data.password, user.hashed_password)
+    except HashingPoolBusy:
+        raise _hashing_busy()
+
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     token = create_access_token({"sub": str(user.id)})
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import insert, select, update, delete
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.comment import Comment
+from app.models.project import Project
 from app.models.task import Task
 from app.schemas.comment_schema import (
     CommentCreate,
     CommentUpdate,
     CommentResponse,
 )
+from app.services import ai_context_service
+from app.services.authz_service import accessible_workspace_ids
+from app.utils import fast_json
 from app.utils.dependencies import get_current_user
+from app.utils.etag import collection_version, make_etag, not_modified
+from app.utils.response_cache import response_cache
 
 
 router = APIRouter(prefix="/comments", tags=["Comments"])
@@ -41,22 +47,69 @@ async def create_comment(
     )
 
     result = await db.execute(stmt)
+    comment = result.scalar_one()
     await db.commit()
+    await response_cache.invalidate(f"task:{task_id}")
+    ai_context_service.on_comment_written(comment)
 
-    return result.scalar_one()
+    return comment
 
 # GET ALL COMMENTS FOR A TASK
 
 @router.get("/{task_id}", response_model=list[CommentResponse])
 async def get_comments(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
-    stmt = select(Comment).where(Comment.task_id == task_id).order_by(Comment.created_at)
+    # Access check, project (cache tag) and ETag inputs in one round trip;
+    # the aggregates are served by ix_comments_task_id_created_at
+    row = (await db.execute(
+        select(
+            Task.project_id,
+            *(
+                select(aggregate).where(Comment.task_id == task_id).scalar_subquery()
+                for aggregate in collection_version(Comment.version)
+            ),
+        )
+        .join(Project, Project.id == Task.project_id)
+        .where(
+            Task.id == task_id,
+            Project.workspace_id.in_(accessible_workspace_ids(current_user.id)),
+        )
+    )).one_or_none()
 
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    project_id, *versions = row
+    cached = not_modified(request, response, make_etag("comments", task_id, *versions))
+    if cached:
+        return cached
+
+    async def load(db: AsyncSession):
+        if fast_json.enabled():
+            stmt = (
+                select(Comment.id, Comment.task_id, Comment.user_id, Comment.content, Comment.created_at)
+                .where(Comment.task_id == task_id)
+                .order_by(Comment.created_at)
+            )
+            return fast_json.encode_rows((await db.execute(stmt)).all())
+
+        stmt = select(Comment).where(Comment.task_id == task_id).order_by(Comment.created_at)
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    return await response_cache.cached(
+        request, response,
+        scope=f"task:{task_id}",
+        tags=[f"task:{task_id}", f"project:{project_id}"],
+        model=list[CommentResponse],
+        loader=load,
+        db=db,
+    )
 
 # UPDATE COMMENT
 @router.put("/{comment_id}", response_model=CommentResponse)
@@ -87,9 +140,12 @@ async def update_comment(
     )
 
     result = await db.execute(upd)
+    updated = result.scalar_one()
     await db.commit()
+    await response_cache.invalidate(f"task:{comment.task_id}")
+    ai_context_service.on_comment_written(updated)
 
-    return result.scalar_one()
+    return updated
 
 # DELETE COMMENT
 @router.delete("/{comment_id}")
@@ -111,5 +167,7 @@ async def delete_comment(
     del_stmt = delete(Comment).where(Comment.id == comment_id)
     await db.execute(del_stmt)
     await db.commit()
+    await response_cache.invalidate(f"task:{comment.task_id}")
+    ai_context_service.on_comment_deleted(comment_id)
 
     return {"message": "Comment deleted successfully"}
@@ -0,0 +1,90 @@
+from datetime import datetime
+from enum import Enum
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.db.session import read_session_factory
+from app.services import export_service
+from app.utils.dependencies import get_current_user
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+# Helper: wrap an export query into a streamed download
+async def _export_response(request: Request, name: str, stmt, fmt: ExportFormat, gzip: bool):
+    filename = f"{name}.{fmt.value}" + (".gz" if gzip else "")
+    factory = await read_session_factory(request)
+    return StreamingResponse(
+        export_service.stream_export(stmt, fmt.value, gzip, name, session_factory=factory),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+class ExportFilters:
+    def __init__(
+        self,
+        workspace_id: int | None = Query(None),
+        project_id: int | None = Query(None),
+        date_from: datetime | None = Query(None),
+        date_to: datetime | None = Query(None),
+        format: ExportFormat = Query(ExportFormat.ndjson),
+        gzip: bool = Query(False),
+    ):
+        self.workspace_id = workspace_id
+        self.project_id = project_id
+        self.date_from = date_from
+        self.date_to = date_to
+        self.format = format
+        self.gzip = gzip
+
+    def query_filters(self, user_id: int) -> dict:
+        return {
+            "user_id": user_id,
+            "workspace_id": self.workspace_id,
+            "project_id": self.project_id,
+            "date_from": self.date_from,
+            "date_to": self.date_to,
+        }
+
+
+@router.get("/tasks")
+async def export_tasks(
+    request: Request,
+    filters: ExportFilters = Depends(),
+    current_user=Depends(get_current_user),
+):
+    stmt = export_service.tasks_export_query(**filters.query_filters(current_user.id))
+    return await _export_response(request, "tasks", stmt, filters.format, filters.gzip)
+
+
+@router.get("/comments")
+async def export_comments(
+    request: Request,
+    filters: ExportFilters = Depends(),
+    current_user=Depends(get_current_user),
+):
+    stmt = export_service.comments_export_query(**filters.query_filters(current_user.id))
+    return await _export_response(request, "comments", stmt, filters.format, filters.gzip)
+
+
+@router.get("/activity-logs")
+async def export_activity_logs(
+    request: Request,
+    filters: ExportFilters = Depends(),
+    current_user=Depends(get_current_user),
+):
+    stmt = export_service.activity_logs_export_query(**filters.query_filters(current_user.id))
+    return await _export_response(request, "activity_logs", stmt, filters.format, filters.gzip)
@@ -0,0 +1,109 @@
+from enum import Enum
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.models.project import Project
+from app.services import ai_context_service, import_service
+from app.services.authz_service import require_workspace_role
+from app.services.import_service import ImportFailed
+from app.utils.response_cache import response_cache
+from app.utils.dependencies import get_current_user
+
+router = APIRouter(prefix="/imports", tags=["Imports"])
+
+
+class ImportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+# Helper: run one streaming import inside a single transaction
+async def _run_import(kind, importer, request, project_id, fmt, import_id, db, current_user):
+    workspace_id = await db.scalar(select(Project.workspace_id).where(Project.id == project_id))
+    if workspace_id is None:
+        raise HTTPException(404, "Project not found")
+    await require_workspace_role(db, current_user.id, workspace_id)
+
+    progress = await import_service.new_import(import_id, kind, current_user.id)
+    parser = import_service.parse_csv if fmt == ImportFormat.csv else import_service.parse_ndjson
+
+    try:
+        count = await importer(
+            db,
+            parser(request.stream(), progress),
+            project_id=project_id,
+            user_id=current_user.id,
+            progress=progress,
+        )
+        await db.commit()
+    except ImportFailed as e:
+        await db.rollback()
+        await import_service.finish_import(progress, status="FAILED", error=e.detail)
+        detail = {"import_id": progress["import_id"], "error": e.detail}
+        if e.line is not None:
+            detail["line"] = e.line
+        raise HTTPException(422, detail=detail)
+    except Exception:
+        await db.rollback()
+        await import_service.finish_import(progress, status="FAILED", error="Import failed")
+        raise
+
+    await response_cache.invalidate(f"project:{project_id}")
+    ai_context_service.on_project_bulk_changed(project_id)
+    await import_service.finish_import(progress, status="DONE", rows=count)
+    return progress
+
+
+# ---------------------------------------------------------
+# POST /imports/tasks?project_id=..&format=csv|ndjson
+# Body: raw CSV (header: title,description,status,assignee_id) or NDJSON
+# ---------------------------------------------------------
+@router.post("/tasks", status_code=201)
+async def import_tasks(
+    request: Request,
+    project_id: int,
+    format: ImportFormat = Query(ImportFormat.csv),
+    x_import_id: str | None = Header(None, description="Client-chosen id to poll progress with"),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return await _run_import(
+        "tasks", import_service.import_tasks,
+        request, project_id, format, x_import_id, db, current_user,
+    )
+
+
+# ---------------------------------------------------------
+# POST /imports/comments?project_id=..&format=csv|ndjson
+# Body: raw CSV (header: task_id,content) or NDJSON; comments are by the caller
+# ---------------------------------------------------------
+@router.post("/comments", status_code=201)
+async def import_comments(
+    request: Request,
+    project_id: int,
+    format: ImportFormat = Query(ImportFormat.csv),
+    x_import_id: str | None = Header(None, description="Client-chosen id to poll progress with"),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return await _run_import(
+        "comments", import_service.import_comments,
+        request, project_id, format, x_import_id, db, current_user,
+    )
+
+
+# ---------------------------------------------------------
+# GET /imports/{import_id} - progress of the caller's running/finished import
+# ---------------------------------------------------------
+@router.get("/{import_id}")
+async def get_import_progress(
+    import_id: str,
+    current_user=Depends(get_current_user),
+):
+    progress = await import_service.get_import(import_id, current_user.id)
+    if progress is None:
+        raise HTTPException(404, "Import not found")
+    return progress
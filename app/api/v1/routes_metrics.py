@@ -0,0 +1,30 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.core.config import settings
+from app.utils.metrics import metrics
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+LOOPBACK = {"127.0.0.1", "::1"}
+
+
+def require_metrics_access(request: Request):
+    """
+    Internal endpoint: METRICS_TOKEN as a bearer token, or a loopback client
+    (sidecar scraper) when no token is configured.
+    """
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(token, settings.METRICS_TOKEN):
+            return
+    elif request.client is not None and request.client.host in LOOPBACK:
+        return
+    # Don't advertise the endpoint to outsiders
+    raise HTTPException(404, "Not Found")
+
+
+@router.get("", dependencies=[Depends(require_metrics_access)])
+async def get_metrics():
+    return metrics.snapshot()
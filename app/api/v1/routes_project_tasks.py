@@ -0,0 +1,114 @@
+from datetime import datetime
+from enum import Enum
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import asc, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_read_db
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.schemas.task_schema import TaskResponse
+from app.services.authz_service import accessible_workspace_ids
+from app.utils.dependencies import get_current_user
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    encode_cursor,
+    keyset_predicate,
+)
+
+router = APIRouter(prefix="/projects", tags=["Tasks"])
+
+# Only the columns TaskResponse needs
+TASK_LIST_COLUMNS = [
+    Task.id, Task.title, Task.description, Task.status,
+    Task.assignee_id, Task.project_id, Task.created_at,
+]
+
+
+class TaskSort(str, Enum):
+    newest = "-created_at"
+    oldest = "created_at"
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def project_tasks_query(project_id: int, *, status=None, assignee_id=None, created_from=None,
+                        created_to=None, q=None, descending=True, cursor=None,
+                        page_size=DEFAULT_PAGE_SIZE):
+    """
+    One page of a project's tasks, in two steps: the page of (created_at, id)
+    is picked using only columns of ix_tasks_project_id_status_created_at /
+    ix_tasks_project_id_created_at (an index-only scan), then joined back to
+    tasks for the full rows, so description is read for page_size rows only.
+    """
+    page = select(Task.id, Task.created_at).where(Task.project_id == project_id)
+
+    if status:
+        page = page.where(Task.status.in_(status))
+    if assignee_id is not None:
+        page = page.where(Task.assignee_id == assignee_id)
+    if created_from is not None:
+        page = page.where(Task.created_at >= created_from)
+    if created_to is not None:
+        page = page.where(Task.created_at <= created_to)
+    if q:
+        # Served by ix_tasks_project_id_lower_title (text_pattern_ops)
+        page = page.where(func.lower(Task.title).like(_escape_like(q.lower()) + "%", escape="\\"))
+    if cursor:
+        page = page.where(keyset_predicate(Task.created_at, Task.id, cursor, descending=descending))
+
+    order = desc if descending else asc
+    page = page.order_by(order(Task.created_at), order(Task.id)).limit(page_size).subquery("page")
+
+    return (
+        select(*TASK_LIST_COLUMNS)
+        .join(page, Task.id == page.c.id)
+        .order_by(order(page.c.created_at), order(page.c.id))
+    )
+
+
+# ---------------------------------------------------------
+# GET /projects/{project_id}/tasks - filterable board listing (keyset paged)
+# ---------------------------------------------------------
+@router.get("/{project_id}/tasks", response_model=list[TaskResponse])
+async def list_project_tasks(
+    project_id: int,
+    response: Response,
+    status: list[TaskStatus] | None = Query(None, description="Repeat to match several statuses"),
+    assignee_id: int | None = Query(None),
+    created_from: datetime | None = Query(None),
+    created_to: datetime | None = Query(None),
+    q: str | None = Query(None, min_length=1, max_length=255, description="Case-insensitive title prefix"),
+    sort: TaskSort = Query(TaskSort.newest),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    allowed = await db.scalar(
+        select(Project.id).where(
+            Project.id == project_id,
+            Project.workspace_id.in_(accessible_workspace_ids(current_user.id)),
+        )
+    )
+    if allowed is None:
+        raise HTTPException(404, "Project not found")
+
+    stmt = project_tasks_query(
+        project_id,
+        status=status, assignee_id=assignee_id, created_from=created_from,
+        created_to=created_to, q=q, descending=sort == TaskSort.newest,
+        cursor=cursor, page_size=page_size,
+    )
+    result = await db.execute(stmt)
+    tasks = result.all()
+
+    if len(tasks) == page_size:
+        last = tasks[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+
+    return tasks
@@ -1,38 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.db.session import get_db
-from app.models.workspace import Workspace
+from app.db.session import get_db, get_read_db
 from app.models.project import Project
+from app.models.project_task_stats import ProjectTaskStats
 from app.schemas.project_schema import (
     ProjectCreate,
     ProjectUpdate,
     ProjectResponse,
+    ProjectTaskStatsResponse,
 )
+from app.services import ai_context_service
+from app.services.authz_service import require_workspace_role
 from app.utils.dependencies import get_current_user
+from app.utils.etag import collection_version, make_etag, not_modified
+from app.utils.response_cache import response_cache
 
 router = APIRouter(prefix="/workspaces", tags=["Projects"])
 
 
-
-# Helper: Check workspace owner
-
-async def verify_workspace_owner(workspace_id: int, user_id: int, db: AsyncSession):
-    query = select(Workspace).where(Workspace.id == workspace_id)
-    result = await db.execute(query)
-    workspace = result.scalar_one_or_none()
-
-    if not workspace:
-        raise HTTPException(status_code=404, detail="Workspace not found")
-
-    if workspace.owner_id != user_id:
-        raise HTTPException(status_code=403, detail="Not allowed")
-
-    return workspace
-
-
-
 # CREATE PROJECT
 @router.post("/{workspace_id}/projects", response_model=ProjectResponse, status_code=201)
 async def create_project(
@@ -41,7 +28,7 @@ async def create_project(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    await verify_workspace_owner(workspace_id, current_user.id, db)
+    await require_workspace_role(db, current_user.id, workspace_id, "admin")
 
     new_project = Project(
         name=data.name,
@@ -52,6 +39,8 @@ async def create_project(
     db.add(new_project)
     await db.commit()
     await db.refresh(new_project)
+    await response_cache.invalidate(f"workspace:{workspace_id}")
+    ai_context_service.on_project_written(new_project)
 
     return new_project
 
@@ -62,14 +51,36 @@ async def create_project(
 @router.get("/{workspace_id}/projects", response_model=list[ProjectResponse])
 async def get_projects(
     workspace_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
-    await verify_workspace_owner(workspace_id, current_user.id, db)
-
-    query = select(Project).where(Project.workspace_id == workspace_id)
-    result = await db.execute(query)
-    return result.scalars().all()
+    await require_workspace_role(db, current_user.id, workspace_id)
+
+    # Cheap validator first: answer 304 without loading the projects
+    versions = (await db.execute(
+        select(*collection_version(Project.version))
+        .where(Project.workspace_id == workspace_id)
+    )).one()
+    cached = not_modified(request, response, make_etag("projects", workspace_id, *versions))
+    if cached:
+        return cached
+
+    async def load(db: AsyncSession):
+        query = select(Project).where(Project.workspace_id == workspace_id)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    # Every member sees the same list, so the workspace is the scope
+    return await response_cache.cached(
+        request, response,
+        scope=f"workspace:{workspace_id}",
+        tags=[f"workspace:{workspace_id}"],
+        model=list[ProjectResponse],
+        loader=load,
+        db=db,
+    )
 
 
 # GET SINGLE PROJECT
@@ -78,10 +89,12 @@ async def get_projects(
 async def get_project(
     workspace_id: int,
     project_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
-    await verify_workspace_owner(workspace_id, current_user.id, db)
+    await require_workspace_role(db, current_user.id, workspace_id)
 
     query = select(Project).where(
         Project.id == project_id,
@@ -93,10 +106,50 @@ async def get_project(
     if not project:
         raise HTTPException(404, detail="Project not found")
 
+    cached = not_modified(request, response, make_etag("project", project.id, project.version))
+    if cached:
+        return cached
+
     return project
 
 
 
+# PROJECT TASK COUNTERS (maintained by DB triggers, no COUNT(*) on tasks)
+
+@router.get("/{workspace_id}/projects/{project_id}/stats", response_model=ProjectTaskStatsResponse)
+async def get_project_stats(
+    workspace_id: int,
+    project_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    await require_workspace_role(db, current_user.id, workspace_id)
+
+    query = (
+        select(Project.id, ProjectTaskStats)
+        .outerjoin(ProjectTaskStats, ProjectTaskStats.project_id == Project.id)
+        .where(Project.id == project_id, Project.workspace_id == workspace_id)
+    )
+    result = await db.execute(query)
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(404, detail="Project not found")
+
+    stats = row.ProjectTaskStats
+    if stats is None:
+        return ProjectTaskStatsResponse(project_id=project_id)
+
+    return ProjectTaskStatsResponse(
+        project_id=project_id,
+        todo=stats.todo_count,
+        in_progress=stats.in_progress_count,
+        done=stats.done_count,
+        total=stats.todo_count + stats.in_progress_count + stats.done_count,
+    )
+
+
+
 # UPDATE PROJECT
 
 @router.patch("/{workspace_id}/projects/{project_id}", response_model=ProjectResponse)
@@ -107,7 +160,7 @@ async def update_project(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    await verify_workspace_owner(workspace_id, current_user.id, db)
+    await require_workspace_role(db, current_user.id, workspace_id, "admin")
 
     query = select(Project).where(
         Project.id == project_id,
@@ -126,6 +179,8 @@ async def update_project(
 
     await db.commit()
     await db.refresh(project)
+    await response_cache.invalidate(f"workspace:{workspace_id}", f"project:{project_id}")
+    ai_context_service.on_project_written(project)
 
     return project
 
@@ -138,7 +193,7 @@ async def delete_project(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    await verify_workspace_owner(workspace_id, current_user.id, db)
+    await require_workspace_role(db, current_user.id, workspace_id, "admin")
 
     query = select(Project).where(
         Project.id == project_id,
@@ -152,5 +207,7 @@ async def delete_project(
 
     await db.delete(project)
     await db.commit()
+    await response_cache.invalidate(f"workspace:{workspace_id}", f"project:{project_id}")
+    ai_context_service.on_project_deleted(project_id)
 
     return None
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_read_db
+from app.schemas.search_schema import SearchHit
+from app.services.search_service import SearchKind, search
+from app.utils.dependencies import get_current_user
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+# ---------------------------------------------------------
+# GET /search - full-text search over tasks and comments
+# ---------------------------------------------------------
+@router.get("", response_model=list[SearchHit])
+async def search_all(
+    q: str = Query(..., min_length=1, max_length=255, description='Web-style query: words, "phrases", -exclude'),
+    kind: SearchKind = Query(SearchKind.all),
+    workspace_id: int | None = Query(None),
+    project_id: int | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    return await search(
+        db, current_user.id, q,
+        kind=kind, workspace_id=workspace_id, project_id=project_id, limit=limit,
+    )
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import insert, select, update, delete, desc
+from sqlalchemy import select, desc
 
-from app.db.session import get_db
-from app.models.user import User
+from app.db.session import get_db, get_read_db
+from app.utils import fast_json
 from app.utils.dependencies import get_current_user
 from app.schemas.task_schema import (
     TaskCreate,
@@ -13,8 +13,7 @@ from app.schemas.task_schema import (
 from app.schemas.activity_log_schema import ActivityLogResponse
 from app.models.activity_log import ActivityLog
 from app.models.task import Task, TaskStatus
-from app.models.project import Project
-from app.utils.activity_logger import create_activity_log
+from app.services import ai_context_service, task_service
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -25,38 +24,20 @@ async def create_task(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    # Check if project exists
-    q = await db.execute(select(Project).where(Project.id == project_id))
-    project = q.scalar_one_or_none()
-
-    if not project:
-        raise HTTPException(404, "Project not found")
-
-    # Create task
-    stmt = (
-        insert(Task)
-        .values(
-            title=data.title,
-            description=data.description,
-            status=TaskStatus.TODO,
-            project_id=project_id,
-        )
-        .returning(Task)
-    )
-    result = await db.execute(stmt)
-    await db.commit()
-
-    task = result.scalar_one()
-
-    # Log: TASK CREATED
-    await create_activity_log(
+    # Create task + log TASK_CREATED (fails if project does not exist)
+    task = await task_service.create_task(
         db,
+        project_id=project_id,
+        title=data.title,
+        description=data.description,
         user_id=current_user.id,
-        task_id=task.id,
-        action="TASK_CREATED",
-        new_value=task.title
     )
 
+    if not task:
+        raise HTTPException(404, "Project not found")
+
+    await db.commit()
+    ai_context_service.on_tasks_written([task])
     return task
 
 
@@ -67,47 +48,20 @@ async def update_task(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    # Fetch existing task
-    q = await db.execute(select(Task).where(Task.id == task_id))
-    task = q.scalar_one_or_none()
-
-    if not task:
-        raise HTTPException(404, "Task not found")
-
-    # Save old values for logs
-    old = {
-        "title": task.title,
-        "description": task.description,
-    }
-
-    # Apply changes
-    upd = (
-        update(Task)
-        .where(Task.id == task_id)
-        .values(
-            title=data.title or task.title,
-            description=data.description or task.description,
-        )
-        .returning(Task)
-    )
-
-    result = await db.execute(upd)
-    await db.commit()
-
-    updated_task = result.scalar_one()
-
-    # Log: TASK_UPDATED
-    await create_activity_log(
+    # Apply changes + log TASK_UPDATED with old/new values
+    updated_task = await task_service.update_task_fields(
         db,
+        task_id,
+        title=data.title,
+        description=data.description,
         user_id=current_user.id,
-        task_id=task_id,
-        action="TASK_UPDATED",
-        old_value=str(old),
-        new_value=str(
-            {"title": updated_task.title, "description": updated_task.description}
-        )
     )
 
+    if not updated_task:
+        raise HTTPException(404, "Task not found")
+
+    await db.commit()
+    ai_context_service.on_tasks_written([updated_task])
     return updated_task
 
 
@@ -118,36 +72,16 @@ async def update_task_status(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    q = await db.execute(select(Task).where(Task.id == task_id))
-    task = q.scalar_one_or_none()
+    # Log: STATUS_CHANGED
+    updated = await task_service.change_task_status(
+        db, task_id, status, user_id=current_user.id
+    )
 
-    if not task:
+    if not updated:
         raise HTTPException(404, "Task not found")
 
-    old_status = task.status.value
-
-    upd = (
-        update(Task)
-        .where(Task.id == task_id)
-        .values(status=status)
-        .returning(Task)
-    )
-
-    result = await db.execute(upd)
     await db.commit()
-
-    updated = result.scalar_one()
-
-    # Log: STATUS_CHANGED
-    await create_activity_log(
-        db,
-        user_id=current_user.id,
-        task_id=task_id,
-        action="STATUS_CHANGED",
-        old_value=old_status,
-        new_value=status.value
-    )
-
+    ai_context_service.on_tasks_written([updated])
     return updated
 
 @router.delete("/{task_id}")
@@ -156,31 +90,20 @@ async def delete_task(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    q = await db.execute(select(Task).where(Task.id == task_id))
-    task = q.scalar_one_or_none()
+    # Log: TASK_DELETED
+    deleted = await task_service.delete_task(db, task_id, user_id=current_user.id)
 
-    if not task:
+    if not deleted:
         raise HTTPException(404, "Task not found")
 
-    del_stmt = delete(Task).where(Task.id == task_id)
-    await db.execute(del_stmt)
     await db.commit()
-
-    # Log: TASK_DELETED
-    await create_activity_log(
-        db,
-        user_id=current_user.id,
-        task_id=task_id,
-        action="TASK_DELETED",
-        old_value=task.title
-    )
-
+    ai_context_service.on_tasks_deleted([task_id])
     return {"message": "Task deleted"}
 
 @router.get("/{task_id}/logs", response_model=list[ActivityLogResponse])
 async def get_task_logs(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
 
@@ -193,14 +116,19 @@ async def get_task_logs(
 
     # Fetch logs ordered by time (latest first)
     logs_stmt = (
-        select(ActivityLog)
+        select(
+            ActivityLog.id, ActivityLog.action, ActivityLog.old_value, ActivityLog.new_value,
+            ActivityLog.user_id, ActivityLog.task_id, ActivityLog.created_at,
+        )
         .where(ActivityLog.task_id == task_id)
         .order_by(desc(ActivityLog.created_at))
     )
 
     result = await db.execute(logs_stmt)
-    logs = result.scalars().all()
+    logs = result.all()
 
+    if fast_json.enabled():
+        return fast_json.json_response(fast_json.encode_rows(logs))
     return logs
 
 
@@ -211,42 +139,17 @@ async def assign_task(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    # Fetch task
-    q = await db.execute(select(Task).where(Task.id == task_id))
-    task = q.scalar_one_or_none()
-    if not task:
-        raise HTTPException(404, "Task not found")
+    # Assign user + log ASSIGNEE_UPDATED (no-op if task or user is missing)
+    updated = await task_service.assign_task(
+        db, task_id, user_id, user_id=current_user.id
+    )
 
-    # Fetch user to assign
-    u = await db.execute(select(User).where(User.id == user_id))
-    user = u.scalar_one_or_none()
-    if not user:
+    if not updated:
+        if not await task_service.task_exists(db, task_id):
+            raise HTTPException(404, "Task not found")
         raise HTTPException(404, "User not found")
 
-    old_assignee = str(task.assignee_id) if task.assignee_id else "None"
-
-    # Assign user
-    upd = (
-        update(Task)
-        .where(Task.id == task_id)
-        .values(assignee_id=user_id)
-        .returning(Task)
-    )
-    result = await db.execute(upd)
     await db.commit()
-
-    updated = result.scalar_one()
-
-    # Log: ASSIGNEE_UPDATED
-    await create_activity_log(
-        db,
-        user_id=current_user.id,
-        task_id=task_id,
-        action="ASSIGNEE_UPDATED",
-        old_value=old_assignee,
-        new_value=str(user_id)
-    )
-
     return updated
 
 
@@ -256,38 +159,13 @@ async def unassign_task(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    # Fetch task
-    q = await db.execute(select(Task).where(Task.id == task_id))
-    task = q.scalar_one_or_none()
-    if not task:
-        raise HTTPException(404, "Task not found")
+    # Remove assignee + log ASSIGNEE_REMOVED (no-op if already unassigned)
+    updated = await task_service.unassign_task(db, task_id, user_id=current_user.id)
 
-    if not task.assignee_id:
+    if not updated:
+        if not await task_service.task_exists(db, task_id):
+            raise HTTPException(404, "Task not found")
         raise HTTPException(400, "Task is already unassigned")
 
-    old_assignee = str(task.assignee_id)
-
-    # Remove assignee
-    upd = (
-        update(Task)
-        .where(Task.id == task_id)
-        .values(assignee_id=None)
-        .returning(Task)
-    )
-
-    result = await db.execute(upd)
     await db.commit()
-
-    updated = result.scalar_one()
-
-    # Log: ASSIGNEE_REMOVED
-    await create_activity_log(
-        db,
-        user_id=current_user.id,
-        task_id=task_id,
-        action="ASSIGNEE_REMOVED",
-        old_value=old_assignee,
-        new_value="None"
-    )
-
     return updated
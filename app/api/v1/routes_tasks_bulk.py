@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.schemas.task_schema import (
+    TaskBulkCreate,
+    TaskBulkStatusUpdate,
+    TaskBulkAssign,
+    TaskBulkDelete,
+    TaskBulkResponse,
+    TaskBulkDeleteResponse,
+)
+from app.services import ai_context_service, task_service
+from app.utils.dependencies import get_current_user
+
+# Registered before the /tasks router so /tasks/bulk/... never matches /tasks/{task_id}/...
+router = APIRouter(prefix="/tasks/bulk", tags=["Tasks"])
+
+
+# Helper: commit, or roll back everything and report per-item errors (all-or-nothing)
+async def _finish(db: AsyncSession, outcome, atomic: bool):
+    errors = [{"index": idx, "detail": detail} for idx, detail in sorted(outcome.errors)]
+
+    if atomic and errors:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail={"errors": errors})
+
+    await db.commit()
+    return errors
+
+
+@router.post("", response_model=TaskBulkResponse, status_code=201)
+async def bulk_create_tasks(
+    data: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    outcome = await task_service.bulk_create_tasks(
+        db, data.items, user_id=current_user.id, atomic=data.atomic
+    )
+    errors = await _finish(db, outcome, data.atomic)
+    ai_context_service.on_tasks_written(outcome.rows)
+    return {"tasks": outcome.rows, "errors": errors}
+
+
+@router.put("/status", response_model=TaskBulkResponse)
+async def bulk_update_status(
+    data: TaskBulkStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    outcome = await task_service.bulk_change_status(
+        db, data.items, user_id=current_user.id, atomic=data.atomic
+    )
+    errors = await _finish(db, outcome, data.atomic)
+    ai_context_service.on_tasks_written(outcome.rows)
+    return {"tasks": outcome.rows, "errors": errors}
+
+
+@router.put("/assign", response_model=TaskBulkResponse)
+async def bulk_assign(
+    data: TaskBulkAssign,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    outcome = await task_service.bulk_assign(
+        db, data.items, user_id=current_user.id, atomic=data.atomic
+    )
+    errors = await _finish(db, outcome, data.atomic)
+    return {"tasks": outcome.rows, "errors": errors}
+
+
+@router.post("/delete", response_model=TaskBulkDeleteResponse)
+async def bulk_delete(
+    data: TaskBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    outcome = await task_service.bulk_delete(
+        db, data.task_ids, user_id=current_user.id, atomic=data.atomic
+    )
+    errors = await _finish(db, outcome, data.atomic)
+    ai_context_service.on_tasks_deleted(r.id for r in outcome.rows)
+    return {"deleted_ids": [r.id for r in outcome.rows], "errors": errors}
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
 
 from app.db.session import get_db
 from app.models.user import User
-from app.models.workspace import Workspace
 from app.models.workspace_member import WorkspaceMember
 
 from app.schemas.workspace_member import (
@@ -14,42 +14,15 @@ from app.schemas.workspace_member import (
     WorkspaceMemberUserInfo
 )
 
+from app.services.authz_service import invalidate_workspace_role, require_workspace_role
+from app.utils import fast_json
 from app.utils.dependencies import get_current_user
+from app.utils.etag import collection_version, make_etag, not_modified
+from app.utils.response_cache import response_cache
 
 router = APIRouter(prefix="/workspaces", tags=["Workspace Members"])
 
 
-# -------------------------------------
-# Helper: Check Workspace Ownership
-# -------------------------------------
-async def require_owner_or_admin(workspace_id: int, user_id: int, db: AsyncSession):
-    # Check workspace owner
-    ws = await db.execute(
-        select(Workspace).where(Workspace.id == workspace_id)
-    )
-    workspace = ws.scalar_one_or_none()
-
-    if not workspace:
-        raise HTTPException(404, "Workspace not found")
-
-    # If owner -> allowed
-    if workspace.owner_id == user_id:
-        return workspace
-
-    # Otherwise check if user is admin member
-    q = await db.execute(
-        select(WorkspaceMember)
-        .where(WorkspaceMember.workspace_id == workspace_id)
-        .where(WorkspaceMember.user_id == user_id)
-    )
-    member = q.scalar_one_or_none()
-
-    if not member or member.role != "admin":
-        raise HTTPException(403, "You are not allowed")
-
-    return workspace
-
-
 # ----------------------------------------------------------------
 # 1️⃣ ADD MEMBER TO WORKSPACE
 # ----------------------------------------------------------------
@@ -62,7 +35,7 @@ async def add_member(
 ):
 
     # Check permission
-    await require_owner_or_admin(workspace_id, current_user.id, db)
+    await require_workspace_role(db, current_user.id, workspace_id, "admin")
 
     # Find user by email
     u = await db.execute(select(User).where(User.email == payload.email))
@@ -90,8 +63,15 @@ async def add_member(
     )
 
     db.add(member)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Concurrent add lost the race on uq_workspace_members_workspace_id_user_id
+        await db.rollback()
+        raise HTTPException(400, "User already a member")
     await db.refresh(member)
+    invalidate_workspace_role(workspace_id, user.id)
+    await response_cache.invalidate(f"workspace:{workspace_id}", f"user:{user.id}")
 
     return member
 
@@ -102,44 +82,76 @@ async def add_member(
 @router.get("/{workspace_id}/members", response_model=list[WorkspaceMemberListResponse])
 async def list_members(
     workspace_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
 
     # Permission check
-    await require_owner_or_admin(workspace_id, current_user.id, db)
-
-    # Fetch members + join user table
-    result = await db.execute(
-        select(
-            WorkspaceMember.id,
-            WorkspaceMember.role,
-            User.id,
-            User.email,
-            User.full_name
-        )
-        .join(User, WorkspaceMember.user_id == User.id)
+    await require_workspace_role(db, current_user.id, workspace_id, "admin")
+
+    # Membership rows only: a member renaming themselves does not change the tag
+    versions = (await db.execute(
+        select(*collection_version(WorkspaceMember.version))
         .where(WorkspaceMember.workspace_id == workspace_id)
-    )
+    )).one()
+    cached = not_modified(request, response, make_etag("members", workspace_id, *versions))
+    if cached:
+        return cached
+
+    async def load(db: AsyncSession):
+        # Fetch members + join user table
+        result = await db.execute(
+            select(
+                WorkspaceMember.id,
+                WorkspaceMember.role,
+                User.id,
+                User.email,
+                User.full_name
+            )
+            .join(User, WorkspaceMember.user_id == User.id)
+            .where(WorkspaceMember.workspace_id == workspace_id)
+        )
 
-    rows = result.all()
-
-    # Transform into schema
-    output = []
-    for member_id, role, user_id, email, full_name in rows:
-        output.append(
-            WorkspaceMemberListResponse(
-                member_id=member_id,
-                role=role,
-                user=WorkspaceMemberUserInfo(
-                    id=user_id,
-                    email=email,
-                    full_name=full_name
+        rows = result.all()
+
+        if fast_json.enabled():
+            return fast_json.encode([
+                {
+                    "member_id": member_id,
+                    "role": role,
+                    "user": {"id": user_id, "email": email, "full_name": full_name},
+                }
+                for member_id, role, user_id, email, full_name in rows
+            ])
+
+        # Transform into schema
+        output = []
+        for member_id, role, user_id, email, full_name in rows:
+            output.append(
+                WorkspaceMemberListResponse(
+                    member_id=member_id,
+                    role=role,
+                    user=WorkspaceMemberUserInfo(
+                        id=user_id,
+                        email=email,
+                        full_name=full_name
+                    )
                 )
             )
-        )
 
-    return output
+        return output
+
+    # Every owner/admin sees the same list
+    return await response_cache.cached(
+        request, response,
+        scope=f"workspace:{workspace_id}",
+        tags=[f"workspace:{workspace_id}"],
+        model=list[WorkspaceMemberListResponse],
+        loader=load,
+        db=db,
+    )
 
 
 # ----------------------------------------------------------------
@@ -154,7 +166,7 @@ async def remove_member(
 ):
 
     # Permission check
-    await require_owner_or_admin(workspace_id, current_user.id, db)
+    await require_workspace_role(db, current_user.id, workspace_id, "admin")
 
     # Avoid removing yourself
     if user_id == current_user.id:
@@ -174,4 +186,6 @@ async def remove_member(
         raise HTTPException(404, "Member not found")
 
     await db.commit()
+    invalidate_workspace_role(workspace_id, user_id)
+    await response_cache.invalidate(f"workspace:{workspace_id}", f"user:{user_id}")
     return {"message": "Member removed successfully"}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db.session import get_db
@@ -6,6 +6,9 @@ from app.schemas.workspace_schema import WorkspaceCreate, WorkspaceOut, Workspac
 from app.models.workspace import Workspace
 from app.utils.dependencies import get_current_user
 from app.models.user import User
+from app.services import ai_context_service
+from app.services.authz_service import invalidate_workspace_role
+from app.utils.response_cache import response_cache
 
 router = APIRouter(
     prefix="/workspaces",
@@ -38,19 +41,32 @@ async def create_workspace(
     db.add(new_workspace)
     await db.commit()
     await db.refresh(new_workspace)
+    invalidate_workspace_role(new_workspace.id)
+    await response_cache.invalidate(f"user:{current_user.id}")
+    ai_context_service.on_workspace_written(new_workspace)
 
     return new_workspace
 
 @router.get("/", response_model=list[WorkspaceOut])
 async def get_workspaces(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = select(Workspace).where(Workspace.owner_id == current_user.id)
-    result = await db.execute(query)
-    workspaces = result.scalars().all()
-
-    return workspaces
+    async def load(db: AsyncSession):
+        query = select(Workspace).where(Workspace.owner_id == current_user.id)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    return await response_cache.cached(
+        request, response,
+        scope=f"user:{current_user.id}",
+        tags=[f"user:{current_user.id}"],
+        model=list[WorkspaceOut],
+        loader=load,
+        db=db,
+    )
 
 @router.get("/{workspace_id}", response_model=WorkspaceOut)
 async def get_workspace(
@@ -94,6 +110,8 @@ async def update_workspace(
     # Save changes
     await db.commit()
     await db.refresh(workspace)
+    await response_cache.invalidate(f"user:{current_user.id}", f"workspace:{workspace_id}")
+    ai_context_service.on_workspace_written(workspace)
 
     return workspace
 
@@ -117,6 +135,9 @@ async def delete_workspace(
     # Delete workspace
     await db.delete(workspace)
     await db.commit()
+    invalidate_workspace_role(workspace_id)
+    ai_context_service.on_workspace_deleted(workspace_id, current_user.id)
+    await response_cache.invalidate(f"user:{current_user.id}", f"workspace:{workspace_id}")
 
     # No return (204 = No Content)
     return None
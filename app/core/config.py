@@ -9,9 +9,99 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
     REDIS_URL: str = Field(..., env="REDIS_URL")
+    REDIS_FAKE: bool = False  # in-memory fakeredis instead of REDIS_URL (tests)
+
+    # Connection pool / replica routing
+    DATABASE_READ_URL: str | None = None
+    DB_SSL: str | None = "require"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # set to 0 behind pgbouncer (transaction mode)
+    DB_READ_AFTER_WRITE_SECONDS: int = 5
+
+    # Activity logs: "transactional" (same transaction as the change) or "batched" (write-behind)
+    ACTIVITY_LOG_MODE: str = "transactional"
+    ACTIVITY_LOG_BATCH_SIZE: int = 500
+    ACTIVITY_LOG_FLUSH_INTERVAL_MS: int = 200
+    ACTIVITY_LOG_MAX_QUEUE: int = 10_000
+    ACTIVITY_LOG_BACKPRESSURE_TIMEOUT_MS: int = 250
 
     DEEPSEEK_API_KEY: str = Field("", env="DEEPSEEK_API_KEY")
 
+    # Shared DeepSeek HTTP client (opened in the app lifespan)
+    DEEPSEEK_URL: str = "https://api.deepseek.com/v1/chat/completions"
+    DEEPSEEK_HTTP2: bool = True  # needs h2 (httpx[http2]); falls back to HTTP/1.1
+    DEEPSEEK_MAX_CONNECTIONS: int = 20
+    DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    DEEPSEEK_KEEPALIVE_EXPIRY_SECONDS: float = 60
+    DEEPSEEK_CONNECT_TIMEOUT_SECONDS: float = 5
+    DEEPSEEK_READ_TIMEOUT_SECONDS: float = 60
+    DEEPSEEK_WRITE_TIMEOUT_SECONDS: float = 10
+    DEEPSEEK_POOL_TIMEOUT_SECONDS: float = 5  # max wait for a free connection
+
+    # GET /metrics: bearer token; when unset only loopback clients may read it
+    METRICS_TOKEN: str = ""
+
+    # Auth principal cache (get_current_user)
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_REDIS: bool = False
+
+    # Workspace role decisions (authz_service); changes are broadcast to every
+    # worker, the TTL only bounds staleness while Redis is unreachable
+    AUTHZ_CACHE_SIZE: int = 50_000
+    AUTHZ_CACHE_TTL_SECONDS: int = 10
+
+    # Per-user AI context snapshots (patched in place by writes)
+    AI_CONTEXT_CACHE_SIZE: int = 1_000
+    AI_CONTEXT_TTL_SECONDS: int = 300
+    AI_CONTEXT_TOKEN_BUDGET: int = 2_000  # estimated tokens of workspace data per prompt
+    AI_CONTEXT_SKELETON_SHARE: float = 0.5  # max share of the budget for workspace/project lines
+    AI_CHARS_PER_TOKEN: int = 4  # rough estimate; no tokenizer dependency
+
+    # Local embedding index for AI context retrieval (hashed n-grams, memory-mapped files)
+    AI_EMBEDDING_ENABLED: bool = True
+    AI_EMBEDDING_DIR: str = "var/embeddings"  # shared by all workers on a host
+    AI_EMBEDDING_DIM: int = 512
+    AI_RETRIEVAL_TOP_K: int = 50
+
+    # AI chat response cache (Redis, keyed on conversation + context version)
+    AI_CHAT_CACHE_ENABLED: bool = True
+    AI_CHAT_CACHE_TTL_SECONDS: int = 600
+    AI_CHAT_CACHE_MAX_ENTRIES: int = 10_000  # LRU bound across all users
+    AI_CHAT_CACHE_LOCK_SECONDS: float = 65  # > DEEPSEEK_READ_TIMEOUT_SECONDS
+
+    # Background AI jobs (ai_requests queue, app/tasks/ai_tasks.py)
+    AI_WORKER_IN_PROCESS: bool = False  # also run a worker inside each API process
+    AI_WORKER_CONCURRENCY: int = 4  # jobs in flight per worker process
+    AI_WORKER_POLL_SECONDS: float = 1.0  # idle queue poll interval
+    AI_JOB_TIMEOUT_SECONDS: int = 300  # PROCESSING longer than this: worker presumed dead
+    AI_JOB_MAX_ATTEMPTS: int = 3
+    AI_JOB_MAX_WAIT_SECONDS: int = 30  # long-poll cap for GET /ai/jobs/{id}
+    AI_JOB_WAIT_POLL_SECONDS: float = 0.5
+
+    # Response cache for hot GETs (Redis, tag-invalidated)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_TTL_JITTER: float = 0.1  # +/- fraction of the TTL
+    RESPONSE_CACHE_LOCK_SECONDS: int = 5  # single-flight lock / max wait for another loader
+
+    # Streaming imports: progress is shared through Redis for GET /imports/{id}
+    IMPORT_PROGRESS_TTL_SECONDS: int = 3600
+    IMPORT_PROGRESS_PUBLISH_SECONDS: float = 1.0  # min interval between progress writes
+
+    # Encode large list responses straight from row tuples with orjson
+    # (skips per-row response_model validation)
+    FAST_JSON_RESPONSES: bool = False
+
+    # Password hashing pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.core.config import settings
+from app.utils.metrics import metrics
+
+
+class HashingPoolBusy(Exception):
+    """Raised when the hashing queue is full; callers should fail fast (503)."""
+
+
+class HashingPool:
+    """
+    Bounded executor for argon2 work so password hashing never runs on the event loop.
+
+    - `workers` hashes run concurrently
+    - at most `max_pending` jobs may be queued or running; beyond that we reject
+    """
+
+    def __init__(self, kind: str, workers: int, max_pending: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Executor | None = None
+        self._pending = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="argon2"
+                )
+        return self._executor
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            metrics.incr("hashing_pool.rejected")
+            raise HashingPoolBusy()
+
+        self._pending += 1
+        metrics.set_gauge("hashing_pool.pending", self._pending)
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+            metrics.set_gauge("hashing_pool.pending", self._pending)
+            metrics.observe("hashing_pool.duration_ms", (time.perf_counter() - started) * 1000)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
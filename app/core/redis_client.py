@@ -0,0 +1,28 @@
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+_client: redis.Redis | None = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    Shared asyncio Redis client (created lazily, one connection pool per process).
+    """
+    global _client
+    if _client is None:
+        if settings.REDIS_FAKE:
+            # In-memory server for tests / local dev (pip install fakeredis)
+            from fakeredis import FakeAsyncRedis
+
+            _client = FakeAsyncRedis(decode_responses=False)
+        else:
+            _client = redis.from_url(settings.REDIS_URL, decode_responses=False)
+    return _client
+
+
+async def close_redis():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
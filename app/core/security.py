@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 import jwt
 from pwdlib import PasswordHash
 from app.core.config import settings
+from app.core.hashing_pool import hashing_pool
 
 pwd_context = PasswordHash.recommended()  # argon2id
 
@@ -14,6 +15,15 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+# Argon2 is deliberately slow; async handlers must go through the bounded pool.
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await hashing_pool.run(verify_password, plain, hashed)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -1,4 +1,29 @@
-from sqlalchemy.orm import DeclarativeBase
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, FetchedValue, func, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 class Base(DeclarativeBase):
-    pass
\ No newline at end of file
+    pass
+
+
+class VersionedMixin:
+    """
+    version / updated_at are stamped by the row_version_touch trigger on every
+    INSERT and UPDATE (see migration 6b2e8f4a0d17); never set them from the app.
+    Versions come from one shared sequence when a row is written, not when it
+    commits, so the max over a set of rows can miss a slow transaction's
+    write; collection validators use (count, sum(version)) instead
+    (app.utils.etag.collection_version).
+
+    The column defaults only matter where the trigger does not exist (SQLite
+    test databases), so they stay dialect-neutral.
+    """
+    __mapper_args__ = {"eager_defaults": True}
+
+    version: Mapped[int] = mapped_column(
+        BigInteger, server_default=text("0"), server_onupdate=FetchedValue(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.current_timestamp(),
+        server_onupdate=FetchedValue(), nullable=False,
+    )
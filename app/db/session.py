@@ -1,13 +1,128 @@
+import asyncio
+import hashlib
+import logging
+
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.utils.ttl_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _engine_options() -> dict:
+    connect_args = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if settings.DB_SSL:
+        connect_args["ssl"] = settings.DB_SSL
+
+    return {
+        "echo": False,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+engine = create_async_engine(settings.DATABASE_URL, **_engine_options())
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False, connect_args={"ssl": "require"},)
+# Read-only replica; falls back to the primary when DATABASE_READ_URL is not set
+if settings.DATABASE_READ_URL:
+    read_engine = create_async_engine(settings.DATABASE_READ_URL, **_engine_options())
+else:
+    read_engine = engine
 
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
-async def get_db():
+async_read_session = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+# ---------------------------------------------------------
+# Read-your-writes: callers that committed recently are pinned to the primary
+# for DB_READ_AFTER_WRITE_SECONDS so replica lag never hides their own writes.
+# The marker lives in Redis so it holds across workers and hosts; the local
+# LRU only covers the moment before the Redis write lands.
+# ---------------------------------------------------------
+PIN_KEY_PREFIX = "rw:pin:"
+
+_recent_writers = LRUTTLCache(maxsize=100_000, ttl=settings.DB_READ_AFTER_WRITE_SECONDS)
+
+
+def _caller_key(request: Request) -> str | None:
+    auth = request.headers.get("authorization")
+    if not auth:
+        return None
+    return hashlib.sha256(auth.encode()).hexdigest()
+
+
+async def _publish_pin(key: str):
+    try:
+        await get_redis().set(PIN_KEY_PREFIX + key, b"1", ex=settings.DB_READ_AFTER_WRITE_SECONDS)
+    except Exception:
+        logger.warning("read-after-write pin not shared: redis unavailable", exc_info=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_writer_to_primary(session: Session):
+    key = session.info.get("caller_key")
+    if not key:
+        return
+    _recent_writers.set(key, True)
+    try:
+        asyncio.get_running_loop().create_task(_publish_pin(key))
+    except RuntimeError:
+        pass  # no loop (sync scripts): nothing else to route
+
+
+async def is_pinned_to_primary(request: Request) -> bool:
+    key = _caller_key(request)
+    if key is None:
+        return False
+    if _recent_writers.get(key, False):
+        return True
+    try:
+        return bool(await get_redis().exists(PIN_KEY_PREFIX + key))
+    except Exception:
+        # Can't tell: the primary is always consistent
+        logger.warning("read-after-write check failed: redis unavailable", exc_info=True)
+        return True
+
+
+async def read_session_factory(request: Request):
+    """
+    Replica session factory unless the caller wrote recently (or no replica is configured).
+    """
+    if read_engine is engine or await is_pinned_to_primary(request):
+        return async_session
+    return async_read_session
+
+
+async def get_db(request: Request):
     async with async_session() as session:
+        session.info["caller_key"] = _caller_key(request)
         yield session
+
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only GET routes. Uses the replica unless the caller
+    wrote recently (or no replica is configured).
+    """
+    factory = await read_session_factory(request)
+    async with factory() as session:
+        yield session
+
+
+async def dispose_engines():
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
@@ -1,15 +1,56 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.routes_auth import router as auth_router
 from app.api.v1.routes_workspaces import router as workspaces_router
 from app.api.v1.routes_projects import router as projects_router
 from app.api.v1.routes_tasks import router as tasks_router
+from app.api.v1.routes_tasks_bulk import router as tasks_bulk_router
+from app.api.v1.routes_project_tasks import router as project_tasks_router
 from app.api.v1.routes_comments import router as comments_router
 from app.api.v1.routes_workspace_members import router as workspace_members_router  
 from app.api.v1.routes_activity_logs import router as activity_logs_router
 from app.api.v1.routes_ai import router as ai_router
+from app.api.v1.routes_metrics import router as metrics_router
+from app.api.v1.routes_imports import router as imports_router
+from app.api.v1.routes_exports import router as exports_router
+from app.api.v1.routes_search import router as search_router
+from app.core.config import settings
+from app.core.hashing_pool import hashing_pool
+from app.core.redis_client import close_redis
+from app.db.session import dispose_engines
+from app.utils.principal_cache import principal_cache
+from app.services import ai_context_service, authz_service, deepseek_client
+from app.tasks.ai_tasks import ai_job_worker
+from app.utils.activity_logger import activity_log_batcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await deepseek_client.start()
+    principal_cache.start_listener()
+    authz_service.start_listener()
+    if settings.ACTIVITY_LOG_MODE == "batched":
+        activity_log_batcher.start()
+    if settings.AI_WORKER_IN_PROCESS:
+        ai_job_worker.start()
+
+    yield
+
+    await ai_job_worker.stop()
+    await activity_log_batcher.stop()
+    await asyncio.to_thread(ai_context_service.shutdown_index_writer)
+    await deepseek_client.close()
+    await principal_cache.stop_listener()
+    await authz_service.stop_listener()
+    hashing_pool.shutdown()
+    await close_redis()
+    await dispose_engines()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -24,13 +65,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Estimate", "ETag"],
 )
 
 app.include_router(auth_router)
 app.include_router(workspaces_router)
 app.include_router(projects_router)
+app.include_router(tasks_bulk_router)
 app.include_router(tasks_router)
+app.include_router(project_tasks_router)
 app.include_router(comments_router)
 app.include_router(workspace_members_router)
 app.include_router(activity_logs_router)
-app.include_router(ai_router)
\ No newline at end of file
+app.include_router(ai_router)
+app.include_router(imports_router)
+app.include_router(exports_router)
+app.include_router(search_router)
+app.include_router(metrics_router)
@@ -5,6 +5,8 @@ from app.models.comment import Comment
 from app.models.activity_log import ActivityLog
 from app.models.task import Task
 from app.models.ai_request import AIRequest
+from app.models.workspace_member import WorkspaceMember
+from app.models.project_task_stats import ProjectTaskStats
 
 __all__ = [
     "User",
@@ -14,4 +16,6 @@ __all__ = [
     "ActivityLog",
     "Task",
     "AIRequest",
+    "WorkspaceMember",
+    "ProjectTaskStats",
 ]
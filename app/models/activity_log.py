@@ -1,4 +1,4 @@
-from sqlalchemy import String, ForeignKey, DateTime, Text
+from sqlalchemy import Integer, String, ForeignKey, DateTime, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 
@@ -7,6 +7,12 @@ from app.db.base import Base
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        Index("ix_activity_logs_task_id_created_at", "task_id", "created_at", "id"),
+        Index("ix_activity_logs_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_activity_logs_project_id_created_at", "project_id", "created_at", "id"),
+        Index("ix_activity_logs_created_at_brin", "created_at", postgresql_using="brin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -17,7 +23,10 @@ class ActivityLog(Base):
     new_value: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    task_id: Mapped[int | None] = mapped_column(ForeignKey("tasks.id"), nullable=True)
+    # Plain references, no foreign keys: the audit trail outlives the task.
+    # project_id is written with task mutations and filled in when a task is deleted.
+    task_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    project_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
@@ -25,4 +34,4 @@ class ActivityLog(Base):
 
     # Relationships
     user = relationship("User", back_populates="logs")
-    task = relationship("Task", back_populates="logs")
+    task = relationship("Task", back_populates="logs", primaryjoin="foreign(ActivityLog.task_id) == Task.id")
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Integer, String, Text, ForeignKey, DateTime, Enum, JSON, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 import enum
@@ -8,6 +8,7 @@ from app.db.base import Base
 class AIRequestType(str, enum.Enum):
     SUMMARY = "SUMMARY"
     DESCRIPTION = "DESCRIPTION"
+    CHAT = "CHAT"
 
 class AIRequestStatus(str, enum.Enum):
     PENDING = "PENDING"
@@ -16,7 +17,17 @@ class AIRequestStatus(str, enum.Enum):
     ERROR = "ERROR"
 
 class AIRequest(Base):
+    """
+    Also the AI job queue: PENDING rows are claimed by app/tasks/ai_tasks.py
+    with SELECT ... FOR UPDATE SKIP LOCKED.
+    """
     __tablename__ = "ai_requests"
+    __table_args__ = (
+        # Queue head: only PENDING rows, oldest first
+        Index("ix_ai_requests_pending", "id", postgresql_where=text("status = 'PENDING'")),
+        # Reaper: jobs whose worker died mid-flight
+        Index("ix_ai_requests_processing", "started_at", postgresql_where=text("status = 'PROCESSING'")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
@@ -27,9 +38,14 @@ class AIRequest(Base):
     task_id: Mapped[int | None] = mapped_column(ForeignKey("tasks.id"))
     project_id: Mapped[int | None] = mapped_column(ForeignKey("projects.id"))
 
+    payload: Mapped[dict | None] = mapped_column(JSON)  # job input, e.g. chat messages
     result_text: Mapped[str | None] = mapped_column(Text)
+    error: Mapped[str | None] = mapped_column(Text)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default=text("0"))
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime)
 
     user = relationship("User")
     task = relationship("Task")
@@ -1,11 +1,14 @@
-from sqlalchemy import Integer, Text, ForeignKey, DateTime
+from sqlalchemy import Integer, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 
-from app.db.base import Base
+from app.db.base import Base, VersionedMixin
 
-class Comment(Base):
+class Comment(VersionedMixin, Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_task_id_created_at", "task_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
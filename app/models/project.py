@@ -1,9 +1,9 @@
 from datetime import datetime
 from sqlalchemy import Integer, String, DateTime, ForeignKey, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.db.base import Base
+from app.db.base import Base, VersionedMixin
 
-class Project(Base):
+class Project(VersionedMixin, Base):
     __tablename__  = "projects"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy import Integer, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class ProjectTaskStats(Base):
+    """
+    Denormalized per-project task counters.
+    Maintained by the tasks triggers (see migration 3f8a6c1d9e20); never write from the app.
+    """
+    __tablename__ = "project_task_stats"
+
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    todo_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    in_progress_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    done_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
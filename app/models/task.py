@@ -1,7 +1,7 @@
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, ForeignKey, Text, Enum  
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Text, Enum, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.db.base import Base
+from app.db.base import Base, VersionedMixin
 import enum
 
 class TaskStatus(str, enum.Enum):
@@ -9,8 +9,18 @@ class TaskStatus(str, enum.Enum):
     IN_PROGRESS = "IN_PROGRESS"
     DONE = "DONE"
 
-class Task(Base):
+class Task(VersionedMixin, Base):
     __tablename__  = "tasks"
+    __table_args__ = (
+        # project board listing: newest first, optionally per status (id = keyset tie-breaker).
+        # INCLUDE covers every filter/list column except description (unbounded
+        # text, too big for an index tuple), so the page of ids is found with an
+        # index-only scan and only the returned rows are read from the heap.
+        Index("ix_tasks_project_id_created_at", "project_id", "created_at", "id",
+              postgresql_include=["status", "assignee_id", "title"]),
+        Index("ix_tasks_project_id_status_created_at", "project_id", "status", "created_at", "id",
+              postgresql_include=["assignee_id", "title"]),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -22,4 +32,15 @@ class Task(Base):
     project = relationship("Project", back_populates="tasks")
     assignee = relationship("User", back_populates="tasks")
     comments = relationship("Comment", back_populates="task", cascade="all, delete")
-    logs = relationship("ActivityLog", back_populates="task")   
\ No newline at end of file
+    # passive_deletes: deleting a task must not NULL its logs' task_id
+    logs = relationship("ActivityLog", back_populates="task",
+                        primaryjoin="Task.id == foreign(ActivityLog.task_id)", passive_deletes="all")
+
+
+# Case-insensitive title prefix search within a project
+Index(
+    "ix_tasks_project_id_lower_title",
+    Task.project_id,
+    func.lower(Task.title).label("lower_title"),
+    postgresql_ops={"lower_title": "text_pattern_ops"},
+)
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from pydantic import BaseModel, model_validator
+
+from app.models.ai_request import AIRequestStatus, AIRequestType
+
+
+class AIChatMessage(BaseModel):
+    role: str
+    content: str
+
+
+class AIChatRequest(BaseModel):
+    messages: list[AIChatMessage] = []
+    stream: bool = False  # Server-Sent Events instead of one JSON body
+
+
+class AIJobCreate(BaseModel):
+    """
+    SUMMARY: task_id or project_id. DESCRIPTION: task_id. CHAT: messages.
+    """
+    type: AIRequestType
+    task_id: int | None = None
+    project_id: int | None = None
+    messages: list[AIChatMessage] = []
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if self.type == AIRequestType.SUMMARY and (self.task_id is None) == (self.project_id is None):
+            raise ValueError("SUMMARY needs exactly one of task_id / project_id")
+        if self.type == AIRequestType.DESCRIPTION and self.task_id is None:
+            raise ValueError("DESCRIPTION needs task_id")
+        if self.type == AIRequestType.CHAT and not self.messages:
+            raise ValueError("CHAT needs messages")
+        return self
+
+
+class AIJobResponse(BaseModel):
+    id: int
+    type: AIRequestType
+    status: AIRequestStatus
+    task_id: int | None
+    project_id: int | None
+    result_text: str | None
+    error: str | None
+    attempts: int
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    class Config:
+        from_attributes = True
@@ -17,4 +17,11 @@ class ProjectResponse(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ProjectTaskStatsResponse(BaseModel):
+    project_id: int
+    todo: int = 0
+    in_progress: int = 0
+    done: int = 0
+    total: int = 0
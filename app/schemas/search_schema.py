@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    kind: Literal["task", "comment"]
+    id: int
+    task_id: int
+    project_id: int
+    workspace_id: int
+    title: str
+    # Matching fragment with terms wrapped in <mark>...</mark> (not HTML-escaped)
+    snippet: str
+    rank: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -24,4 +24,47 @@ class TaskResponse(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# ---------- Bulk operations ----------
+BULK_MAX_ITEMS = 1000
+
+class TaskBulkCreateItem(TaskCreate):
+    project_id: int
+
+class TaskBulkCreate(BaseModel):
+    items: list[TaskBulkCreateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    atomic: bool = True  # all-or-nothing
+
+class TaskBulkStatusItem(BaseModel):
+    task_id: int
+    status: TaskStatus
+
+class TaskBulkStatusUpdate(BaseModel):
+    items: list[TaskBulkStatusItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    atomic: bool = True
+
+class TaskBulkAssignItem(BaseModel):
+    task_id: int
+    user_id: int | None = None  # None -> unassign
+
+class TaskBulkAssign(BaseModel):
+    items: list[TaskBulkAssignItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    atomic: bool = True
+
+class TaskBulkDelete(BaseModel):
+    task_ids: list[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    atomic: bool = True
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+class TaskBulkResponse(BaseModel):
+    tasks: list[TaskResponse]
+    errors: list[BulkItemError] = []
+
+class TaskBulkDeleteResponse(BaseModel):
+    deleted_ids: list[int]
+    errors: list[BulkItemError] = []
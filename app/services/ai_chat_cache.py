@@ -0,0 +1,113 @@
+import hashlib
+import logging
+import re
+import time
+
+import orjson
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.services.deepseek_client import deepseek_chat
+from app.utils.metrics import metrics
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ai:chat:v1:"
+LRU_KEY = "ai:chat:lru"  # zset: cache key -> last access time
+
+_TRAILING_PUNCT_RE = re.compile(r"[\s?.!]+$")
+
+_flight = SingleFlight("ai_chat_cache", lambda: settings.AI_CHAT_CACHE_LOCK_SECONDS, poll_seconds=0.25)
+
+
+def _normalize(text: str) -> str:
+    # "Summarize my open tasks?" == "summarize  my open tasks"
+    return _TRAILING_PUNCT_RE.sub("", " ".join(text.split()).lower())
+
+
+def context_version(messages: list) -> str:
+    """
+    Digest of the system messages, i.e. of the database context the model
+    sees: it changes whenever a task, comment or project that made it into
+    the prompt changes, and only then.
+    """
+    system = [m["content"] for m in messages if m["role"] == "system"]
+    return hashlib.blake2b(orjson.dumps(system), digest_size=12).hexdigest()
+
+
+def cache_key(user_id: int, messages: list, max_tokens: int) -> str:
+    conversation = [(m["role"], _normalize(m["content"])) for m in messages if m["role"] != "system"]
+    digest = hashlib.sha256(orjson.dumps([max_tokens, conversation])).hexdigest()
+    return f"{KEY_PREFIX}{user_id}:{context_version(messages)}:{digest}"
+
+
+async def _touch(key: str):
+    await get_redis().zadd(LRU_KEY, {key: time.time()})
+
+
+async def _store(key: str, body: bytes):
+    """
+    Write the entry and trim the LRU to AI_CHAT_CACHE_MAX_ENTRIES. Errors are
+    swallowed: the upstream answer is already paid for and must be returned.
+    """
+    redis = get_redis()
+    now = time.time()
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(key, body, ex=settings.AI_CHAT_CACHE_TTL_SECONDS)
+            pipe.zadd(LRU_KEY, {key: now})
+            # Entries past their TTL are already gone; keep the zset in step
+            pipe.zremrangebyscore(LRU_KEY, "-inf", now - settings.AI_CHAT_CACHE_TTL_SECONDS)
+            pipe.zcard(LRU_KEY)
+            *_, size = await pipe.execute()
+
+        excess = size - settings.AI_CHAT_CACHE_MAX_ENTRIES
+        if excess > 0:
+            evicted = [k for k, _ in await redis.zpopmin(LRU_KEY, excess)]
+            if evicted:
+                await redis.delete(*evicted)
+                metrics.incr("ai_chat_cache.evicted", len(evicted))
+    except (RedisError, OSError) as exc:
+        logger.warning("ai chat cache store failed: %s", exc)
+        metrics.incr("ai_chat_cache.error")
+
+
+async def cached_chat(user_id: int, messages: list, max_tokens: int = 512) -> dict:
+    """
+    deepseek_chat() behind a Redis cache keyed on the normalised
+    conversation plus the context version, so a repeated question against
+    unchanged data skips the upstream call. Concurrent identical requests
+    share one upstream call. Failed calls are not cached.
+    """
+
+    loaded: list[bytes] = []
+
+    async def load() -> bytes:
+        body = orjson.dumps(await deepseek_chat(messages, max_tokens=max_tokens))
+        loaded.append(body)
+        return body
+
+    if not settings.AI_CHAT_CACHE_ENABLED:
+        return await deepseek_chat(messages, max_tokens=max_tokens)
+
+    key = cache_key(user_id, messages, max_tokens)
+    try:
+        body = await get_redis().get(key)
+        if body is not None:
+            metrics.incr("ai_chat_cache.hit")
+            await _touch(key)
+        else:
+            metrics.incr("ai_chat_cache.miss")
+            body = await _flight.run(
+                key, load, fetch=lambda: get_redis().get(key), store=lambda value: _store(key, value)
+            )
+    except (RedisError, OSError) as exc:
+        logger.warning("ai chat cache unavailable: %s", exc)
+        metrics.incr("ai_chat_cache.error")
+        if loaded:
+            return orjson.loads(loaded[0])  # already paid for; don't call upstream again
+        return await deepseek_chat(messages, max_tokens=max_tokens)
+
+    return orjson.loads(body)
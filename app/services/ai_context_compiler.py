@@ -0,0 +1,221 @@
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.services.ai_context_service import ContextSnapshot
+from app.utils.metrics import metrics
+from app.utils.search_index import tokenize
+
+# Relevance weights (tasks and comments compete for the same budget)
+OPEN_WEIGHT = 1.0
+RECENCY_WEIGHT = 1.0
+OVERLAP_WEIGHT = 2.0
+SELECTED_TASK_BONUS = 0.5  # comments on a task that is already included
+
+DESCRIPTION_CHARS = 160
+COMMENT_CHARS = 240
+
+HEADER = (
+    "Format: one item per line. W <id> <name> | "
+    "P <id> w<workspace> <name> - <description> | "
+    "T <id> p<project> <STATUS> <title> | C <id> t<task> <text>"
+)
+
+
+def chars_to_tokens(chars: int) -> int:
+    # No tokenizer dependency: ~4 characters per token for English/JSON-ish text
+    return (chars + settings.AI_CHARS_PER_TOKEN - 1) // settings.AI_CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str) -> int:
+    return chars_to_tokens(len(text))
+
+
+def _clip(text: str | None, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def workspace_line(w: dict) -> str:
+    return f"W {w['id']} {_clip(w['name'], 80)}"
+
+
+def project_line(p: dict) -> str:
+    line = f"P {p['id']} w{p['workspace_id']} {_clip(p['name'], 80)}"
+    if p.get("description"):
+        line += f" - {_clip(p['description'], DESCRIPTION_CHARS)}"
+    return line
+
+
+def task_line(t: dict) -> str:
+    return f"T {t['id']} p{t['project_id']} {t['status']} {_clip(t['title'], 120)}"
+
+
+def comment_line(c: dict) -> str:
+    return f"C {c['id']} t{c['task_id']} {_clip(c['content'], COMMENT_CHARS)}"
+
+
+@dataclass
+class CompiledContext:
+    skeleton: list[str]  # user, workspaces, projects (slow-changing)
+    tasks: list[str]
+    comments: list[str]
+    omitted_tasks: int
+    omitted_comments: int
+    tokens: int
+    omitted_workspaces: int = 0
+    omitted_projects: int = 0
+
+    @property
+    def volatile(self) -> list[str]:
+        lines = self.tasks + self.comments
+        if self.omitted_tasks or self.omitted_comments:
+            lines.append(
+                f"({self.omitted_tasks} older/less relevant tasks and "
+                f"{self.omitted_comments} comments omitted)"
+            )
+        return lines
+
+    def render(self) -> str:
+        return "\n".join([HEADER, *self.skeleton, *self.volatile])
+
+
+def _recency(items: dict[int, dict]) -> dict[int, float]:
+    """
+    Rank-normalised recency in [0, 1] by row version (falls back to id):
+    newest / most recently edited = 1.
+    """
+    order = sorted(items, key=lambda k: (items[k].get("version") or 0, k))
+    n = max(len(order) - 1, 1)
+    return {k: i / n for i, k in enumerate(order)}
+
+
+def _overlap(query: set[str], text: str | None) -> float:
+    if not query:
+        return 0.0
+    return len(query & set(tokenize(text))) / len(query)
+
+
+def _pick_skeleton(snapshot: ContextSnapshot, used: int, budget: int) -> tuple[dict, dict, int]:
+    """
+    Projects (with their workspace line) by open task count, then recency,
+    until `budget` is used; then workspaces without a picked project, newest
+    first. Independent of the user's message, so the skeleton stays a stable
+    prompt prefix from one turn to the next.
+    """
+    open_tasks: dict[int, int] = {}
+    for t in snapshot.tasks.values():
+        if t["status"] != "DONE":
+            open_tasks[t["project_id"]] = open_tasks.get(t["project_id"], 0) + 1
+    most_open = max(open_tasks.values(), default=0) or 1
+    project_recency = _recency(snapshot.projects)
+    project_scores = {
+        k: OPEN_WEIGHT * open_tasks.get(k, 0) / most_open + RECENCY_WEIGHT * project_recency[k]
+        for k in snapshot.projects
+    }
+
+    workspaces: dict[int, str] = {}
+    projects: dict[int, str] = {}
+    for k in sorted(project_scores, key=lambda k: (project_scores[k], k), reverse=True):
+        p = snapshot.projects[k]
+        lines = {"P": project_line(p)}
+        if p["workspace_id"] not in workspaces and p["workspace_id"] in snapshot.workspaces:
+            lines["W"] = workspace_line(snapshot.workspaces[p["workspace_id"]])
+        cost = sum(estimate_tokens(line) + 1 for line in lines.values())
+        if used + cost > budget:
+            continue
+        used += cost
+        projects[k] = lines["P"]
+        if "W" in lines:
+            workspaces[p["workspace_id"]] = lines["W"]
+
+    for k in sorted(snapshot.workspaces, reverse=True):
+        if k in workspaces:
+            continue
+        line = workspace_line(snapshot.workspaces[k])
+        cost = estimate_tokens(line) + 1
+        if used + cost <= budget:
+            used += cost
+            workspaces[k] = line
+
+    return workspaces, projects, used
+
+
+def compile_context(snapshot: ContextSnapshot, last_message: str | None = None,
+                    budget: int | None = None,
+                    relevance: dict[tuple[str, int], float] | None = None) -> CompiledContext:
+    """
+    Compact, token-budgeted rendering of a context snapshot. The skeleton
+    (user, workspaces, projects) gets up to AI_CONTEXT_SKELETON_SHARE of the
+    budget, busiest and newest projects first; tasks and comments are picked
+    by open status, recency and relevance to the user's last message until
+    the rest is used. Everything is emitted in id order so unchanged items
+    keep the same position from one turn to the next.
+
+    Relevance is word overlap, or the retrieval score from `relevance`
+    ({("task", id): 0..1}) when that is higher.
+    """
+    budget = settings.AI_CONTEXT_TOKEN_BUDGET if budget is None else budget
+    query = set(tokenize(last_message))
+    relevance = relevance or {}
+
+    user = f"U {snapshot.user['id']} {snapshot.user['email']}"
+    used = estimate_tokens(HEADER) + estimate_tokens(user) + 1
+    workspaces, projects, used = _pick_skeleton(
+        snapshot, used, int(budget * settings.AI_CONTEXT_SKELETON_SHARE)
+    )
+    skeleton = [user, *(workspaces[k] for k in sorted(workspaces)), *(projects[k] for k in sorted(projects))]
+    omitted_workspaces = len(snapshot.workspaces) - len(workspaces)
+    omitted_projects = len(snapshot.projects) - len(projects)
+    if omitted_workspaces or omitted_projects:
+        note = f"({omitted_projects} less active projects and {omitted_workspaces} workspaces omitted)"
+        skeleton.append(note)
+        used += estimate_tokens(note) + 1
+
+    task_recency = _recency(snapshot.tasks)
+    task_scores = {
+        k: OPEN_WEIGHT * (t["status"] != "DONE")
+        + RECENCY_WEIGHT * task_recency[k]
+        + OVERLAP_WEIGHT * max(_overlap(query, t["title"]), relevance.get(("task", k), 0.0))
+        for k, t in snapshot.tasks.items()
+    }
+    comment_recency = _recency(snapshot.comments)
+
+    candidates = [(score, "T", k) for k, score in task_scores.items()]
+    for k, c in snapshot.comments.items():
+        score = (
+            RECENCY_WEIGHT * comment_recency[k]
+            + OVERLAP_WEIGHT * max(_overlap(query, c["content"]), relevance.get(("comment", k), 0.0))
+            + SELECTED_TASK_BONUS * task_scores.get(c["task_id"], 0) / (OPEN_WEIGHT + RECENCY_WEIGHT + OVERLAP_WEIGHT)
+        )
+        candidates.append((score, "C", k))
+    candidates.sort(key=lambda item: item[0], reverse=True)
+
+    picked_tasks: dict[int, str] = {}
+    picked_comments: dict[int, str] = {}
+    for _, kind, k in candidates:
+        line = task_line(snapshot.tasks[k]) if kind == "T" else comment_line(snapshot.comments[k])
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            continue  # a shorter item further down may still fit
+        used += cost
+        (picked_tasks if kind == "T" else picked_comments)[k] = line
+
+    return CompiledContext(
+        skeleton=skeleton,
+        tasks=[picked_tasks[k] for k in sorted(picked_tasks)],
+        comments=[picked_comments[k] for k in sorted(picked_comments)],
+        omitted_tasks=len(snapshot.tasks) - len(picked_tasks),
+        omitted_comments=len(snapshot.comments) - len(picked_comments),
+        tokens=used,
+        omitted_workspaces=omitted_workspaces,
+        omitted_projects=omitted_projects,
+    )
+
+
+def record_savings(snapshot: ContextSnapshot, compiled: CompiledContext):
+    """
+    Tokens the old prompt (str() of the full context dict) would have used vs what we send.
+    """
+    full = chars_to_tokens(snapshot.chars)
+    metrics.observe("ai_context.tokens_sent", compiled.tokens)
+    metrics.observe("ai_context.tokens_saved", max(0, full - compiled.tokens))
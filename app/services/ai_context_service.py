@@ -1,75 +1,492 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.user import User
 from app.models.workspace import Workspace
 from app.models.project import Project
 from app.models.task import Task
 from app.models.comment import Comment
+from app.utils.embedding_index import VectorIndex, embed
+from app.utils.metrics import metrics
+from app.utils.ttl_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _entry_chars(entry: dict) -> int:
+    # Length of the entry in str(to_context()), including the ", " separator
+    return len(str(entry)) + 2
+
+
+@dataclass
+class ContextSnapshot:
+    """
+    Everything the AI prompt needs about one user's workspaces, keyed by id so
+    writes can patch it in place. `version` increases on every patch; task and
+    comment entries carry their row version (recency signal for the compiler).
+    `chars` is the running size of str(to_context()), kept up to date by
+    put()/discard() so it never has to be rendered just to be measured.
+    """
+    user: dict
+    workspaces: dict[int, dict] = field(default_factory=dict)
+    projects: dict[int, dict] = field(default_factory=dict)
+    tasks: dict[int, dict] = field(default_factory=dict)
+    comments: dict[int, dict] = field(default_factory=dict)
+    version: int = 0
+    chars: int = 0
+
+    def __post_init__(self):
+        self.chars = _entry_chars(self.user) + sum(
+            _entry_chars(entry)
+            for items in (self.workspaces, self.projects, self.tasks, self.comments)
+            for entry in items.values()
+        )
+
+    def put(self, section: str, entry: dict):
+        """Insert or replace `entry` in one of workspaces/projects/tasks/comments."""
+        items = getattr(self, section)
+        old = items.get(entry["id"])
+        if old is not None:
+            self.chars -= _entry_chars(old)
+        items[entry["id"]] = entry
+        self.chars += _entry_chars(entry)
+
+    def discard(self, section: str, item_id: int) -> dict | None:
+        entry = getattr(self, section).pop(item_id, None)
+        if entry is not None:
+            self.chars -= _entry_chars(entry)
+        return entry
+
+    def to_context(self) -> dict:
+        return {
+            "user": self.user,
+            "workspaces": [self.workspaces[k] for k in sorted(self.workspaces)],
+            "projects": [self.projects[k] for k in sorted(self.projects)],
+            "tasks": [self.tasks[k] for k in sorted(self.tasks)],
+            "comments": [self.comments[k] for k in sorted(self.comments)],
+        }
+
+    def drop_tasks(self, task_ids: set[int]):
+        for task_id in task_ids:
+            self.discard("tasks", task_id)
+        for comment_id in [k for k, c in self.comments.items() if c["task_id"] in task_ids]:
+            self.discard("comments", comment_id)
+
+    def drop_projects(self, project_ids: set[int]):
+        for project_id in project_ids:
+            self.discard("projects", project_id)
+        self.drop_tasks({k for k, t in self.tasks.items() if t["project_id"] in project_ids})
+
+
+def _workspace_entry(w) -> dict:
+    return {"id": w.id, "name": w.name, "created_at": str(w.created_at)}
+
+
+def _project_entry(p) -> dict:
+    return {"id": p.id, "name": p.name, "description": p.description, "workspace_id": p.workspace_id}
+
+
+def _task_entry(t) -> dict:
+    status = t.status.value if hasattr(t.status, "value") else t.status
+    return {"id": t.id, "title": t.title, "status": status, "project_id": t.project_id,
+            "version": getattr(t, "version", 0)}
+
+
+def _comment_entry(c) -> dict:
+    return {"id": c.id, "content": c.content, "task_id": c.task_id,
+            "version": getattr(c, "version", 0)}
+
+
+# user_id -> ContextSnapshot. Per process: writes handled by this worker patch
+# it immediately, writes on other workers show up after AI_CONTEXT_TTL_SECONDS.
+_snapshots = LRUTTLCache(maxsize=settings.AI_CONTEXT_CACHE_SIZE, ttl=settings.AI_CONTEXT_TTL_SECONDS)
+
+# Bumped by every patch; a cold build that overlapped a write is not cached
+_generation = 0
+
+
+async def _load_snapshot(user_id: int, db: AsyncSession) -> ContextSnapshot | None:
+    """
+    Cold build in one round trip: user -> owned workspaces -> projects ->
+    tasks -> comments as a single LEFT JOIN chain.
+    """
+    result = await db.execute(
+        select(
+            User.id.label("user_id"), User.email,
+            Workspace.id.label("w_id"), Workspace.name.label("w_name"),
+            Workspace.created_at.label("w_created_at"),
+            Project.id.label("p_id"), Project.name.label("p_name"),
+            Project.description.label("p_description"),
+            Task.id.label("t_id"), Task.title.label("t_title"), Task.status.label("t_status"),
+            Task.version.label("t_version"),
+            Comment.id.label("c_id"), Comment.content.label("c_content"),
+            Comment.version.label("c_version"),
+        )
+        .select_from(User)
+        .outerjoin(Workspace, Workspace.owner_id == User.id)
+        .outerjoin(Project, Project.workspace_id == Workspace.id)
+        .outerjoin(Task, Task.project_id == Project.id)
+        .outerjoin(Comment, Comment.task_id == Task.id)
+        .where(User.id == user_id)
+    )
+
+    snapshot = None
+    for r in result:
+        if snapshot is None:
+            snapshot = ContextSnapshot(user={"id": r.user_id, "email": r.email})
+        if r.w_id is not None and r.w_id not in snapshot.workspaces:
+            snapshot.put("workspaces", {"id": r.w_id, "name": r.w_name, "created_at": str(r.w_created_at)})
+        if r.p_id is not None and r.p_id not in snapshot.projects:
+            snapshot.put("projects", {
+                "id": r.p_id, "name": r.p_name, "description": r.p_description, "workspace_id": r.w_id,
+            })
+        if r.t_id is not None and r.t_id not in snapshot.tasks:
+            snapshot.put("tasks", {
+                "id": r.t_id, "title": r.t_title, "status": r.t_status.value, "project_id": r.p_id,
+                "version": r.t_version,
+            })
+        if r.c_id is not None:
+            snapshot.put("comments", {
+                "id": r.c_id, "content": r.c_content, "task_id": r.t_id, "version": r.c_version,
+            })
+
+    return snapshot
+
+
+async def get_context_snapshot(user_id: int, db: AsyncSession) -> ContextSnapshot | None:
+    snapshot = _snapshots.get(user_id)
+    if snapshot is not None:
+        metrics.incr("ai_context.hit")
+        return snapshot
+
+    metrics.incr("ai_context.miss")
+    generation = _generation
+    snapshot = await _load_snapshot(user_id, db)
+    if snapshot is not None and generation == _generation:
+        _snapshots.set(user_id, snapshot)
+    return snapshot
 
 
 async def build_user_context(user_id: int, db: AsyncSession):
     """
     Gather all user-related DB information to send as AI context.
     """
+    snapshot = await get_context_snapshot(user_id, db)
+    if snapshot is None:
+        return {}
+    return snapshot.to_context()
 
-    user = await db.scalar(select(User).where(User.id == user_id))
 
-    workspaces = await db.scalars(
-        select(Workspace).where(Workspace.owner_id == user_id)
-    )
-    workspaces = list(workspaces)
+# ---------------------------------------------------------
+# Retrieval: per-workspace embedding index of tasks and comments
+# ---------------------------------------------------------
+_KINDS = {"task": 1, "comment": 2}
+_KIND_NAMES = {v: k for k, v in _KINDS.items()}
+_ID_BITS = 40
 
-    projects = await db.scalars(
-        select(Project).where(Project.workspace_id.in_([w.id for w in workspaces]))
-    )
-    projects = list(projects)
+_indexes: dict[int, VectorIndex] = {}
 
-    tasks = await db.scalars(
-        select(Task).where(Task.project_id.in_([p.id for p in projects]))
-    )
-    tasks = list(tasks)
 
-    comments = await db.scalars(
-        select(Comment).where(Comment.task_id.in_([t.id for t in tasks]))
-    )
-    comments = list(comments)
-
-    # Build a structured summary
-    return {
-        "user": {"id": user.id, "email": user.email},
-        "workspaces": [
-            {
-                "id": w.id,
-                "name": w.name,
-                "created_at": str(w.created_at),
-            }
-            for w in workspaces
-        ],
-        "projects": [
-            {
-                "id": p.id,
-                "name": p.name,
-                "description": p.description,
-                "workspace_id": p.workspace_id,
-            }
-            for p in projects
-        ],
-        "tasks": [
-            {
-                "id": t.id,
-                "title": t.title,
-                "status": t.status.value,
-                "project_id": t.project_id,
-            }
-            for t in tasks
-        ],
-        "comments": [
-            {
-                "id": c.id,
-                "text": c.text,
-                "task_id": c.task_id,
-            }
-            for c in comments
-        ],
-    }
+def _index_key(kind: str, item_id: int) -> int:
+    return (_KINDS[kind] << _ID_BITS) | item_id
+
+
+def _workspace_index(workspace_id: int) -> VectorIndex:
+    index = _indexes.get(workspace_id)
+    if index is None:
+        index = _indexes[workspace_id] = VectorIndex(
+            settings.AI_EMBEDDING_DIR, f"ws_{workspace_id}", settings.AI_EMBEDDING_DIM
+        )
+    return index
+
+
+def _index_items(snapshot: ContextSnapshot) -> dict[int, list[tuple[int, int, str]]]:
+    """
+    (key, version, text) per workspace, copied out of the snapshot so the
+    embedding work can run off the event loop while writes keep patching it.
+    """
+    items: dict[int, list] = {ws_id: [] for ws_id in snapshot.workspaces}
+    task_workspace = {}
+    for t in snapshot.tasks.values():
+        ws_id = snapshot.projects[t["project_id"]]["workspace_id"]
+        task_workspace[t["id"]] = ws_id
+        items[ws_id].append((_index_key("task", t["id"]), t["version"] or 0, t["title"]))
+    for c in snapshot.comments.values():
+        ws_id = task_workspace[c["task_id"]]
+        items[ws_id].append((_index_key("comment", c["id"]), c["version"] or 0, c["content"]))
+    return items
+
+
+def _sync_index(index: VectorIndex, items: list[tuple[int, int, str]]):
+    """
+    Embed only items the index lacks or holds an older row version of (writes
+    made by other workers, or before the index existed).
+    """
+    keys = [key for key, _, _ in items]
+    stored = index.versions(keys)
+    stale = [item for item, have in zip(items, stored) if have < item[1]]
+    if stale:
+        metrics.incr("ai_context.embedded", len(stale))
+        index.upsert(
+            [key for key, _, _ in stale],
+            [version for _, version, _ in stale],
+            embed([text for _, _, text in stale], index.dim),
+        )
+
+
+def _retrieve(items_by_workspace: dict[int, list], question: str, k: int) -> dict[tuple[str, int], float]:
+    query = embed([question], settings.AI_EMBEDDING_DIM)[0]
+    if not query.any():
+        return {}
+
+    hits = []
+    for ws_id, items in items_by_workspace.items():
+        if not items:
+            continue
+        index = _workspace_index(ws_id)
+        _sync_index(index, items)
+        live = {key for key, _, _ in items}
+        # Over-fetch: rows of deleted items stay until overwritten and are skipped here
+        hits += [(score, key) for key, score in index.search(query, 2 * k) if key in live and score > 0]
+
+    hits = sorted(hits, reverse=True)[:k]
+    if not hits:
+        return {}
+    best = hits[0][0]
+    mask = (1 << _ID_BITS) - 1
+    return {(_KIND_NAMES[key >> _ID_BITS], key & mask): score / best for score, key in hits}
+
+
+async def retrieve_relevant(snapshot: ContextSnapshot, question: str | None,
+                            k: int | None = None) -> dict[tuple[str, int], float]:
+    """
+    Top-k tasks/comments most similar to `question`, as {("task", id): score}
+    with the best hit scored 1.0. Empty when retrieval is disabled.
+    """
+    if not settings.AI_EMBEDDING_ENABLED or not question:
+        return {}
+    items = _index_items(snapshot)
+    try:
+        return await asyncio.to_thread(_retrieve, items, question, k or settings.AI_RETRIEVAL_TOP_K)
+    except OSError:
+        logger.warning("ai context retrieval unavailable", exc_info=True)
+        metrics.incr("ai_context.retrieval_error")
+        return {}
+
+
+# Index writes (embedding + flock'd file writes) run on one background thread:
+# off the event loop, and still applied in the order the writes happened.
+_index_executor: ThreadPoolExecutor | None = None
+_index_pending = 0
+_index_pending_lock = threading.Lock()
+
+
+def _index_pending_add(n: int):
+    global _index_pending
+    with _index_pending_lock:
+        _index_pending += n
+        metrics.set_gauge("ai_context.index_writes_pending", _index_pending)
+
+
+def _index_write(workspace_id: int, fn):
+    # Index upkeep must never fail (or delay) the write request that triggered it
+    global _index_executor
+    if not settings.AI_EMBEDDING_ENABLED:
+        return
+
+    def run():
+        try:
+            fn(_workspace_index(workspace_id))
+        except Exception:
+            logger.warning("ai context index update failed", exc_info=True)
+            metrics.incr("ai_context.retrieval_error")
+        finally:
+            _index_pending_add(-1)
+
+    if _index_executor is None:
+        _index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-index")
+    _index_pending_add(1)
+    _index_executor.submit(run)
+
+
+def shutdown_index_writer():
+    """
+    Wait for queued index writes (blocking; lifespan runs it in a thread).
+    """
+    global _index_executor
+    if _index_executor is not None:
+        _index_executor.shutdown(wait=True)
+        _index_executor = None
+
+
+def _index_upsert(by_workspace: dict[int, dict[int, tuple[int, str]]]):
+    for ws_id, rows in by_workspace.items():
+        if rows:
+            _index_write(ws_id, lambda index, rows=rows: index.upsert(
+                list(rows), [v for v, _ in rows.values()], embed([t for _, t in rows.values()], index.dim)
+            ))
+
+
+def _index_remove(by_workspace: dict[int, set[int]]):
+    for ws_id, keys in by_workspace.items():
+        if keys:
+            _index_write(ws_id, lambda index, keys=keys: index.remove(list(keys)))
+
+
+# ---------------------------------------------------------
+# Write hooks: call after the write has committed
+# ---------------------------------------------------------
+def _patch(apply):
+    """
+    Run `apply(snapshot)` on every cached snapshot; it returns True when it
+    changed something. Cost is bounded by AI_CONTEXT_CACHE_SIZE, not by the
+    size of any account.
+    """
+    global _generation
+    _generation += 1
+    for _, snapshot in _snapshots.items():
+        if apply(snapshot):
+            snapshot.version += 1
+            metrics.incr("ai_context.patched")
+
+
+def invalidate_user_context(user_id: int):
+    global _generation
+    _generation += 1
+    _snapshots.pop(user_id)
+
+
+def on_workspace_written(workspace):
+    # Snapshots hold owned workspaces only, so just the owner's needs patching
+    global _generation
+    _generation += 1
+    snapshot = _snapshots.get(workspace.owner_id)
+    if snapshot is not None:
+        snapshot.put("workspaces", _workspace_entry(workspace))
+        snapshot.version += 1
+        metrics.incr("ai_context.patched")
+
+
+def on_workspace_deleted(workspace_id: int, owner_id: int):
+    global _generation
+    _generation += 1
+    snapshot = _snapshots.get(owner_id)
+    if snapshot is not None:
+        snapshot.discard("workspaces", workspace_id)
+        snapshot.drop_projects({k for k, p in snapshot.projects.items() if p["workspace_id"] == workspace_id})
+        snapshot.version += 1
+        metrics.incr("ai_context.patched")
+    _index_write(workspace_id, lambda index: index.drop())
+
+
+def on_project_written(project):
+    entry = _project_entry(project)
+
+    def apply(s):
+        if project.workspace_id not in s.workspaces:
+            return False
+        s.put("projects", entry)
+        return True
+
+    _patch(apply)
+
+
+def on_project_deleted(project_id: int):
+    def apply(s):
+        if project_id not in s.projects:
+            return False
+        s.drop_projects({project_id})
+        return True
+
+    _patch(apply)
+
+
+def on_project_bulk_changed(project_id: int):
+    """
+    Many rows changed at once (imports): affected snapshots are rebuilt on next use.
+    """
+    global _generation
+    _generation += 1
+    for user_id, snapshot in _snapshots.items():
+        if project_id in snapshot.projects:
+            _snapshots.pop(user_id)
+
+
+# The index hooks below only reach workspaces some cached snapshot covers;
+# any other index catches up by row version on its next retrieval.
+def on_tasks_written(tasks):
+    entries = [_task_entry(t) for t in tasks]
+    to_index: dict[int, dict] = {}
+
+    def apply(s):
+        changed = False
+        for entry in entries:
+            if entry["project_id"] in s.projects:
+                s.put("tasks", entry)
+                ws_id = s.projects[entry["project_id"]]["workspace_id"]
+                to_index.setdefault(ws_id, {})[_index_key("task", entry["id"])] = (entry["version"], entry["title"])
+                changed = True
+        return changed
+
+    _patch(apply)
+    _index_upsert(to_index)
+
+
+def on_tasks_deleted(task_ids):
+    task_ids = set(task_ids)
+    to_remove: dict[int, set] = {}
+
+    def apply(s):
+        present = task_ids & s.tasks.keys()
+        if not present:
+            return False
+        for task_id in present:
+            ws_id = s.projects[s.tasks[task_id]["project_id"]]["workspace_id"]
+            to_remove.setdefault(ws_id, set()).add(_index_key("task", task_id))
+        for c in s.comments.values():
+            if c["task_id"] in present:
+                ws_id = s.projects[s.tasks[c["task_id"]]["project_id"]]["workspace_id"]
+                to_remove[ws_id].add(_index_key("comment", c["id"]))
+        s.drop_tasks(present)
+        return True
+
+    _patch(apply)
+    _index_remove(to_remove)
+
+
+def on_comment_written(comment):
+    entry = _comment_entry(comment)
+    to_index: dict[int, dict] = {}
+
+    def apply(s):
+        if comment.task_id not in s.tasks:
+            return False
+        s.put("comments", entry)
+        ws_id = s.projects[s.tasks[comment.task_id]["project_id"]]["workspace_id"]
+        to_index[ws_id] = {_index_key("comment", comment.id): (entry["version"], entry["content"])}
+        return True
+
+    _patch(apply)
+    _index_upsert(to_index)
+
+
+def on_comment_deleted(comment_id: int):
+    to_remove: dict[int, set] = {}
+
+    def apply(s):
+        c = s.discard("comments", comment_id)
+        if c is None:
+            return False
+        ws_id = s.projects[s.tasks[c["task_id"]]["project_id"]]["workspace_id"]
+        to_remove[ws_id] = {_index_key("comment", comment_id)}
+        return True
+
+    _patch(apply)
+    _index_remove(to_remove)
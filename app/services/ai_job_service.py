@@ -0,0 +1,252 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import case, literal, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.ai_request import AIRequest, AIRequestStatus, AIRequestType
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.schemas.ai_schema import AIJobCreate
+from app.services import ai_service
+from app.services.authz_service import accessible_workspace_ids
+from app.services.deepseek_client import deepseek_chat
+from app.services.prompt_templates import (
+    GUARDRAILS_PROMPT,
+    PROJECT_SUMMARY_PROMPT,
+    TASK_DESCRIPTION_PROMPT,
+    TASK_SUMMARY_PROMPT,
+)
+
+JOB_MAX_TOKENS = 500
+SUMMARY_COMMENTS = 50  # most recent comments fed into a task summary
+SUMMARY_TASKS = 200  # most recently updated tasks fed into a project summary
+
+FINISHED = (AIRequestStatus.DONE, AIRequestStatus.ERROR)
+
+
+class JobInputGone(Exception):
+    """The task / project a job refers to no longer exists; not retryable."""
+
+
+# ---------------------------------------------------------
+# API side: enqueue + status
+# ---------------------------------------------------------
+async def enqueue(db: AsyncSession, user_id: int, data: AIJobCreate) -> AIRequest:
+    """
+    Insert a PENDING job after checking the caller can see its task/project.
+    The caller commits; a worker picks it up from there.
+    """
+    visible = accessible_workspace_ids(user_id)
+    if data.task_id is not None:
+        found = await db.scalar(
+            select(Task.id)
+            .join(Project, Project.id == Task.project_id)
+            .where(Task.id == data.task_id, Project.workspace_id.in_(visible))
+        )
+        if found is None:
+            raise HTTPException(404, "Task not found")
+    if data.project_id is not None:
+        found = await db.scalar(
+            select(Project.id).where(Project.id == data.project_id, Project.workspace_id.in_(visible))
+        )
+        if found is None:
+            raise HTTPException(404, "Project not found")
+
+    job = AIRequest(
+        type=data.type,
+        status=AIRequestStatus.PENDING,
+        user_id=user_id,
+        task_id=data.task_id,
+        project_id=data.project_id,
+        payload={"messages": [m.model_dump() for m in data.messages]} if data.messages else None,
+    )
+    db.add(job)
+    await db.flush()
+    return job
+
+
+async def wait_for_job(db: AsyncSession, user_id: int, job_id: int, wait: float) -> AIRequest | None:
+    """
+    Long poll: return as soon as the job is finished, or its current state
+    after `wait` seconds. The transaction is ended between polls so a waiting
+    client does not hold a pooled connection.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    stmt = select(AIRequest).where(AIRequest.id == job_id, AIRequest.user_id == user_id)
+    while True:
+        job = await db.scalar(stmt)
+        if job is not None:
+            db.expunge(job)  # keep its loaded state; rollback would expire it
+        await db.rollback()
+        remaining = deadline - loop.time()
+        if job is None or job.status in FINISHED or remaining <= 0:
+            return job
+        await asyncio.sleep(min(settings.AI_JOB_WAIT_POLL_SECONDS, remaining))
+
+
+# ---------------------------------------------------------
+# Worker side: claim / run / finish
+# ---------------------------------------------------------
+async def claim_jobs(db: AsyncSession, limit: int) -> list[Row]:
+    """
+    Move up to `limit` of the oldest PENDING jobs to PROCESSING and return
+    them. SKIP LOCKED lets any number of workers claim concurrently without
+    blocking on, or double-claiming, each other's rows.
+    """
+    head = (
+        select(AIRequest.id)
+        .where(AIRequest.status == AIRequestStatus.PENDING)
+        .order_by(AIRequest.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(AIRequest)
+        .where(AIRequest.id.in_(head.scalar_subquery()))
+        .values(
+            status=AIRequestStatus.PROCESSING,
+            started_at=datetime.utcnow(),
+            attempts=AIRequest.attempts + 1,
+        )
+        .returning(
+            AIRequest.id, AIRequest.type, AIRequest.user_id, AIRequest.task_id,
+            AIRequest.project_id, AIRequest.payload, AIRequest.attempts,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    jobs = result.all()
+    await db.commit()
+    return sorted(jobs, key=lambda job: job.id)
+
+
+async def finish_job(db: AsyncSession, job: Row, *, result_text: str | None = None,
+                     error: str | None = None, retry: bool = False) -> bool:
+    """
+    Record the outcome. Guarded on (status, attempts) so a worker that was
+    presumed dead and reaped cannot overwrite a later attempt. With `retry`
+    the job goes back to PENDING while attempts remain.
+    """
+    if error is None:
+        status = AIRequestStatus.DONE
+    elif retry and job.attempts < settings.AI_JOB_MAX_ATTEMPTS:
+        status = AIRequestStatus.PENDING
+    else:
+        status = AIRequestStatus.ERROR
+
+    result = await db.execute(
+        update(AIRequest)
+        .where(
+            AIRequest.id == job.id,
+            AIRequest.status == AIRequestStatus.PROCESSING,
+            AIRequest.attempts == job.attempts,
+        )
+        .values(
+            status=status,
+            result_text=result_text,
+            error=error,
+            finished_at=None if status == AIRequestStatus.PENDING else datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def requeue_stale(db: AsyncSession) -> int:
+    """
+    Jobs stuck in PROCESSING past AI_JOB_TIMEOUT_SECONDS (worker crashed or
+    was killed) go back to PENDING, or to ERROR once out of attempts.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.AI_JOB_TIMEOUT_SECONDS)
+    out_of_attempts = AIRequest.attempts >= settings.AI_JOB_MAX_ATTEMPTS
+    # Typed binds: untyped CASE branches resolve to text, which the enum column rejects
+    status = AIRequest.status.type
+    result = await db.execute(
+        update(AIRequest)
+        .where(AIRequest.status == AIRequestStatus.PROCESSING, AIRequest.started_at < cutoff)
+        .values(
+            status=case(
+                (out_of_attempts, literal(AIRequestStatus.ERROR, status)),
+                else_=literal(AIRequestStatus.PENDING, status),
+            ),
+            error=case((out_of_attempts, "worker timed out"), else_=None),
+            finished_at=case((out_of_attempts, datetime.utcnow()), else_=None),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+def _task_block(task: Task, comments: list[Comment]) -> str:
+    lines = [f"Title: {task.title}", f"Status: {task.status.value}"]
+    if task.description:
+        lines.append(f"Description: {task.description}")
+    lines += [f"Comment: {c.content}" for c in comments]
+    return "\n".join(lines)
+
+
+async def _task_messages(db: AsyncSession, job: Row, template: str, with_comments: bool) -> list:
+    task = await db.get(Task, job.task_id)
+    if task is None:
+        raise JobInputGone("Task not found")
+
+    comments = []
+    if with_comments:
+        comments = list(reversed((await db.scalars(
+            select(Comment)
+            .where(Comment.task_id == task.id)
+            .order_by(Comment.created_at.desc())
+            .limit(SUMMARY_COMMENTS)
+        )).all()))
+
+    prompt = template.format(task=_task_block(task, comments))
+    return [{"role": "system", "content": GUARDRAILS_PROMPT}, {"role": "user", "content": prompt}]
+
+
+async def _project_messages(db: AsyncSession, job: Row) -> list:
+    project = await db.get(Project, job.project_id)
+    if project is None:
+        raise JobInputGone("Project not found")
+
+    tasks = (await db.scalars(
+        select(Task)
+        .where(Task.project_id == project.id)
+        .order_by(Task.updated_at.desc())
+        .limit(SUMMARY_TASKS)
+    )).all()
+
+    lines = [f"Project: {project.name}"]
+    if project.description:
+        lines.append(f"Description: {project.description}")
+    lines += [f"- [{t.status.value}] {t.title}" for t in tasks]
+    prompt = PROJECT_SUMMARY_PROMPT.format(project="\n".join(lines))
+    return [{"role": "system", "content": GUARDRAILS_PROMPT}, {"role": "user", "content": prompt}]
+
+
+def _content(result: dict) -> str:
+    return result["choices"][0]["message"]["content"]
+
+
+async def run_job(db: AsyncSession, job: Row) -> str:
+    """
+    Produce the result text for one claimed job.
+    """
+    if job.type == AIRequestType.CHAT:
+        result = await ai_service.chat((job.payload or {}).get("messages", []), job.user_id, db)
+        return _content(result)
+
+    if job.type == AIRequestType.DESCRIPTION:
+        messages = await _task_messages(db, job, TASK_DESCRIPTION_PROMPT, with_comments=False)
+    elif job.task_id is not None:
+        messages = await _task_messages(db, job, TASK_SUMMARY_PROMPT, with_comments=True)
+    else:
+        messages = await _project_messages(db, job)
+
+    return _content(await deepseek_chat(messages, max_tokens=JOB_MAX_TOKENS))
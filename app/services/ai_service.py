@@ -1,18 +1,99 @@
-from app.services.deepseek_client import deepseek_chat
-from app.services.ai_context_service import build_user_context
-from app.services.prompt_templates import SYSTEM_PROMPT
+import asyncio
+import json
+import logging
+from typing import AsyncIterator
 
+import httpx
 
-async def chat(messages: list, user_id: int, db):
+from app.db.session import async_session
+from app.models.ai_request import AIRequest, AIRequestStatus, AIRequestType
+from app.services.ai_chat_cache import cached_chat
+from app.services.deepseek_client import deepseek_chat_stream
+from app.services.ai_context_service import get_context_snapshot, retrieve_relevant
+from app.services.ai_context_compiler import compile_context, record_savings
+from app.services.prompt_assembly import assemble_messages
+
+logger = logging.getLogger(__name__)
+
+CHAT_MAX_TOKENS = 500
+
+
+def _last_user_message(messages: list) -> str | None:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return message.get("content")
+    return None
+
+
+async def _build_messages(messages: list, user_id: int, db) -> list:
     # 1) Load user's project/task/workspace data
-    context = await build_user_context(user_id, db)
+    snapshot = await get_context_snapshot(user_id, db)
+
+    # 2) Compact it to the token budget, most relevant items first
+    compiled = None
+    if snapshot is not None:
+        question = _last_user_message(messages)
+        relevance = await retrieve_relevant(snapshot, question)
+        compiled = compile_context(snapshot, question, relevance=relevance)
+        record_savings(snapshot, compiled)
 
-    # 2) Inject guardrails + database context
-    system_message = SYSTEM_PROMPT.replace("{context}", str(context))
+    # 3) Guardrails + stable skeleton first, volatile deltas, then the conversation
+    return assemble_messages(compiled, messages)
 
-    # Prepend to user messages
-    final_messages = [{"role": "system", "content": system_message}] + messages
 
-    # 3) DeepSeek call
-    result = await deepseek_chat(final_messages, max_tokens=500)
+async def chat(messages: list, user_id: int, db):
+    final_messages = await _build_messages(messages, user_id, db)
+
+    # 4) DeepSeek call (cached while the question and the context are unchanged)
+    result = await cached_chat(user_id, final_messages, max_tokens=CHAT_MAX_TOKENS)
     return result
+
+
+def _sse(data: dict, event: str | None = None) -> str:
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data)}\n\n"
+
+
+async def _save_chat(user_id: int, text: str, status: AIRequestStatus) -> int:
+    # Own session: the request-scoped one may already be closed while streaming
+    async with async_session() as session:
+        row = AIRequest(
+            type=AIRequestType.CHAT,
+            status=status,
+            user_id=user_id,
+            result_text=text,
+        )
+        session.add(row)
+        await session.commit()
+        return row.id
+
+
+async def chat_stream(messages: list, user_id: int, db) -> AsyncIterator[str]:
+    """
+    Build the prompt now (errors surface as normal HTTP errors), then return
+    an SSE event stream: `data: {"delta": ...}` per token chunk, then
+    `event: done` with the stored AIRequest id (or `event: error`).
+    If the client disconnects, Starlette cancels the stream, which closes the
+    upstream request; the partial text is still recorded.
+    """
+    final_messages = await _build_messages(messages, user_id, db)
+
+    async def events():
+        parts: list[str] = []
+        status = AIRequestStatus.ERROR
+        try:
+            async for delta in deepseek_chat_stream(final_messages, max_tokens=CHAT_MAX_TOKENS):
+                parts.append(delta)
+                yield _sse({"delta": delta})
+            status = AIRequestStatus.DONE
+        except httpx.HTTPError:
+            logger.warning("ai chat stream: upstream failed", exc_info=True)
+            yield _sse({"detail": "AI service unavailable"}, event="error")
+        finally:
+            # Shielded so a disconnect-triggered cancel can't drop the record
+            request_id = await asyncio.shield(_save_chat(user_id, "".join(parts), status))
+
+        if status == AIRequestStatus.DONE:
+            yield _sse({"request_id": request_id}, event="done")
+
+    return events()
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+from sqlalchemy import and_, exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.models.workspace import Workspace
+from app.models.workspace_member import WorkspaceMember
+from app.utils.metrics import metrics
+from app.utils.ttl_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "authz:invalidate"
+
+# Higher rank includes everything below it
+ROLE_RANK = {"member": 1, "admin": 2, "owner": 3}
+
+_MISSING = object()  # cached "workspace does not exist"
+
+# (user_id, workspace_id) -> role | None | _MISSING.
+# Per-process and short-lived. Invalidations are broadcast on
+# INVALIDATION_CHANNEL so a revoked member loses access on every worker at
+# once; only if Redis is unreachable do other workers fall back to
+# AUTHZ_CACHE_TTL_SECONDS.
+_role_cache = LRUTTLCache(
+    maxsize=settings.AUTHZ_CACHE_SIZE, ttl=settings.AUTHZ_CACHE_TTL_SECONDS
+)
+_listener: asyncio.Task | None = None
+
+
+def accessible_workspace_ids(user_id: int):
+    """
+    Subquery of workspace ids the user owns or is a member of.
+    """
+    return select(Workspace.id).where(
+        or_(
+            Workspace.owner_id == user_id,
+            exists().where(
+                WorkspaceMember.workspace_id == Workspace.id,
+                WorkspaceMember.user_id == user_id,
+            ),
+        )
+    )
+
+
+async def _load_role(db: AsyncSession, user_id: int, workspace_id: int):
+    # Workspace + the caller's membership in one round trip
+    result = await db.execute(
+        select(Workspace.owner_id, WorkspaceMember.role)
+        .outerjoin(
+            WorkspaceMember,
+            and_(
+                WorkspaceMember.workspace_id == Workspace.id,
+                WorkspaceMember.user_id == user_id,
+            ),
+        )
+        .where(Workspace.id == workspace_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return _MISSING
+    if row.owner_id == user_id:
+        return "owner"
+    return row.role
+
+
+async def get_workspace_role(db: AsyncSession, user_id: int, workspace_id: int):
+    """
+    The user's role in the workspace ("owner" / "admin" / "member"), None if
+    they have no access, or _MISSING if the workspace does not exist.
+    Memoized on the session for the request and in a short-TTL process cache.
+    """
+    key = (user_id, workspace_id)
+
+    memo = db.info.setdefault("authz_roles", {})
+    if key in memo:
+        metrics.incr("authz.hit.request")
+        return memo[key]
+
+    role = _role_cache.get(key, default=False)
+    if role is not False:
+        metrics.incr("authz.hit.cache")
+    else:
+        metrics.incr("authz.miss")
+        role = await _load_role(db, user_id, workspace_id)
+        _role_cache.set(key, role)
+
+    memo[key] = role
+    return role
+
+
+async def require_workspace_role(db: AsyncSession, user_id: int, workspace_id: int,
+                                 min_role: str = "member") -> str:
+    """
+    404 if the workspace does not exist, 403 unless the user holds at least `min_role`.
+    """
+    role = await get_workspace_role(db, user_id, workspace_id)
+
+    if role is _MISSING:
+        raise HTTPException(status_code=404, detail="Workspace not found")
+
+    if role is None or ROLE_RANK.get(role, 0) < ROLE_RANK[min_role]:
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    return role
+
+
+def _drop(workspace_id: int, user_id: int | None):
+    if user_id is not None:
+        _role_cache.pop((user_id, workspace_id))
+    else:
+        for key, _ in _role_cache.items():
+            if key[1] == workspace_id:
+                _role_cache.pop(key)
+
+
+def invalidate_workspace_role(workspace_id: int, user_id: int | None = None):
+    """
+    Drop cached decisions after membership / ownership changes commit.
+    Without user_id, every user's entry for the workspace goes. The local
+    entry is dropped immediately; other workers are told over Redis.
+    """
+    _drop(workspace_id, user_id)
+    metrics.incr("authz.invalidated")
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    message = str(workspace_id) if user_id is None else f"{workspace_id}:{user_id}"
+    loop.create_task(_broadcast(message))
+
+
+async def _broadcast(message: str):
+    try:
+        await get_redis().publish(INVALIDATION_CHANNEL, message)
+    except (RedisError, OSError):
+        # Other workers converge within AUTHZ_CACHE_TTL_SECONDS
+        logger.warning("authz: invalidation broadcast failed", exc_info=True)
+        metrics.incr("authz.broadcast_error")
+
+
+# ---------------------------------------------------------
+# Invalidations from other workers (FastAPI lifespan)
+# ---------------------------------------------------------
+def start_listener():
+    global _listener
+    if _listener is None or _listener.done():
+        _listener = asyncio.create_task(_listen(), name="authz-invalidations")
+
+
+async def stop_listener():
+    global _listener
+    if _listener is None:
+        return
+    _listener.cancel()
+    try:
+        await _listener
+    except asyncio.CancelledError:
+        pass
+    _listener = None
+
+
+async def _listen():
+    while True:
+        try:
+            async with get_redis().pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything missed while (re)subscribing may still be cached
+                _role_cache.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        workspace_id, _, user_id = message["data"].decode().partition(":")
+                        _drop(int(workspace_id), int(user_id) if user_id else None)
+                        metrics.incr("authz.invalidated.remote")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("authz: invalidation listener failed", exc_info=True)
+            metrics.incr("authz.listener_errors")
+            await asyncio.sleep(1)
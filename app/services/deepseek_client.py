@@ -1,7 +1,122 @@
+import importlib.util
+import json
+import logging
+import time
+from typing import AsyncIterator
+
 import httpx
 from app.core.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_client: httpx.AsyncClient | None = None
+
+
+def _http2_available() -> bool:
+    # httpx only speaks HTTP/2 when the optional h2 package is installed (httpx[http2])
+    return importlib.util.find_spec("h2") is not None
+
 
-DEEPSEEK_URL = "https://api.deepseek.com/v1/chat/completions"
+def _build_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    http2 = settings.DEEPSEEK_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("DEEPSEEK_HTTP2 is set but h2 is not installed; using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        transport=transport,
+        limits=httpx.Limits(
+            max_connections=settings.DEEPSEEK_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.DEEPSEEK_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.DEEPSEEK_CONNECT_TIMEOUT_SECONDS,
+            read=settings.DEEPSEEK_READ_TIMEOUT_SECONDS,
+            write=settings.DEEPSEEK_WRITE_TIMEOUT_SECONDS,
+            pool=settings.DEEPSEEK_POOL_TIMEOUT_SECONDS,
+        ),
+        headers={"Authorization": f"Bearer {settings.DEEPSEEK_API_KEY}"},
+    )
+
+
+async def start(transport: httpx.AsyncBaseTransport | None = None):
+    """
+    Open the shared client (FastAPI lifespan). `transport` lets tests point it
+    at an in-process stand-in, e.g. httpx.ASGITransport(app=fake_completions).
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = _build_client(transport)
+
+
+async def close():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Shared pooled client; created lazily when used outside the app lifespan
+    (scripts, workers).
+    """
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+class _RequestTrace:
+    """
+    httpcore trace hook. Time before request headers go out, minus time spent
+    opening a new connection, is time spent waiting for a pooled connection.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.connect_started: float | None = None
+        self.connect_seconds = 0.0
+        self.pool_wait_seconds: float | None = None
+
+    async def __call__(self, event: str, info: dict):
+        now = time.perf_counter()
+        if event in ("connection.connect_tcp.started", "connection.start_tls.started"):
+            self.connect_started = now
+        elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if self.connect_started is not None:
+                self.connect_seconds += now - self.connect_started
+                self.connect_started = None
+        elif event.endswith("send_request_headers.started") and self.pool_wait_seconds is None:
+            self.pool_wait_seconds = max(0.0, now - self.started - self.connect_seconds)
+
+
+def _record_usage(usage: dict | None):
+    """
+    Prefix (context) cache accounting from the `usage` block. DeepSeek reports
+    prompt_cache_hit/miss_tokens; OpenAI-compatible servers report
+    prompt_tokens_details.cached_tokens instead.
+    """
+    if not usage:
+        return
+    prompt = usage.get("prompt_tokens") or 0
+    hit = usage.get("prompt_cache_hit_tokens")
+    if hit is None:
+        hit = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+    miss = usage.get("prompt_cache_miss_tokens")
+    if miss is None:
+        miss = max(0, prompt - hit)
+
+    metrics.incr("deepseek.prompt_tokens", prompt)
+    metrics.incr("deepseek.completion_tokens", usage.get("completion_tokens") or 0)
+    metrics.incr("deepseek.prompt_cache_hit_tokens", hit)
+    metrics.incr("deepseek.prompt_cache_miss_tokens", miss)
+    if hit + miss:
+        metrics.observe("deepseek.prompt_cache_hit_ratio", hit / (hit + miss))
 
 
 async def deepseek_chat(messages: list, max_tokens: int = 512):
@@ -9,18 +124,85 @@ async def deepseek_chat(messages: list, max_tokens: int = 512):
     DeepSeek Cloud Chat Completion API Wrapper
     """
 
-    headers = {
-        "Authorization": f"Bearer {settings.DEEPSEEK_API_KEY}",
-        "Content-Type": "application/json",
+    payload = {
+        "model": "deepseek-chat",
+        "messages": messages,
+        "max_tokens": max_tokens,
     }
 
+    trace = _RequestTrace()
+    metrics.incr("deepseek.requests")
+    try:
+        response = await get_client().post(
+            settings.DEEPSEEK_URL, json=payload, extensions={"trace": trace}
+        )
+        response.raise_for_status()
+    except httpx.PoolTimeout:
+        metrics.incr("deepseek.errors.pool_timeout")
+        raise
+    except httpx.HTTPError:
+        metrics.incr("deepseek.errors")
+        raise
+    finally:
+        metrics.observe("deepseek.upstream_ms", (time.perf_counter() - trace.started) * 1000)
+        if trace.pool_wait_seconds is not None:
+            metrics.observe("deepseek.pool_wait_ms", trace.pool_wait_seconds * 1000)
+        if trace.connect_seconds:
+            metrics.incr("deepseek.connections.opened")
+            metrics.observe("deepseek.connect_ms", trace.connect_seconds * 1000)
+
+    result = response.json()
+    _record_usage(result.get("usage"))
+    return result
+
+
+async def deepseek_chat_stream(messages: list, max_tokens: int = 512) -> AsyncIterator[str]:
+    """
+    Streaming variant: yields content deltas as the upstream produces them.
+    Closing the generator (e.g. the client went away) closes the upstream request.
+    """
+
     payload = {
         "model": "deepseek-chat",
         "messages": messages,
         "max_tokens": max_tokens,
+        "stream": True,
+        "stream_options": {"include_usage": True},  # final chunk carries `usage`
     }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.post(DEEPSEEK_URL, json=payload, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    trace = _RequestTrace()
+    first_token = True
+    metrics.incr("deepseek.requests")
+    try:
+        async with get_client().stream(
+            "POST", settings.DEEPSEEK_URL, json=payload, extensions={"trace": trace}
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+
+                chunk = json.loads(data)
+                _record_usage(chunk.get("usage"))
+                for choice in chunk.get("choices", ()):
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        if first_token:
+                            first_token = False
+                            metrics.observe(
+                                "deepseek.first_token_ms", (time.perf_counter() - trace.started) * 1000
+                            )
+                        yield delta
+    except httpx.PoolTimeout:
+        metrics.incr("deepseek.errors.pool_timeout")
+        raise
+    except httpx.HTTPError:
+        metrics.incr("deepseek.errors")
+        raise
+    finally:
+        metrics.observe("deepseek.upstream_ms", (time.perf_counter() - trace.started) * 1000)
+        if trace.pool_wait_seconds is not None:
+            metrics.observe("deepseek.pool_wait_ms", trace.pool_wait_seconds * 1000)
@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator
+
+from sqlalchemy import func, select
+
+from app.db.session import async_read_session
+from app.models.activity_log import ActivityLog
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.services.authz_service import accessible_workspace_ids
+from app.utils.metrics import metrics
+
+EXPORT_CHUNK_SIZE = 1000
+
+TASK_EXPORT_COLUMNS = [
+    Task.id, Task.title, Task.description, Task.status,
+    Task.assignee_id, Task.project_id, Task.created_at,
+]
+COMMENT_EXPORT_COLUMNS = [
+    Comment.id, Comment.task_id, Comment.user_id, Comment.content, Comment.created_at,
+]
+LOG_EXPORT_COLUMNS = [
+    ActivityLog.id, ActivityLog.action, ActivityLog.old_value, ActivityLog.new_value,
+    ActivityLog.user_id, ActivityLog.task_id, ActivityLog.project_id, ActivityLog.created_at,
+]
+
+
+def _scoped(stmt, created_col, *, user_id: int, workspace_id: int | None,
+            project_id: int | None, date_from: datetime | None, date_to: datetime | None):
+    stmt = stmt.where(Project.workspace_id.in_(accessible_workspace_ids(user_id)))
+    if workspace_id is not None:
+        stmt = stmt.where(Project.workspace_id == workspace_id)
+    if project_id is not None:
+        stmt = stmt.where(Project.id == project_id)
+    if date_from is not None:
+        stmt = stmt.where(created_col >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(created_col <= date_to)
+    return stmt
+
+
+def tasks_export_query(**filters):
+    stmt = select(*TASK_EXPORT_COLUMNS).join(Project, Task.project_id == Project.id)
+    return _scoped(stmt, Task.created_at, **filters).order_by(Task.id)
+
+
+def comments_export_query(**filters):
+    stmt = (
+        select(*COMMENT_EXPORT_COLUMNS)
+        .join(Task, Comment.task_id == Task.id)
+        .join(Project, Task.project_id == Project.id)
+    )
+    return _scoped(stmt, Comment.created_at, **filters).order_by(Comment.id)
+
+
+def activity_logs_export_query(**filters):
+    # LEFT JOIN: logs of deleted tasks are scoped by the project_id they carry
+    stmt = (
+        select(*LOG_EXPORT_COLUMNS)
+        .outerjoin(Task, ActivityLog.task_id == Task.id)
+        .join(Project, Project.id == func.coalesce(Task.project_id, ActivityLog.project_id))
+    )
+    return _scoped(stmt, ActivityLog.created_at, **filters).order_by(ActivityLog.id)
+
+
+# ---------------------------------------------------------
+# Incremental encoders: one chunk of rows -> bytes
+# ---------------------------------------------------------
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def encode_ndjson(keys: list[str], rows) -> bytes:
+    return "".join(
+        json.dumps({k: _plain(v) for k, v in zip(keys, row)}, ensure_ascii=False) + "\n"
+        for row in rows
+    ).encode()
+
+
+def encode_csv(rows) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerows([_plain(v) for v in row] for row in rows)
+    return buf.getvalue().encode()
+
+
+async def stream_export(stmt, fmt: str, compress: bool, name: str,
+                        session_factory=async_read_session) -> AsyncIterator[bytes]:
+    """
+    Read through a server-side cursor in EXPORT_CHUNK_SIZE batches and yield
+    encoded (optionally gzipped) bytes. Uses its own session so it outlives
+    the request's dependencies while the response is being streamed; pass
+    session.read_session_factory(request) to honour read-your-writes.
+    """
+    keys = [c.key for c in stmt.selected_columns]
+    gz = zlib.compressobj(wbits=31) if compress else None  # 31 -> gzip container
+
+    def out(data: bytes) -> bytes:
+        return gz.compress(data) if gz else data
+
+    if fmt == "csv":
+        yield out(encode_csv([keys]))
+
+    rows = 0
+    async with session_factory() as session:
+        result = await session.stream(stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        async for partition in result.partitions():
+            rows += len(partition)
+            chunk = encode_csv(partition) if fmt == "csv" else encode_ndjson(keys, partition)
+            data = out(chunk)
+            if data:
+                yield data
+
+    if gz:
+        yield gz.flush()
+
+    metrics.incr(f"exports.{name}.rows", rows)
@@ -0,0 +1,304 @@
+import csv
+import json
+import logging
+import time
+import uuid
+from typing import AsyncIterator
+
+import orjson
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.models.task import TaskStatus
+from app.utils.metrics import metrics
+from app.utils.ttl_cache import LRUTTLCache
+
+TASK_FIELDS = ["title", "description", "status", "assignee_id"]
+COMMENT_FIELDS = ["task_id", "content"]  # authored by the importing user
+
+logger = logging.getLogger(__name__)
+
+# Progress of running/finished imports, keyed (user_id, import_id) so only the
+# user who started an import can poll it via GET /imports/{import_id}. It is
+# published to Redis so the poll can land on any worker; the local LRU holds
+# this worker's own imports, live, and covers Redis being unavailable.
+PROGRESS_KEY_PREFIX = "import:progress:"
+
+import_progress = LRUTTLCache(maxsize=1000, ttl=settings.IMPORT_PROGRESS_TTL_SECONDS)
+
+
+class ImportFailed(Exception):
+    def __init__(self, detail: str, line: int | None = None):
+        self.detail = detail
+        self.line = line
+        super().__init__(detail)
+
+
+def _progress_key(user_id: int, import_id: str) -> str:
+    return f"{PROGRESS_KEY_PREFIX}{user_id}:{import_id}"
+
+
+class ImportProgress(dict):
+    """
+    The progress body returned to the client; publish() mirrors it to Redis,
+    at most every IMPORT_PROGRESS_PUBLISH_SECONDS unless forced.
+    """
+
+    def __init__(self, user_id: int, **fields):
+        super().__init__(**fields)
+        self.user_id = user_id
+        self._published_at = 0.0
+
+    async def publish(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._published_at < settings.IMPORT_PROGRESS_PUBLISH_SECONDS:
+            return
+        self._published_at = now
+        try:
+            await get_redis().set(
+                _progress_key(self.user_id, self["import_id"]), orjson.dumps(self),
+                ex=settings.IMPORT_PROGRESS_TTL_SECONDS,
+            )
+        except (RedisError, OSError) as exc:
+            # Progress is informational; the import itself goes on
+            logger.warning("import progress not shared: %s", exc)
+            metrics.incr("imports.progress_error")
+
+
+async def new_import(import_id: str | None, kind: str, user_id: int) -> ImportProgress:
+    progress = ImportProgress(
+        user_id,
+        import_id=import_id or uuid.uuid4().hex,
+        kind=kind,
+        status="RUNNING",
+        rows=0,
+        bytes=0,
+        started_at=time.time(),
+        finished_at=None,
+        error=None,
+    )
+    import_progress.set((user_id, progress["import_id"]), progress)
+    await progress.publish(force=True)
+    return progress
+
+
+async def finish_import(progress: ImportProgress, **fields):
+    """Record the final state (DONE / FAILED) everywhere it can be polled."""
+    progress.update(finished_at=time.time(), **fields)
+    await progress.publish(force=True)
+
+
+async def get_import(import_id: str, user_id: int) -> dict | None:
+    progress = import_progress.get((user_id, import_id))
+    if progress is not None:
+        return progress
+    try:
+        body = await get_redis().get(_progress_key(user_id, import_id))
+    except (RedisError, OSError) as exc:
+        logger.warning("import progress unavailable: %s", exc)
+        metrics.incr("imports.progress_error")
+        return None
+    return orjson.loads(body) if body is not None else None
+
+
+# ---------------------------------------------------------
+# Streaming parsers: request body chunks -> dict rows (constant memory)
+# ---------------------------------------------------------
+async def _iter_lines(chunks: AsyncIterator[bytes], progress: dict) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in chunks:
+        progress["bytes"] += len(chunk)
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+async def parse_ndjson(chunks: AsyncIterator[bytes], progress: dict) -> AsyncIterator[tuple[int, dict]]:
+    line_no = 0
+    async for line in _iter_lines(chunks, progress):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            raise ImportFailed("Invalid JSON", line_no)
+        if not isinstance(row, dict):
+            raise ImportFailed("Each line must be a JSON object", line_no)
+        yield line_no, row
+
+
+async def parse_csv(chunks: AsyncIterator[bytes], progress: dict) -> AsyncIterator[tuple[int, dict]]:
+    header = None
+    pending = ""
+    line_no = 0
+    async for line in _iter_lines(chunks, progress):
+        line_no += 1
+        # A quoted field may span lines: keep reading until quotes balance
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            continue
+
+        if not pending:
+            continue
+        record = next(csv.reader([pending]))
+        pending = ""
+        if header is None:
+            header = [h.strip() for h in record]
+            continue
+        yield line_no, dict(zip(header, record))
+
+    if pending:
+        raise ImportFailed("Unterminated quoted field", line_no)
+
+
+# ---------------------------------------------------------
+# Row validation -> COPY records (tuples in *_FIELDS order)
+# ---------------------------------------------------------
+def _opt_int(value, field: str, line: int) -> int | None:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ImportFailed(f"{field} must be an integer", line)
+
+
+def task_record(row: dict, line: int) -> tuple:
+    title = (row.get("title") or "").strip()
+    if not 2 <= len(title) <= 255:
+        raise ImportFailed("title must be 2-255 characters", line)
+
+    status = row.get("status") or TaskStatus.TODO.value
+    if status not in TaskStatus.__members__:
+        raise ImportFailed(f"Unknown status {status!r}", line)
+
+    return (
+        title,
+        row.get("description") or None,
+        status,
+        _opt_int(row.get("assignee_id"), "assignee_id", line),
+    )
+
+
+def comment_record(row: dict, line: int) -> tuple:
+    # Any user_id column is ignored: imported comments are the caller's own
+    content = row.get("content") or ""
+    if not content.strip():
+        raise ImportFailed("content is required", line)
+
+    task_id = _opt_int(row.get("task_id"), "task_id", line)
+    if task_id is None:
+        raise ImportFailed("task_id is required", line)
+
+    return task_id, content
+
+
+async def _records(rows: AsyncIterator[tuple[int, dict]], to_record, progress: ImportProgress):
+    async for line, row in rows:
+        yield to_record(row, line)
+        progress["rows"] += 1
+        await progress.publish()
+
+
+# ---------------------------------------------------------
+# COPY into a per-transaction staging table, validate, then move in one INSERT
+# ---------------------------------------------------------
+async def _copy_to_staging(db: AsyncSession, ddl: str, table: str, columns: list[str], records):
+    # Run the DDL through SQLAlchemy first so the transaction is open on the
+    # connection before we touch the raw asyncpg driver.
+    await db.execute(text(ddl))
+
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(table, records=records, columns=columns)
+
+
+async def import_tasks(db: AsyncSession, rows: AsyncIterator[tuple[int, dict]], *,
+                       project_id: int, user_id: int, progress: ImportProgress) -> int:
+    """
+    Stream rows into tasks for one project. Nothing is visible until the
+    caller commits; any failure leaves the database untouched.
+    """
+    await _copy_to_staging(
+        db,
+        "CREATE TEMP TABLE import_tasks "
+        "(title text, description text, status text, assignee_id integer) ON COMMIT DROP",
+        "import_tasks",
+        TASK_FIELDS,
+        _records(rows, task_record, progress),
+    )
+
+    missing = await db.scalar(text(
+        "SELECT count(*) FROM import_tasks s "
+        "WHERE s.assignee_id IS NOT NULL "
+        "AND NOT EXISTS (SELECT 1 FROM users u WHERE u.id = s.assignee_id)"
+    ))
+    if missing:
+        raise ImportFailed(f"{missing} rows reference unknown assignees")
+
+    result = await db.execute(
+        text(
+            "WITH inserted AS ("
+            "  INSERT INTO tasks (title, description, status, project_id, assignee_id, created_at)"
+            "  SELECT title, description, status::taskstatus, :project_id, assignee_id,"
+            "         timezone('utc', now())"
+            "  FROM import_tasks"
+            "  RETURNING id, title"
+            "), logs AS ("
+            "  INSERT INTO activity_logs (user_id, task_id, project_id, action, new_value, created_at)"
+            "  SELECT :user_id, id, :project_id, 'TASK_CREATED', title, timezone('utc', now()) FROM inserted"
+            ") "
+            "SELECT count(*) FROM inserted"
+        ),
+        {"project_id": project_id, "user_id": user_id},
+    )
+    count = result.scalar_one()
+    metrics.incr("imports.tasks.rows", count)
+    return count
+
+
+async def import_comments(db: AsyncSession, rows: AsyncIterator[tuple[int, dict]], *,
+                          project_id: int, user_id: int, progress: ImportProgress) -> int:
+    """
+    Stream rows into comments by `user_id` on tasks of one project. Rows
+    pointing at tasks outside the project fail the whole import.
+    """
+    await _copy_to_staging(
+        db,
+        "CREATE TEMP TABLE import_comments "
+        "(task_id integer, content text) ON COMMIT DROP",
+        "import_comments",
+        COMMENT_FIELDS,
+        _records(rows, comment_record, progress),
+    )
+
+    invalid = await db.scalar(
+        text(
+            "SELECT count(*) FROM import_comments s "
+            "WHERE NOT EXISTS (SELECT 1 FROM tasks t WHERE t.id = s.task_id AND t.project_id = :project_id)"
+        ),
+        {"project_id": project_id},
+    )
+    if invalid:
+        raise ImportFailed(f"{invalid} rows reference tasks outside the project")
+
+    result = await db.execute(
+        text(
+            "WITH inserted AS ("
+            "  INSERT INTO comments (task_id, user_id, content, created_at)"
+            "  SELECT task_id, :user_id, content, timezone('utc', now()) FROM import_comments"
+            "  RETURNING 1"
+            ") SELECT count(*) FROM inserted"
+        ),
+        {"user_id": user_id},
+    )
+    count = result.scalar_one()
+    metrics.incr("imports.comments.rows", count)
+    return count
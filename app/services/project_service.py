@@ -0,0 +1,87 @@
+import asyncio
+import logging
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import async_session
+from app.models.project import Project
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Lock the counters first: a concurrent task write either committed before us
+# (and is counted) or blocks in its trigger until we commit (and adds its delta after).
+_LOCK_SQL = text(
+    "SELECT project_id FROM project_task_stats WHERE project_id = ANY(:ids) FOR UPDATE"
+)
+
+_REPAIR_SQL = text(
+    """
+    WITH actual AS (
+        SELECT p.id AS project_id,
+               count(t.id) FILTER (WHERE t.status = 'TODO')        AS todo,
+               count(t.id) FILTER (WHERE t.status = 'IN_PROGRESS') AS in_progress,
+               count(t.id) FILTER (WHERE t.status = 'DONE')        AS done
+        FROM projects p
+        LEFT JOIN tasks t ON t.project_id = p.id
+        WHERE p.id = ANY(:ids)
+        GROUP BY p.id
+    )
+    INSERT INTO project_task_stats AS s
+        (project_id, todo_count, in_progress_count, done_count, updated_at)
+    SELECT project_id, todo, in_progress, done, timezone('utc', now())
+    FROM actual
+    ON CONFLICT (project_id) DO UPDATE SET
+        todo_count = EXCLUDED.todo_count,
+        in_progress_count = EXCLUDED.in_progress_count,
+        done_count = EXCLUDED.done_count,
+        updated_at = EXCLUDED.updated_at
+    WHERE (s.todo_count, s.in_progress_count, s.done_count)
+          IS DISTINCT FROM (EXCLUDED.todo_count, EXCLUDED.in_progress_count, EXCLUDED.done_count)
+    RETURNING s.project_id
+    """
+)
+
+
+async def repair_project_task_stats(db: AsyncSession, batch_size: int = 500) -> int:
+    """
+    Recompute project_task_stats from tasks in batches of projects
+    (one short transaction per batch). Returns how many projects had drifted.
+    """
+    repaired = 0
+    last_id = 0
+
+    while True:
+        ids = (await db.scalars(
+            select(Project.id)
+            .where(Project.id > last_id)
+            .order_by(Project.id)
+            .limit(batch_size)
+        )).all()
+        if not ids:
+            break
+
+        await db.execute(_LOCK_SQL, {"ids": list(ids)})
+        result = await db.execute(_REPAIR_SQL, {"ids": list(ids)})
+        fixed = result.scalars().all()
+        await db.commit()
+
+        if fixed:
+            logger.warning("project_task_stats drift repaired for projects %s", fixed)
+        repaired += len(fixed)
+        last_id = ids[-1]
+
+    metrics.incr("project_task_stats.repaired", repaired)
+    return repaired
+
+
+async def _main():
+    async with async_session() as db:
+        repaired = await repair_project_task_stats(db)
+    print(f"repaired {repaired} project(s)")
+
+
+# python -m app.services.project_service
+if __name__ == "__main__":
+    asyncio.run(_main())
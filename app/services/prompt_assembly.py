@@ -0,0 +1,24 @@
+from app.services.ai_context_compiler import HEADER, CompiledContext
+from app.services.prompt_templates import DELTAS_PROMPT, GUARDRAILS_PROMPT, SKELETON_PROMPT
+
+
+def assemble_messages(compiled: CompiledContext | None, conversation: list) -> list:
+    """
+    Order the prompt from most to least stable so the upstream prefix cache
+    can reuse as much of it as possible between turns:
+
+    1. guardrails (identical for every request)
+    2. workspace/project skeleton (changes when the user edits the structure)
+    3. task and comment deltas (relevance-ranked per message)
+    4. the conversation
+
+    Anything per-request (timestamps, request ids, ...) must stay out of 1 and 2.
+    """
+    if compiled is None:
+        return [{"role": "system", "content": GUARDRAILS_PROMPT}] + conversation
+
+    skeleton = "\n".join([HEADER, *compiled.skeleton])
+    messages = [{"role": "system", "content": GUARDRAILS_PROMPT + "\n" + SKELETON_PROMPT.format(skeleton=skeleton)}]
+    if compiled.volatile:
+        messages.append({"role": "system", "content": DELTAS_PROMPT.format(deltas="\n".join(compiled.volatile))})
+    return messages + conversation
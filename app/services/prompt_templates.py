@@ -1,4 +1,6 @@
-SYSTEM_PROMPT = """
+# Keep these byte-for-byte stable: they form the prompt prefix the upstream
+# context cache reuses across turns and users (see prompt_assembly).
+GUARDRAILS_PROMPT = """
 You are TaskPilot AI. You ONLY help the user with:
 
 - Workspaces
@@ -15,8 +17,29 @@ Strict Rules:
 - If user asks something unrelated, respond: 
   "I can only help with your work, tasks, and productivity inside TaskPilot."
 
-Always use the database context provided below to answer:
+Always use the database context provided in the following system messages to answer.
+"""
+
+SKELETON_PROMPT = """DATABASE CONTEXT - workspaces and projects:
+{skeleton}
+"""
+
+DELTAS_PROMPT = """DATABASE CONTEXT - most relevant tasks and comments:
+{deltas}
+"""
+
+# Background jobs (app/tasks/ai_tasks.py); sent after GUARDRAILS_PROMPT
+TASK_SUMMARY_PROMPT = """Summarize this task and its discussion in 3-5 sentences: current state, decisions, open questions.
+
+{task}
+"""
+
+PROJECT_SUMMARY_PROMPT = """Summarize the state of this project in 5-8 sentences: progress, what is open, risks.
+
+{project}
+"""
+
+TASK_DESCRIPTION_PROMPT = """Write a clear, concise description (goal, scope, acceptance criteria) for this task.
 
-DATABASE CONTEXT:
-{context}
+{task}
 """
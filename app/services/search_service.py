@@ -0,0 +1,181 @@
+from enum import Enum
+
+from sqlalchemy import cast, func, literal, literal_column, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.services.authz_service import accessible_workspace_ids
+from app.utils.metrics import metrics
+from app.utils.search_index import InvertedIndex, highlight
+
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MinWords=5, MaxWords=20, MaxFragments=2"
+
+# Same replacements as html.escape(); "&" must go first
+HTML_ESCAPES = [("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;")]
+
+# Stored generated columns + GIN indexes (migration a4d9e2f7c1b5). They are
+# deliberately not mapped on the models so ORM inserts/updates never touch them.
+task_vector = literal_column("tasks.search_vector", TSVECTOR)
+comment_vector = literal_column("comments.search_vector", TSVECTOR)
+
+
+class SearchKind(str, Enum):
+    all = "all"
+    tasks = "tasks"
+    comments = "comments"
+
+
+def _html_escape(text):
+    # Snippets are HTML: escape the document before ts_headline adds <mark>
+    for char, entity in HTML_ESCAPES:
+        text = func.replace(text, char, entity)
+    return text
+
+
+def _scope(stmt, user_id: int, workspace_id: int | None, project_id: int | None):
+    stmt = stmt.where(Project.workspace_id.in_(accessible_workspace_ids(user_id)))
+    if workspace_id is not None:
+        stmt = stmt.where(Project.workspace_id == workspace_id)
+    if project_id is not None:
+        stmt = stmt.where(Project.id == project_id)
+    return stmt
+
+
+def _task_rows(user_id, workspace_id, project_id):
+    stmt = (
+        select(
+            literal("task").label("kind"),
+            Task.id.label("id"),
+            Task.id.label("task_id"),
+            Task.project_id.label("project_id"),
+            Project.workspace_id.label("workspace_id"),
+            Task.title.label("title"),
+            (Task.title + " " + func.coalesce(Task.description, "")).label("body"),
+            Task.created_at.label("created_at"),
+        )
+        .join(Project, Project.id == Task.project_id)
+    )
+    return _scope(stmt, user_id, workspace_id, project_id)
+
+
+def _comment_rows(user_id, workspace_id, project_id):
+    stmt = (
+        select(
+            literal("comment").label("kind"),
+            Comment.id.label("id"),
+            Comment.task_id.label("task_id"),
+            Task.project_id.label("project_id"),
+            Project.workspace_id.label("workspace_id"),
+            Task.title.label("title"),
+            Comment.content.label("body"),
+            Comment.created_at.label("created_at"),
+        )
+        .join(Task, Task.id == Comment.task_id)
+        .join(Project, Project.id == Task.project_id)
+    )
+    return _scope(stmt, user_id, workspace_id, project_id)
+
+
+async def search(
+    db: AsyncSession,
+    user_id: int,
+    q: str,
+    *,
+    kind: SearchKind = SearchKind.all,
+    workspace_id: int | None = None,
+    project_id: int | None = None,
+    limit: int = 20,
+) -> list[dict]:
+    """
+    Ranked, highlighted hits over task title/description and comment content,
+    limited to workspaces the user can access.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        metrics.incr("search.postgres")
+        return await _search_postgres(db, user_id, q, kind, workspace_id, project_id, limit)
+    metrics.incr("search.fallback")
+    return await _search_fallback(db, user_id, q, kind, workspace_id, project_id, limit)
+
+
+async def _search_postgres(db, user_id, q, kind, workspace_id, project_id, limit):
+    config = cast(literal(SEARCH_CONFIG), REGCONFIG)
+    tsq = func.websearch_to_tsquery(config, q)
+
+    parts = []
+    if kind in (SearchKind.all, SearchKind.tasks):
+        stmt = _task_rows(user_id, workspace_id, project_id)
+        rank = func.ts_rank_cd(task_vector, tsq)
+        parts.append(
+            stmt.add_columns(rank.label("rank"))
+            .where(task_vector.op("@@")(tsq))
+            .order_by(rank.desc())
+            .limit(limit)
+        )
+    if kind in (SearchKind.all, SearchKind.comments):
+        stmt = _comment_rows(user_id, workspace_id, project_id)
+        rank = func.ts_rank_cd(comment_vector, tsq)
+        parts.append(
+            stmt.add_columns(rank.label("rank"))
+            .where(comment_vector.op("@@")(tsq))
+            .order_by(rank.desc())
+            .limit(limit)
+        )
+
+    hits = (parts[0] if len(parts) == 1 else union_all(*parts)).subquery("hits")
+    top = (
+        select(hits)
+        .order_by(hits.c.rank.desc(), hits.c.created_at.desc())
+        .limit(limit)
+        .subquery("top")
+    )
+
+    # ts_headline re-parses the document, so only run it on the final page
+    result = await db.execute(
+        select(
+            top.c.kind, top.c.id, top.c.task_id, top.c.project_id, top.c.workspace_id,
+            top.c.title,
+            func.ts_headline(config, _html_escape(top.c.body), tsq, HEADLINE_OPTIONS).label("snippet"),
+            top.c.rank, top.c.created_at,
+        ).order_by(top.c.rank.desc(), top.c.created_at.desc())
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def _search_fallback(db, user_id, q, kind, workspace_id, project_id, limit):
+    """
+    Non-Postgres databases have no tsvector: build an in-memory inverted index
+    over the rows in scope and rank/highlight in Python.
+    """
+    index = InvertedIndex()
+
+    if kind in (SearchKind.all, SearchKind.tasks):
+        stmt = _task_rows(user_id, workspace_id, project_id).add_columns(Task.description)
+        for row in await db.execute(stmt):
+            index.add(
+                ("task", row.id),
+                {"title": ("A", row.title), "description": ("B", row.description)},
+                payload=dict(row._mapping),
+            )
+    if kind in (SearchKind.all, SearchKind.comments):
+        for row in await db.execute(_comment_rows(user_id, workspace_id, project_id)):
+            index.add(("comment", row.id), {"content": ("A", row.body)}, payload=dict(row._mapping))
+
+    hits = []
+    for doc_id, rank in index.search(q, limit=limit):
+        payload = index.doc(doc_id).payload
+        hits.append({
+            "kind": payload["kind"],
+            "id": payload["id"],
+            "task_id": payload["task_id"],
+            "project_id": payload["project_id"],
+            "workspace_id": payload["workspace_id"],
+            "title": payload["title"],
+            "snippet": highlight(payload["body"], q),
+            "rank": rank,
+            "created_at": payload["created_at"],
+        })
+    return hits
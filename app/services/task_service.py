@@ -0,0 +1,556 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import (
+    Integer, String, bindparam, case, cast, column, exists, func, insert, literal,
+    select, union_all, update, delete, values,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.activity_log import ActivityLog
+from app.models.ai_request import AIRequest
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.services.authz_service import accessible_workspace_ids
+from app.utils.activity_logger import activity_log_batcher, create_activity_log
+
+TASK_COLUMNS = list(Task.__table__.c)
+
+LOG_COLUMNS = ["user_id", "task_id", "project_id", "action", "old_value", "new_value", "created_at"]
+
+
+def _text(col):
+    # NULL-safe string rendering that matches the old str() based log values
+    return func.coalesce(cast(col, String), "None")
+
+
+def _with_old_values(task_id: int):
+    """
+    Row-locked snapshot of the task before the change, joined into the UPDATE
+    so RETURNING can expose old_* and new values together.
+    """
+    return (
+        select(Task.__table__)
+        .where(Task.id == task_id)
+        .with_for_update()
+        .subquery("old")
+    )
+
+
+def visible_tasks(user_id: int):
+    """Predicate: the task is in a workspace the user owns or belongs to."""
+    return Task.project_id.in_(
+        select(Project.id).where(Project.workspace_id.in_(accessible_workspace_ids(user_id)))
+    )
+
+
+def _delete_tasks(*criteria):
+    """
+    DELETE FROM tasks ... RETURNING, with the rows referencing those tasks
+    handled in the same statement: comments go with their task, AI requests
+    are kept but detached (task_id NULL). Activity logs keep their task_id
+    (no foreign key) and get the task's project_id, so the history stays
+    scoped to its project after the task is gone.
+    """
+    doomed = select(Task.id).where(*criteria)
+    scoped_logs = (
+        update(ActivityLog)
+        .where(ActivityLog.task_id.in_(doomed), ActivityLog.project_id.is_(None))
+        .values(project_id=select(Task.project_id).where(Task.id == ActivityLog.task_id).scalar_subquery())
+        .cte("scoped_logs")
+    )
+    detached_ai = (
+        update(AIRequest).where(AIRequest.task_id.in_(doomed)).values(task_id=None)
+        .cte("detached_ai_requests")
+    )
+    deleted_comments = delete(Comment).where(Comment.task_id.in_(doomed)).cte("deleted_comments")
+    return (
+        delete(Task)
+        .where(*criteria)
+        .returning(*TASK_COLUMNS)
+        .add_cte(scoped_logs, detached_ai, deleted_comments)
+    )
+
+
+def _deleted_task_value(c):
+    return cast(func.json_build_object("id", c.id, "title", c.title), String)
+
+
+def _log_values(c, old_value: Callable | None, new_value: Callable | None):
+    old_expr = old_value(c) if old_value else literal(None, String)
+    new_expr = new_value(c) if new_value else literal(None, String)
+    return old_expr, new_expr
+
+
+async def _execute_mutation(
+    db: AsyncSession,
+    dml,
+    *,
+    user_id: int,
+    action: str | Callable,
+    old_value: Callable | None,
+    new_value: Callable | None,
+) -> list[Row]:
+    changed = dml.cte("changed")
+    c = changed.c
+
+    old_expr, new_expr = _log_values(c, old_value, new_value)
+    action_expr = action(c) if callable(action) else literal(action, String)
+
+    stmt = select(
+        changed,
+        action_expr.label("log_action"),
+        old_expr.label("log_old_value"),
+        new_expr.label("log_new_value"),
+    )
+
+    batched = activity_log_batcher.running
+    if not batched:
+        log = insert(ActivityLog).from_select(
+            LOG_COLUMNS,
+            select(
+                literal(user_id),
+                c.id,
+                c.project_id,
+                action_expr,
+                old_expr,
+                new_expr,
+                bindparam("log_created_at", datetime.utcnow()),
+            ),
+        ).cte("log")
+        stmt = stmt.add_cte(log)
+
+    result = await db.execute(stmt)
+    rows = result.all()
+
+    if batched:
+        for row in rows:
+            await create_activity_log(
+                db,
+                user_id=user_id,
+                task_id=row.id,
+                project_id=row.project_id,
+                action=row.log_action,
+                old_value=row.log_old_value,
+                new_value=row.log_new_value,
+            )
+
+    return rows
+
+
+async def run_task_mutation(
+    db: AsyncSession,
+    dml,
+    *,
+    user_id: int,
+    action: str | Callable,
+    old_value: Callable | None = None,
+    new_value: Callable | None = None,
+) -> Row | None:
+    """
+    Execute a task INSERT/UPDATE/DELETE ... RETURNING and its activity log
+    in ONE statement:
+
+        WITH changed AS (<dml> RETURNING ...),
+             log AS (INSERT INTO activity_logs SELECT ... FROM changed)
+        SELECT * FROM changed
+
+    `old_value` / `new_value` (and `action`, when callable) build the log
+    values from the CTE columns. In batched log mode the log INSERT is left
+    out and the same values are returned so they can be staged for the
+    write-behind batcher. The log row carries the task's project_id too, so
+    it stays in the project's history if the task is deleted later.
+
+    Does not commit; returns None when the DML matched no row.
+    """
+    rows = await _execute_mutation(
+        db, dml,
+        user_id=user_id, action=action, old_value=old_value, new_value=new_value,
+    )
+    return rows[0] if rows else None
+
+
+async def run_task_mutation_many(
+    db: AsyncSession,
+    dml,
+    *,
+    user_id: int,
+    action: str | Callable,
+    old_value: Callable | None = None,
+    new_value: Callable | None = None,
+) -> list[Row]:
+    """Same as run_task_mutation for DML touching many tasks (one log row per task)."""
+    return await _execute_mutation(
+        db, dml,
+        user_id=user_id, action=action, old_value=old_value, new_value=new_value,
+    )
+
+
+# ---------------------------------------------------------
+# Single-task mutations (one round trip each, caller commits)
+# ---------------------------------------------------------
+async def create_task(db: AsyncSession, *, project_id: int, title: str,
+                      description: str | None, user_id: int) -> Row | None:
+    # INSERT ... SELECT ... WHERE project exists -> no separate project lookup
+    dml = (
+        insert(Task)
+        .from_select(
+            ["title", "description", "status", "project_id"],
+            select(
+                literal(title, String),
+                literal(description, String),
+                cast(literal(TaskStatus.TODO.value), Task.status.type),
+                literal(project_id),
+            ).where(exists().where(Project.id == project_id)),
+        )
+        .returning(*TASK_COLUMNS)
+    )
+    return await run_task_mutation(
+        db, dml,
+        user_id=user_id,
+        action="TASK_CREATED",
+        new_value=lambda c: c.title,
+    )
+
+
+async def update_task_fields(db: AsyncSession, task_id: int, *, title: str | None,
+                             description: str | None, user_id: int) -> Row | None:
+    old = _with_old_values(task_id)
+
+    values = {}
+    if title:
+        values["title"] = title
+    if description:
+        values["description"] = description
+    if not values:
+        values["title"] = Task.title  # no-op update still returns the row and logs
+
+    dml = (
+        update(Task)
+        .where(Task.id == old.c.id)
+        .values(**values)
+        .returning(*TASK_COLUMNS, old.c.title.label("old_title"),
+                   old.c.description.label("old_description"))
+    )
+    return await run_task_mutation(
+        db, dml,
+        user_id=user_id,
+        action="TASK_UPDATED",
+        old_value=lambda c: cast(func.json_build_object(
+            "title", c.old_title, "description", c.old_description), String),
+        new_value=lambda c: cast(func.json_build_object(
+            "title", c.title, "description", c.description), String),
+    )
+
+
+async def change_task_status(db: AsyncSession, task_id: int, status: TaskStatus,
+                             *, user_id: int) -> Row | None:
+    old = _with_old_values(task_id)
+    dml = (
+        update(Task)
+        .where(Task.id == old.c.id)
+        .values(status=status)
+        .returning(*TASK_COLUMNS, old.c.status.label("old_status"))
+    )
+    return await run_task_mutation(
+        db, dml,
+        user_id=user_id,
+        action="STATUS_CHANGED",
+        old_value=lambda c: cast(c.old_status, String),
+        new_value=lambda c: cast(c.status, String),
+    )
+
+
+async def assign_task(db: AsyncSession, task_id: int, assignee_id: int,
+                      *, user_id: int) -> Row | None:
+    old = _with_old_values(task_id)
+    dml = (
+        update(Task)
+        .where(Task.id == old.c.id)
+        .where(exists().where(User.id == assignee_id))
+        .values(assignee_id=assignee_id)
+        .returning(*TASK_COLUMNS, old.c.assignee_id.label("old_assignee_id"))
+    )
+    return await run_task_mutation(
+        db, dml,
+        user_id=user_id,
+        action="ASSIGNEE_UPDATED",
+        old_value=lambda c: _text(c.old_assignee_id),
+        new_value=lambda c: _text(c.assignee_id),
+    )
+
+
+async def unassign_task(db: AsyncSession, task_id: int, *, user_id: int) -> Row | None:
+    old = _with_old_values(task_id)
+    dml = (
+        update(Task)
+        .where(Task.id == old.c.id)
+        .where(old.c.assignee_id.isnot(None))
+        .values(assignee_id=None)
+        .returning(*TASK_COLUMNS, old.c.assignee_id.label("old_assignee_id"))
+    )
+    return await run_task_mutation(
+        db, dml,
+        user_id=user_id,
+        action="ASSIGNEE_REMOVED",
+        old_value=lambda c: _text(c.old_assignee_id),
+        new_value=lambda c: literal("None", String),
+    )
+
+
+async def delete_task(db: AsyncSession, task_id: int, *, user_id: int) -> Row | None:
+    return await run_task_mutation(
+        db, _delete_tasks(Task.id == task_id),
+        user_id=user_id,
+        action="TASK_DELETED",
+        old_value=_deleted_task_value,
+    )
+
+
+async def task_exists(db: AsyncSession, task_id: int) -> bool:
+    """Only used on failure paths to pick the right error."""
+    return await db.scalar(select(exists().where(Task.id == task_id)))
+
+
+# ---------------------------------------------------------
+# Bulk mutations (caller commits, or rolls back in all-or-nothing mode)
+# ---------------------------------------------------------
+@dataclass
+class BulkOutcome:
+    rows: list[Row] = field(default_factory=list)
+    errors: list[tuple[int, str]] = field(default_factory=list)  # (item index, detail)
+
+
+async def find_existing_ids(db: AsyncSession, *, project_ids: set[int] = frozenset(),
+                            user_ids: set[int] = frozenset(),
+                            visible_to: int | None = None) -> tuple[set[int], set[int]]:
+    """
+    Validate every referenced project and user in a single query.
+    Returns (existing project ids, existing user ids); with `visible_to`,
+    only projects in that user's workspaces count as existing.
+    """
+    parts = []
+    if project_ids:
+        projects = select(literal("project").label("kind"), Project.id.label("id")).where(
+            Project.id.in_(project_ids)
+        )
+        if visible_to is not None:
+            projects = projects.where(Project.workspace_id.in_(accessible_workspace_ids(visible_to)))
+        parts.append(projects)
+    if user_ids:
+        parts.append(
+            select(literal("user").label("kind"), User.id.label("id"))
+            .where(User.id.in_(user_ids))
+        )
+    if not parts:
+        return set(), set()
+
+    stmt = union_all(*parts) if len(parts) > 1 else parts[0]
+    rows = (await db.execute(stmt)).all()
+    return (
+        {r.id for r in rows if r.kind == "project"},
+        {r.id for r in rows if r.kind == "user"},
+    )
+
+
+def _duplicate_errors(keys: list[int], what: str) -> list[tuple[int, str]]:
+    seen = set()
+    errors = []
+    for idx, key in enumerate(keys):
+        if key in seen:
+            errors.append((idx, f"Duplicate {what} {key}"))
+        seen.add(key)
+    return errors
+
+
+def _missing_errors(pending: list[tuple[int, int]], found: set[int]) -> list[tuple[int, str]]:
+    return [(idx, "Task not found") for idx, task_id in pending if task_id not in found]
+
+
+async def _write_logs(db: AsyncSession, user_id: int, entries: list[tuple]):
+    """(task_id, project_id, action, old_value, new_value) entries -> one multi-row INSERT."""
+    if not entries:
+        return
+
+    if activity_log_batcher.running:
+        for task_id, project_id, action, old_value, new_value in entries:
+            await create_activity_log(
+                db, user_id=user_id, task_id=task_id, project_id=project_id, action=action,
+                old_value=old_value, new_value=new_value,
+            )
+        return
+
+    now = datetime.utcnow()
+    await db.execute(
+        insert(ActivityLog),
+        [
+            {
+                "user_id": user_id,
+                "task_id": task_id,
+                "project_id": project_id,
+                "action": action,
+                "old_value": old_value,
+                "new_value": new_value,
+                "created_at": now,
+            }
+            for task_id, project_id, action, old_value, new_value in entries
+        ],
+    )
+
+
+async def bulk_create_tasks(db: AsyncSession, items: list, *, user_id: int,
+                            atomic: bool) -> BulkOutcome:
+    projects, users = await find_existing_ids(
+        db,
+        project_ids={i.project_id for i in items},
+        user_ids={i.assignee_id for i in items if i.assignee_id},
+        visible_to=user_id,
+    )
+
+    outcome = BulkOutcome()
+    new_rows = []
+    for idx, item in enumerate(items):
+        if item.project_id not in projects:
+            outcome.errors.append((idx, "Project not found"))
+        elif item.assignee_id and item.assignee_id not in users:
+            outcome.errors.append((idx, "User not found"))
+        else:
+            new_rows.append({
+                "title": item.title,
+                "description": item.description,
+                "status": item.status,
+                "project_id": item.project_id,
+                "assignee_id": item.assignee_id,
+            })
+
+    if not new_rows or (atomic and outcome.errors):
+        return outcome
+
+    # Multi-row INSERT ... RETURNING (rows come back in parameter order)
+    result = await db.execute(
+        insert(Task).returning(*TASK_COLUMNS, sort_by_parameter_order=True),
+        new_rows,
+    )
+    outcome.rows = result.all()
+
+    await _write_logs(
+        db, user_id,
+        [(t.id, t.project_id, "TASK_CREATED", None, t.title) for t in outcome.rows],
+    )
+    return outcome
+
+
+async def bulk_change_status(db: AsyncSession, items: list, *, user_id: int,
+                             atomic: bool) -> BulkOutcome:
+    outcome = BulkOutcome(errors=_duplicate_errors([i.task_id for i in items], "task"))
+    if atomic and outcome.errors:
+        return outcome
+
+    bad = {idx for idx, _ in outcome.errors}
+    pending = [(idx, i) for idx, i in enumerate(items) if idx not in bad]
+
+    v = values(
+        column("task_id", Integer), column("status", String), name="v"
+    ).data([(i.task_id, i.status.value) for _, i in pending])
+
+    old = (
+        select(Task.id, Task.status)
+        .where(Task.id.in_([i.task_id for _, i in pending]), visible_tasks(user_id))
+        .with_for_update()
+        .subquery("old")
+    )
+    dml = (
+        update(Task)
+        .where(Task.id == old.c.id)
+        .where(Task.id == v.c.task_id)
+        .values(status=cast(v.c.status, Task.status.type))
+        .returning(*TASK_COLUMNS, old.c.status.label("old_status"))
+    )
+    outcome.rows = await run_task_mutation_many(
+        db, dml,
+        user_id=user_id,
+        action="STATUS_CHANGED",
+        old_value=lambda c: cast(c.old_status, String),
+        new_value=lambda c: cast(c.status, String),
+    )
+
+    found = {r.id for r in outcome.rows}
+    outcome.errors += _missing_errors([(idx, i.task_id) for idx, i in pending], found)
+    return outcome
+
+
+async def bulk_assign(db: AsyncSession, items: list, *, user_id: int,
+                      atomic: bool) -> BulkOutcome:
+    """Items with user_id=None unassign the task."""
+    outcome = BulkOutcome(errors=_duplicate_errors([i.task_id for i in items], "task"))
+
+    _, users = await find_existing_ids(db, user_ids={i.user_id for i in items if i.user_id})
+    bad = {idx for idx, _ in outcome.errors}
+    for idx, item in enumerate(items):
+        if idx not in bad and item.user_id and item.user_id not in users:
+            outcome.errors.append((idx, "User not found"))
+            bad.add(idx)
+
+    if atomic and outcome.errors:
+        return outcome
+
+    pending = [(idx, i) for idx, i in enumerate(items) if idx not in bad]
+    if not pending:
+        return outcome
+
+    v = values(
+        column("task_id", Integer), column("assignee_id", Integer), name="v"
+    ).data([(i.task_id, i.user_id) for _, i in pending])
+
+    old = (
+        select(Task.id, Task.assignee_id)
+        .where(Task.id.in_([i.task_id for _, i in pending]), visible_tasks(user_id))
+        .with_for_update()
+        .subquery("old")
+    )
+    dml = (
+        update(Task)
+        .where(Task.id == old.c.id)
+        .where(Task.id == v.c.task_id)
+        .values(assignee_id=cast(v.c.assignee_id, Integer))
+        .returning(*TASK_COLUMNS, old.c.assignee_id.label("old_assignee_id"))
+    )
+    outcome.rows = await run_task_mutation_many(
+        db, dml,
+        user_id=user_id,
+        action=lambda c: case(
+            (c.assignee_id.is_(None), literal("ASSIGNEE_REMOVED")),
+            else_=literal("ASSIGNEE_UPDATED"),
+        ),
+        old_value=lambda c: _text(c.old_assignee_id),
+        new_value=lambda c: _text(c.assignee_id),
+    )
+
+    found = {r.id for r in outcome.rows}
+    outcome.errors += _missing_errors([(idx, i.task_id) for idx, i in pending], found)
+    return outcome
+
+
+async def bulk_delete(db: AsyncSession, task_ids: list[int], *, user_id: int,
+                      atomic: bool) -> BulkOutcome:
+    outcome = BulkOutcome(errors=_duplicate_errors(task_ids, "task"))
+    if atomic and outcome.errors:
+        return outcome
+
+    bad = {idx for idx, _ in outcome.errors}
+    pending = [(idx, tid) for idx, tid in enumerate(task_ids) if idx not in bad]
+
+    dml = _delete_tasks(Task.id.in_([tid for _, tid in pending]), visible_tasks(user_id))
+    outcome.rows = await run_task_mutation_many(
+        db, dml,
+        user_id=user_id,
+        action="TASK_DELETED",
+        old_value=_deleted_task_value,
+    )
+
+    outcome.errors += _missing_errors(pending, {r.id for r in outcome.rows})
+    return outcome
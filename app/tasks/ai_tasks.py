@@ -0,0 +1,153 @@
+import asyncio
+import logging
+
+import httpx
+
+from app.core.config import settings
+from app.core.redis_client import close_redis
+from app.db.session import async_session, dispose_engines
+from app.services import ai_job_service, deepseek_client
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+REAP_INTERVAL_SECONDS = 30
+
+
+class AIJobWorker:
+    """
+    Runs queued AI jobs (ai_requests rows in PENDING) with up to
+    `concurrency` in flight. Any number of these can run, in separate
+    processes or inside API processes; SKIP LOCKED claiming keeps them from
+    stepping on each other.
+    """
+
+    def __init__(self, concurrency: int, poll_interval: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._task: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="ai-job-worker")
+
+    async def stop(self):
+        """
+        Stop claiming and wait for jobs in flight. Anything cut off by a hard
+        kill is requeued by requeue_stale() once AI_JOB_TIMEOUT_SECONDS pass.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_reap = 0.0
+        while True:
+            try:
+                if loop.time() >= next_reap:
+                    next_reap = loop.time() + REAP_INTERVAL_SECONDS
+                    async with async_session() as db:
+                        requeued = await ai_job_service.requeue_stale(db)
+                    if requeued:
+                        metrics.incr("ai_jobs.requeued", requeued)
+                        logger.warning("requeued %s stale AI jobs", requeued)
+
+                jobs = []
+                free = self.concurrency - len(self._running)
+                if free > 0:
+                    async with async_session() as db:
+                        jobs = await ai_job_service.claim_jobs(db, free)
+            except Exception:
+                # DB hiccup: keep the worker alive and try again
+                logger.exception("ai job worker: claim failed")
+                jobs = []
+
+            for job in jobs:
+                task = asyncio.create_task(self._process(job), name=f"ai-job-{job.id}")
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            metrics.set_gauge("ai_jobs.in_flight", len(self._running))
+
+            if jobs and len(self._running) < self.concurrency:
+                continue  # the queue may hold more; claim again right away
+
+            # Idle or full: wake up on the next poll or when a slot frees up
+            if self._running:
+                await asyncio.wait(self._running, timeout=self.poll_interval,
+                                   return_when=asyncio.FIRST_COMPLETED)
+            else:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _process(self, job):
+        started = asyncio.get_running_loop().time()
+        outcome = {}
+        try:
+            async with async_session() as db:
+                outcome["result_text"] = await ai_job_service.run_job(db, job)
+        except ai_job_service.JobInputGone as exc:
+            outcome = {"error": str(exc)}
+        except httpx.HTTPError as exc:
+            outcome = {"error": f"AI service unavailable: {exc.__class__.__name__}", "retry": True}
+        except Exception as exc:
+            logger.exception("ai job %s failed", job.id)
+            outcome = {"error": f"{exc.__class__.__name__}: {exc}"}
+
+        try:
+            async with async_session() as db:
+                recorded = await ai_job_service.finish_job(db, job, **outcome)
+        except Exception:
+            logger.exception("ai job %s: could not record outcome", job.id)
+            return
+
+        metrics.observe("ai_jobs.run_ms", (asyncio.get_running_loop().time() - started) * 1000)
+        if not recorded:
+            metrics.incr("ai_jobs.superseded")  # reaped and re-run elsewhere meanwhile
+        elif "error" not in outcome:
+            metrics.incr("ai_jobs.done")
+        elif outcome.get("retry") and job.attempts < settings.AI_JOB_MAX_ATTEMPTS:
+            metrics.incr("ai_jobs.retried")
+        else:
+            metrics.incr("ai_jobs.failed")
+
+
+ai_job_worker = AIJobWorker(
+    concurrency=settings.AI_WORKER_CONCURRENCY,
+    poll_interval=settings.AI_WORKER_POLL_SECONDS,
+)
+
+
+async def main():
+    """
+    Standalone worker: python -m app.tasks.ai_tasks
+    """
+    await deepseek_client.start()
+    ai_job_worker.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await ai_job_worker.stop()
+        await deepseek_client.close()
+        await close_redis()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
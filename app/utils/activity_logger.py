@@ -1,7 +1,22 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import event, insert
+from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import insert
+from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.db.session import async_session
 from app.models.activity_log import ActivityLog
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# session.info key holding rows staged for the batcher until the caller commits
+_PENDING_KEY = "pending_activity_logs"
 
 
 async def create_activity_log(
@@ -11,29 +26,199 @@ async def create_activity_log(
     task_id: int | None,
     action: str,
     old_value: str | None = None,
-    new_value: str | None = None
+    new_value: str | None = None,
+    project_id: int | None = None,
 ):
     """
     Create an activity log entry.
-    
+
+    The log becomes durable when the CALLER commits `db`:
+    - "transactional" mode: INSERT joins the caller's transaction
+    - "batched" mode: row is staged on the session and handed to the
+      write-behind batcher after commit (dropped on rollback)
+
     Parameters:
     - user_id: kis user ne action kiya
     - task_id: kis task par action kiya (comment/update/create)
     - action: action type string
     - old_value: purana value (optional)
     - new_value: naya value (optional)
+    - project_id: task ka project (optional; filled in when the task is deleted)
+    """
+
+    row = {
+        "user_id": user_id,
+        "task_id": task_id,
+        "project_id": project_id,
+        "action": action,
+        "old_value": old_value,
+        "new_value": new_value,
+        "created_at": datetime.utcnow(),
+    }
+
+    if activity_log_batcher.running:
+        await activity_log_batcher.wait_for_capacity()
+        db.info.setdefault(_PENDING_KEY, []).append(row)
+        return
+
+    await db.execute(insert(ActivityLog).values(**row))
+
+
+@event.listens_for(Session, "after_commit")
+def _hand_off_pending_logs(session: Session):
+    rows = session.info.pop(_PENDING_KEY, None)
+    if rows:
+        activity_log_batcher.submit_nowait(rows)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_logs(session: Session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+class ActivityLogBatcher:
+    """
+    In-process write-behind queue for activity logs.
+
+    Flushes one multi-row INSERT when `batch_size` rows are queued or
+    `flush_interval` seconds have passed since the first queued row.
+    Producers wait (up to `backpressure_timeout`) while the queue is full;
+    rows that still do not fit are dropped and counted. A batch the database
+    rejects is split and retried so only the offending rows are dropped.
     """
 
-    stmt = (
-        insert(ActivityLog)
-        .values(
-            user_id=user_id,
-            task_id=task_id,
-            action=action,
-            old_value=old_value,
-            new_value=new_value,
-        )
-    )
-
-    await db.execute(stmt)
-    await db.commit()
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_queue: int,
+        backpressure_timeout: float,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.backpressure_timeout = backpressure_timeout
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._batch: list[tuple[float, dict]] = []  # taken off the queue, not yet flushing
+        self._inflight: asyncio.Future | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name="activity-log-batcher")
+
+    async def stop(self):
+        """
+        Stop the worker and flush everything it still holds: the batch it
+        was collecting when cancelled, the one mid-INSERT, and the queue.
+        """
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self._inflight is not None and not self._inflight.done():
+            await self._inflight
+
+        remaining, self._batch = self._batch, []
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        for i in range(0, len(remaining), self.batch_size):
+            await self._flush(remaining[i:i + self.batch_size])
+
+    async def wait_for_capacity(self):
+        if self._queue.qsize() < self.max_queue:
+            return
+
+        metrics.incr("activity_log.backpressure_waits")
+        deadline = time.monotonic() + self.backpressure_timeout
+        while self._queue.qsize() >= self.max_queue and time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+
+    def submit_nowait(self, rows: list[dict]):
+        now = time.monotonic()
+        for row in rows:
+            try:
+                self._queue.put_nowait((now, row))
+                metrics.incr("activity_log.enqueued")
+            except asyncio.QueueFull:
+                metrics.incr("activity_log.dropped")
+                logger.warning("activity log queue full, dropping %s", row["action"])
+        metrics.set_gauge("activity_log.queue_depth", self._queue.qsize())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Collected on self so stop() can flush what a cancel interrupts
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+
+            while len(self._batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batch, self._batch = self._batch, []
+            # Shielded so shutdown never loses a batch mid-INSERT
+            self._inflight = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._inflight)
+
+    async def _flush(self, batch: list[tuple[float, dict]]):
+        if not batch:
+            return
+
+        rows = [row for _, row in batch]
+        dropped = await self._insert(rows)
+        if dropped:
+            metrics.incr("activity_log.dropped", dropped)
+
+        metrics.incr("activity_log.flushed", len(rows) - dropped)
+        metrics.observe("activity_log.batch_size", len(rows))
+        metrics.observe("activity_log.lag_ms", (time.monotonic() - batch[0][0]) * 1000)
+        metrics.set_gauge("activity_log.queue_depth", self._queue.qsize())
+
+    async def _insert(self, rows: list[dict]) -> int:
+        """
+        INSERT `rows`, returning how many were dropped. When the database
+        rejects the data (e.g. a log for a task deleted meanwhile) the batch
+        is bisected until the bad rows are isolated; any other failure
+        (database down) drops the whole batch rather than retrying it row by row.
+        """
+        try:
+            async with async_session() as session:
+                await session.execute(insert(ActivityLog), rows)
+                await session.commit()
+            return 0
+        except (IntegrityError, DataError):
+            if len(rows) == 1:
+                logger.warning("dropping activity log %s: rejected by the database", rows[0]["action"])
+                return 1
+        except Exception:
+            logger.exception("failed to flush %d activity logs", len(rows))
+            return len(rows)
+
+        mid = len(rows) // 2
+        return await self._insert(rows[:mid]) + await self._insert(rows[mid:])
+
+
+activity_log_batcher = ActivityLogBatcher(
+    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_LOG_FLUSH_INTERVAL_MS / 1000,
+    max_queue=settings.ACTIVITY_LOG_MAX_QUEUE,
+    backpressure_timeout=settings.ACTIVITY_LOG_BACKPRESSURE_TIMEOUT_MS / 1000,
+)
@@ -6,23 +6,32 @@ from sqlalchemy import select
 from app.core.security import decode_access_token
 from app.db.session import get_db
 from app.models.user import User
+from app.utils.principal_cache import Principal, principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
-):
+) -> Principal:
     try:
         payload = decode_access_token(token)
         user_id = int(payload.get("sub"))
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid authentication token")
 
+    # Token signature/expiry is verified above; the user row is served from cache
+    # so the common case costs no DB round trip (the session never checks out a connection).
+    principal = await principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
 
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
-    return user
+    principal = Principal.from_user(user)
+    await principal_cache.set(principal)
+    return principal
@@ -0,0 +1,197 @@
+import fcntl
+import os
+import threading
+import zlib
+
+import numpy as np
+
+from app.utils.search_index import tokenize
+
+# Offline text embeddings: signed feature hashing of words, word bigrams and
+# character trigrams. No model files or network; hashing uses crc32 (stable
+# across processes, unlike hash()) so index files can be shared by workers.
+
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.5
+TRIGRAM_WEIGHT = 0.3
+
+INITIAL_CAPACITY = 64
+
+
+def _features(text: str | None) -> list[tuple[str, float]]:
+    words = tokenize(text)
+    features = [(w, WORD_WEIGHT) for w in words]
+    features += [(f"{a} {b}", BIGRAM_WEIGHT) for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"#{w}#"
+        features += [(padded[i:i + 3], TRIGRAM_WEIGHT) for i in range(len(padded) - 2)]
+    return features
+
+
+def embed(texts: list[str | None], dim: int) -> np.ndarray:
+    """
+    L2-normalised float32 matrix of shape (len(texts), dim).
+    """
+    rows, cols, values = [], [], []
+    for row, text in enumerate(texts):
+        for feature, weight in _features(text):
+            h = zlib.crc32(feature.encode())
+            rows.append(row)
+            cols.append(h % dim)
+            values.append(weight if h & 0x80000000 else -weight)
+
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    np.add.at(out, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)),
+              np.asarray(values, dtype=np.float32))
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return out
+
+
+class VectorIndex:
+    """
+    File-backed vector store: `<name>.keys` holds (key, version) int64 pairs,
+    `<name>.d<dim>.vec` the float32 vectors, both memory-mapped so every
+    worker reads the same pages without loading anything. Key 0 marks a free
+    row. Files only ever grow, so a mapping held by a reader stays valid.
+
+    Writers serialise on a thread lock plus flock() on `<name>.lock` and
+    write the vector before its key, so readers never need a lock.
+    """
+
+    def __init__(self, directory: str, name: str, dim: int):
+        self.dim = dim
+        base = os.path.join(directory, name)
+        self._keys_path = base + ".keys"
+        self._vec_path = f"{base}.d{dim}.vec"
+        self._lock_path = base + ".lock"
+        self._lock = threading.Lock()
+        self._sizes = (-1, -1)
+        self._keys = np.zeros((0, 2), dtype=np.int64)
+        self._vecs = np.zeros((0, dim), dtype=np.float32)
+
+    def exists(self) -> bool:
+        return os.path.exists(self._keys_path) and os.path.exists(self._vec_path)
+
+    def _refresh(self):
+        # Another process may have grown the files; remap when sizes change
+        try:
+            sizes = (os.path.getsize(self._keys_path), os.path.getsize(self._vec_path))
+        except FileNotFoundError:
+            return
+        if sizes == self._sizes:
+            return
+        capacity = min(sizes[0] // 16, sizes[1] // (4 * self.dim))
+        if capacity:
+            self._keys = np.memmap(self._keys_path, dtype=np.int64, mode="r+", shape=(capacity, 2))
+            self._vecs = np.memmap(self._vec_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._sizes = sizes
+
+    def _grow(self, capacity: int):
+        for path, row_bytes in ((self._vec_path, 4 * self.dim), (self._keys_path, 16)):
+            with open(path, "ab") as f:
+                if f.tell() < capacity * row_bytes:
+                    f.truncate(capacity * row_bytes)
+        self._refresh()
+
+    def _write_locked(self, fn):
+        os.makedirs(os.path.dirname(self._lock_path) or ".", exist_ok=True)
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                return fn()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _rows_of(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Row index per key, -1 when absent (vectorised sorted lookup).
+        """
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        stored = self._keys[:, 0]
+        live = np.flatnonzero(stored)
+        if not len(live):
+            return rows
+        order = live[np.argsort(stored[live])]
+        sorted_keys = stored[order]
+        pos = np.minimum(np.searchsorted(sorted_keys, keys), len(order) - 1)
+        found = sorted_keys[pos] == keys
+        rows[found] = order[pos[found]]
+        return rows
+
+    def versions(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Stored version per key, -1 for keys not in the index.
+        """
+        with self._lock:
+            self._refresh()
+            stored, rows = self._keys, self._rows_of(np.asarray(keys, dtype=np.int64))
+        return np.where(rows >= 0, stored[np.maximum(rows, 0), 1] if len(stored) else -1, -1)
+
+    def upsert(self, keys, versions, vectors: np.ndarray):
+        """
+        Insert or overwrite rows; `keys` must be unique and non-zero.
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        versions = np.asarray(versions, dtype=np.int64)
+        if not len(keys):
+            return
+
+        def apply():
+            rows = self._rows_of(keys)
+            missing = np.flatnonzero(rows < 0)
+            if len(missing):
+                free = np.flatnonzero(self._keys[:, 0] == 0)
+                if len(free) < len(missing):
+                    needed = len(self._keys) + len(missing) - len(free)
+                    capacity = max(INITIAL_CAPACITY, len(self._keys))
+                    while capacity < needed:
+                        capacity *= 2
+                    self._grow(capacity)
+                    free = np.flatnonzero(self._keys[:, 0] == 0)
+                rows[missing] = free[: len(missing)]
+            self._vecs[rows] = vectors
+            self._keys[rows, 1] = versions
+            self._keys[rows, 0] = keys
+
+        self._write_locked(apply)
+
+    def remove(self, keys):
+        keys = np.asarray(keys, dtype=np.int64)
+        if not len(keys) or not self.exists():
+            return
+
+        def apply():
+            rows = self._rows_of(keys)
+            self._keys[rows[rows >= 0], 0] = 0
+
+        self._write_locked(apply)
+
+    def search(self, query: np.ndarray, k: int) -> list[tuple[int, float]]:
+        """
+        Top-k (key, cosine similarity) pairs, best first.
+        """
+        with self._lock:
+            self._refresh()
+            keys, vecs = self._keys, self._vecs
+        if not len(keys):
+            return []
+
+        scores = vecs @ query
+        scores[keys[:, 0] == 0] = -np.inf
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(keys[i, 0]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def drop(self):
+        def apply():
+            for path in (self._keys_path, self._vec_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._sizes = (-1, -1)
+            self._keys = np.zeros((0, 2), dtype=np.int64)
+            self._vecs = np.zeros((0, self.dim), dtype=np.float32)
+
+        self._write_locked(apply)
@@ -0,0 +1,61 @@
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy import func
+
+# Clients must revalidate every time, but may reuse the body on 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """
+    Weak ETag from the identity of a resource and its row versions,
+    e.g. make_etag("comments", task_id, count, version_sum).
+    """
+    digest = hashlib.blake2b(
+        ":".join(str(p) for p in parts).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def collection_version(version_column) -> tuple:
+    """
+    Aggregates to select for a collection's ETag: (count, sum of versions).
+
+    max(version) is not enough: versions are drawn from the sequence when a
+    row is written, not when it commits, so a slow transaction can commit a
+    version below the current max and leave the max unchanged. Every write
+    replaces a row's version with a new, larger one, so it always moves the
+    sum; deletes move the count.
+    """
+    return func.count(), func.coalesce(func.sum(version_column), 0)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Match uses weak comparison (RFC 9110 13.1.2).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = _opaque(etag)
+    return any(_opaque(candidate) == wanted for candidate in header.split(","))
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    Returns a 304 response when the client already has this version, otherwise
+    sets the validator headers on the outgoing response and returns None.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,38 @@
+import orjson
+from fastapi import Response
+
+from app.core.config import settings
+
+# OPT_UTC_Z: aware UTC datetimes end in "Z", same as pydantic's JSON output
+JSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def enabled() -> bool:
+    return settings.FAST_JSON_RESPONSES
+
+
+def encode_rows(rows) -> bytes:
+    """
+    Rows from a select() of plain columns -> JSON array, one object per row
+    keyed by column name. No pydantic model is built per row, so the select
+    must already have exactly the fields of the endpoint's response_model.
+    """
+    if not rows:
+        return b"[]"
+    # Column names can be str subclasses (quoted_name), which orjson rejects
+    keys = [str(key) for key in rows[0]._fields]
+    return orjson.dumps([dict(zip(keys, row)) for row in rows], option=JSON_OPTIONS)
+
+
+def encode(data) -> bytes:
+    return orjson.dumps(data, option=JSON_OPTIONS)
+
+
+def json_response(body: bytes, response: Response | None = None) -> Response:
+    """
+    Wrap pre-encoded JSON, keeping headers already set on the injected response.
+    """
+    out = Response(content=body, media_type="application/json")
+    if response is not None:
+        out.headers.update(response.headers)
+    return out
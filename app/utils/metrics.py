@@ -0,0 +1,47 @@
+import threading
+from collections import defaultdict
+
+
+class Metrics:
+    """
+    Tiny in-process metrics registry (counters, gauges, timings).
+    Exposed as JSON on GET /metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = defaultdict(int)
+        self._gauges: dict[str, float] = {}
+        self._timings: dict[str, dict[str, float]] = {}
+
+    def incr(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            t = self._timings.get(name)
+            if t is None:
+                t = self._timings[name] = {"count": 0, "sum": 0.0, "max": 0.0}
+            t["count"] += 1
+            t["sum"] += value
+            if value > t["max"]:
+                t["max"] = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": {
+                    name: {**t, "avg": t["sum"] / t["count"] if t["count"] else 0.0}
+                    for name, t in self._timings.items()
+                },
+            }
+
+
+metrics = Metrics()
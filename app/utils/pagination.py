@@ -1,5 +1,13 @@
+import base64
+import json
+from datetime import datetime
 from typing import Tuple
 
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
 DEFAULT_PAGE = 1
 DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
@@ -23,3 +31,49 @@ def get_pagination_params(page: int | None, page_size: int | None) -> Tuple[int,
     offset = (p - 1) * ps
     limit = ps
     return offset, limit
+
+
+# ---------------------------------------------------------
+# Keyset (cursor) pagination over (created_at, id)
+# ---------------------------------------------------------
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Opaque cursor pointing at the last row of a page.
+    """
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_predicate(created_col, id_col, cursor: str, descending: bool = True):
+    """
+    WHERE clause selecting rows strictly after the cursor in
+    (created_at, id) order. Uses a row comparison so Postgres can
+    seek straight into a (..., created_at, id) index.
+    """
+    created_at, row_id = decode_cursor(cursor)
+    if descending:
+        return tuple_(created_col, id_col) < tuple_(created_at, row_id)
+    return tuple_(created_col, id_col) > tuple_(created_at, row_id)
+
+
+async def estimate_count(db: AsyncSession, stmt: Select) -> int:
+    """
+    Cheap row-count estimate from the planner (EXPLAIN) instead of COUNT(*).
+    Accuracy depends on table statistics (ANALYZE).
+    """
+    conn = await db.connection()
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
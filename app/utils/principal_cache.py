@@ -0,0 +1,180 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, asdict
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.models.user import User
+from app.utils.metrics import metrics
+from app.utils.ttl_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "principal:"
+INVALIDATION_CHANNEL = "principal:invalidate"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Detached, read-only view of an authenticated user.
+    Safe to share between requests (unlike a session-bound User row).
+    """
+    id: int
+    email: str
+    full_name: str | None
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            created_at=user.created_at,
+        )
+
+    def to_json(self) -> bytes:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat()
+        return json.dumps(data).encode()
+
+    @classmethod
+    def from_json(cls, raw: bytes) -> "Principal":
+        data = json.loads(raw)
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return cls(**data)
+
+
+class PrincipalCache:
+    """
+    Two-tier cache of verified principals keyed by JWT subject (user id):
+    - in-process LRU with TTL
+    - optional shared Redis tier (PRINCIPAL_CACHE_REDIS)
+
+    Invalidations are published on INVALIDATION_CHANNEL so every worker drops
+    its local entry (see start_listener), not just the one that did the write.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, use_redis: bool):
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self._local = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self._listener: asyncio.Task | None = None
+
+    async def get(self, user_id: int) -> Principal | None:
+        principal = self._local.get(user_id)
+        if principal is not None:
+            metrics.incr("principal_cache.hit.local")
+            return principal
+
+        if self.use_redis:
+            try:
+                raw = await get_redis().get(f"{REDIS_KEY_PREFIX}{user_id}")
+            except Exception:
+                logger.warning("principal cache: redis get failed", exc_info=True)
+                raw = None
+
+            if raw is not None:
+                principal = Principal.from_json(raw)
+                self._local.set(user_id, principal)
+                metrics.incr("principal_cache.hit.redis")
+                return principal
+
+        metrics.incr("principal_cache.miss")
+        return None
+
+    async def set(self, principal: Principal):
+        self._local.set(principal.id, principal)
+
+        if self.use_redis:
+            try:
+                await get_redis().set(
+                    f"{REDIS_KEY_PREFIX}{principal.id}",
+                    principal.to_json(),
+                    ex=int(self.ttl),
+                )
+            except Exception:
+                logger.warning("principal cache: redis set failed", exc_info=True)
+
+    async def invalidate(self, user_id: int):
+        self._local.pop(user_id)
+        metrics.incr("principal_cache.invalidated")
+
+        try:
+            redis = get_redis()
+            if self.use_redis:
+                await redis.delete(f"{REDIS_KEY_PREFIX}{user_id}")
+            await redis.publish(INVALIDATION_CHANNEL, str(user_id))
+        except Exception:
+            # Other workers converge within PRINCIPAL_CACHE_TTL_SECONDS
+            logger.warning("principal cache: redis invalidation failed", exc_info=True)
+
+    def invalidate_nowait(self, user_id: int):
+        """
+        Sync variant for ORM event hooks: drops the local entry immediately
+        and schedules the Redis delete + broadcast on the running loop (if any).
+        """
+        self._local.pop(user_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.create_task(self.invalidate(user_id))
+
+    def start_listener(self):
+        """
+        Drop local entries invalidated by other workers (FastAPI lifespan).
+        """
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(), name="principal-cache-invalidations")
+
+    async def stop_listener(self):
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    async def _listen(self):
+        while True:
+            try:
+                async with get_redis().pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    # Anything missed while (re)subscribing may still be cached
+                    self._local.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._local.pop(int(message["data"]))
+                            metrics.incr("principal_cache.invalidated.remote")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("principal cache: invalidation listener failed", exc_info=True)
+                metrics.incr("principal_cache.listener_errors")
+                await asyncio.sleep(1)
+
+    def clear(self):
+        self._local.clear()
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    use_redis=settings.PRINCIPAL_CACHE_REDIS,
+)
+
+
+# Any ORM update/delete of a user drops its cached principal.
+# (Bulk Core UPDATE/DELETE statements must call principal_cache.invalidate explicitly.)
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User):
+    principal_cache.invalidate_nowait(target.id)
@@ -0,0 +1,145 @@
+import hashlib
+import logging
+import random
+from typing import Any, Awaitable, Callable, Iterable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.db.session import async_session
+from app.utils.metrics import metrics
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "rc:v1:"
+TAG_PREFIX = "rc:tag:"
+
+
+class ResponseCache:
+    """
+    Redis cache for serialized GET responses.
+
+    Entries are shared by every caller with the same authorization `scope`, so
+    routes must run their access checks before calling `cached()`.
+
+    Invalidation uses versioned tags: each tag ("workspace:1", "task:7", ...)
+    has a counter that is part of the cache key, and purging a tag is a single
+    INCR. A reader that loaded data before a write commits can only store it
+    under the old key, which nobody reads again; orphans just expire.
+
+    Fills always load from the primary: a lagging replica could otherwise
+    store pre-write data under the new tag version.
+    """
+
+    def __init__(self):
+        self._flight = SingleFlight("response_cache", lambda: settings.RESPONSE_CACHE_LOCK_SECONDS)
+        self._adapters: dict[Any, TypeAdapter] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.RESPONSE_CACHE_ENABLED
+
+    def _ttl(self) -> int:
+        # Jitter so entries written together don't all expire together
+        jitter = settings.RESPONSE_CACHE_TTL_JITTER
+        return max(1, round(settings.RESPONSE_CACHE_TTL_SECONDS * random.uniform(1 - jitter, 1 + jitter)))
+
+    def _serialize(self, model, data) -> bytes:
+        adapter = self._adapters.get(model)
+        if adapter is None:
+            adapter = self._adapters[model] = TypeAdapter(model)
+        return adapter.dump_json(data)
+
+    async def _key(self, request: Request, scope: str, tags: list[str]) -> str:
+        versions = await get_redis().mget([f"{TAG_PREFIX}{tag}" for tag in tags]) if tags else []
+        params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        raw = "|".join([
+            request.url.path,
+            params,
+            scope,
+            ",".join(f"{tag}@{int(v or 0)}" for tag, v in zip(tags, versions)),
+        ])
+        return KEY_PREFIX + hashlib.sha1(raw.encode()).hexdigest()
+
+    async def cached(
+        self,
+        request: Request,
+        response: Response,
+        *,
+        scope: str,
+        tags: Iterable[str],
+        model: Any,
+        loader: Callable[[AsyncSession], Awaitable[Any]],
+        db: AsyncSession,
+    ) -> Response:
+        """
+        Return the cached JSON body for this request, or run `loader`, serialize
+        its result with `model` and cache it (a loader may also return already
+        encoded JSON bytes). Headers already set on `response` (ETag etc.) are
+        carried over.
+
+        `loader` gets the session to read from: a primary session when its
+        result will be cached, the request's own `db` when the cache is off
+        or unavailable.
+        """
+        tags = sorted(set(tags))
+        body = None
+
+        if self.enabled:
+            try:
+                key = await self._key(request, scope, tags)
+                body = await get_redis().get(key)
+                if body is not None:
+                    metrics.incr("response_cache.hit")
+                else:
+                    metrics.incr("response_cache.miss")
+                    body = await self._flight.run(
+                        key,
+                        lambda: self._fill(model, loader),
+                        fetch=lambda: get_redis().get(key),
+                        store=lambda value: get_redis().set(key, value, ex=self._ttl()),
+                    )
+            except (RedisError, OSError) as exc:
+                logger.warning("response cache unavailable: %s", exc)
+                metrics.incr("response_cache.error")
+                body = None
+
+        if body is None:
+            body = await self._load(model, loader, db)
+
+        out = Response(content=body, media_type="application/json")
+        out.headers.update(response.headers)
+        return out
+
+    async def _load(self, model, loader, db: AsyncSession) -> bytes:
+        data = await loader(db)
+        return data if isinstance(data, bytes) else self._serialize(model, data)
+
+    async def _fill(self, model, loader) -> bytes:
+        async with async_session() as primary:
+            return await self._load(model, loader, primary)
+
+    async def invalidate(self, *tags: str):
+        """
+        Purge every entry carrying any of `tags`. Call after the write commits.
+        """
+        if not self.enabled or not tags:
+            return
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                for tag in set(tags):
+                    pipe.incr(f"{TAG_PREFIX}{tag}")
+                await pipe.execute()
+            metrics.incr("response_cache.invalidated", len(set(tags)))
+        except (RedisError, OSError) as exc:
+            # Entries age out within RESPONSE_CACHE_TTL_SECONDS
+            logger.warning("response cache invalidation failed: %s", exc)
+            metrics.incr("response_cache.error")
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,144 @@
+import html
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+# Pure-Python stand-in for the Postgres tsvector search, used when the
+# database is not Postgres (SQLite in local dev / tests).
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_QUERY_RE = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or "
+    "that the this to was were will with".split()
+)
+
+# Same relative weights Postgres uses for setweight() labels A / B
+FIELD_WEIGHTS = {"A": 1.0, "B": 0.4}
+
+
+def _stem(word: str) -> str:
+    """
+    Very light suffix stripping so "tasks"/"task" and "fixed"/"fixing" match.
+    """
+    for suffix, repl in (("ies", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)] + repl
+    return word
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    return [
+        _stem(token)
+        for token in (t.lower() for t in _TOKEN_RE.findall(text))
+        if token not in STOP_WORDS
+    ]
+
+
+def parse_query(query: str) -> tuple[list[str], list[str]]:
+    """
+    websearch_to_tsquery-like parsing: every term is required, "-term" excludes.
+    Quoted phrases are treated as their individual terms.
+    """
+    include: list[str] = []
+    exclude: list[str] = []
+    for neg_phrase, phrase, neg_word, word in _QUERY_RE.findall(query):
+        if word.lower() == "or":
+            continue
+        target = exclude if (neg_phrase or neg_word) else include
+        target.extend(tokenize(phrase or word))
+    return include, exclude
+
+
+@dataclass
+class _Doc:
+    fields: dict[str, str]
+    length: int = 0
+    payload: dict = field(default_factory=dict)
+
+
+class InvertedIndex:
+    def __init__(self):
+        self._postings: dict[str, dict[object, float]] = defaultdict(dict)
+        self._docs: dict[object, _Doc] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id, fields: dict[str, tuple[str, str | None]], payload: dict | None = None):
+        """
+        fields maps a name to (weight label, text), e.g. {"title": ("A", "Fix login")}.
+        """
+        doc = _Doc(fields={name: text or "" for name, (_, text) in fields.items()},
+                   payload=payload or {})
+        for _, (label, text) in fields.items():
+            weight = FIELD_WEIGHTS.get(label, FIELD_WEIGHTS["B"])
+            tokens = tokenize(text)
+            doc.length += len(tokens)
+            for token in tokens:
+                postings = self._postings[token]
+                postings[doc_id] = postings.get(doc_id, 0.0) + weight
+        self._docs[doc_id] = doc
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[object, float]]:
+        """
+        Documents containing every required term and none of the excluded ones,
+        ranked by weighted tf-idf normalised by document length.
+        """
+        include, exclude = parse_query(query)
+        if not include:
+            return []
+
+        candidates: set | None = None
+        for term in include:
+            docs = set(self._postings.get(term, ()))
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return []
+        for term in exclude:
+            candidates -= set(self._postings.get(term, ()))
+
+        total = len(self._docs)
+        scored = []
+        for doc_id in candidates:
+            score = 0.0
+            for term in include:
+                postings = self._postings[term]
+                idf = math.log(1 + total / len(postings))
+                score += postings[doc_id] * idf
+            score /= 1 + math.log(1 + self._docs[doc_id].length)
+            scored.append((doc_id, score))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def doc(self, doc_id) -> _Doc:
+        return self._docs[doc_id]
+
+
+def highlight(text: str | None, query: str, max_words: int = 20) -> str:
+    """
+    ts_headline-like snippet: a window of words around the first match, as
+    HTML. The text is escaped first, so the <mark> around matching words is
+    the only markup in the result.
+    """
+    if not text:
+        return ""
+    terms = set(parse_query(query)[0])
+    words = text.split()
+
+    first = None
+    marked = []
+    for i, word in enumerate(words):
+        hit = any(stem in terms for stem in tokenize(word))
+        if hit and first is None:
+            first = i
+        word = html.escape(word)
+        marked.append(f"<mark>{word}</mark>" if hit else word)
+
+    start = max(0, min((first or 0) - max_words // 4, len(words) - max_words))
+    return " ".join(marked[start:start + max_words])
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from redis.exceptions import RedisError
+
+from app.core.redis_client import get_redis
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent cache fills for the same key into one `load()`:
+    in-process callers share a future, other processes wait on a Redis
+    SET NX lock and poll `fetch()` for the winner's result.
+    """
+
+    def __init__(self, name: str, lock_seconds: Callable[[], float], poll_seconds: float = 0.05):
+        self.name = name  # metric prefix, also namespaces the lock keys
+        self._lock_seconds = lock_seconds
+        self._poll_seconds = poll_seconds
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def run(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[bytes]],
+        *,
+        fetch: Callable[[], Awaitable[bytes | None]],
+        store: Callable[[bytes], Awaitable[None]],
+    ) -> bytes:
+        # Same process: piggyback on the request already loading this key
+        future = self._inflight.get(key)
+        if future is not None:
+            metrics.incr(f"{self.name}.coalesced")
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this request itself was cancelled
+            # Leader failed: load on our own so errors surface per request
+            return await load()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            body = await self._fill(key, load, fetch, store)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(body)
+        return body
+
+    async def _fill(self, key, load, fetch, store) -> bytes:
+        """
+        Across processes: one holder of the Redis lock loads, the rest poll for
+        its result. A waiter takes over as soon as the lock is free again (the
+        holder failed and released it) and loads itself once it would have
+        expired.
+        """
+        redis = get_redis()
+        lock_key = f"{self.name}:lock:{key}"
+        lock_seconds = self._lock_seconds()
+
+        async def acquire() -> bool:
+            return bool(await redis.set(lock_key, b"1", nx=True, ex=max(1, round(lock_seconds))))
+
+        if await acquire():
+            return await self._lead(redis, lock_key, load, store)
+
+        metrics.incr(f"{self.name}.lock_wait")
+        deadline = asyncio.get_running_loop().time() + lock_seconds
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(self._poll_seconds)
+            body = await fetch()
+            if body is not None:
+                return body
+            if await acquire():
+                metrics.incr(f"{self.name}.lock_takeover")
+                return await self._lead(redis, lock_key, load, store)
+        return await load()
+
+    async def _lead(self, redis, lock_key, load, store) -> bytes:
+        """
+        Load while holding the lock. Once `load()` has succeeded its result is
+        returned even if Redis fails afterwards: callers fall back to loading
+        on Redis errors, and that must not pay for the load a second time.
+        """
+        try:
+            body = await load()
+        except BaseException:
+            await self._release(redis, lock_key)
+            raise
+        try:
+            await store(body)
+        except (RedisError, OSError) as exc:
+            logger.warning("%s: store failed: %s", self.name, exc)
+            metrics.incr(f"{self.name}.store_error")
+        await self._release(redis, lock_key)
+        return body
+
+    async def _release(self, redis, lock_key):
+        # Best effort: an unreleased lock expires after lock_seconds
+        try:
+            await redis.delete(lock_key)
+        except (RedisError, OSError) as exc:
+            logger.warning("%s: lock release failed: %s", self.name, exc)
+            metrics.incr(f"{self.name}.lock_error")
@@ -0,0 +1,56 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUTTLCache:
+    """
+    Size-bounded LRU where every entry also expires after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        """Live (non-expired) entries, without touching LRU order."""
+        now = time.monotonic()
+        with self._lock:
+            return [(k, v) for k, (exp, v) in self._data.items() if exp >= now]
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,118 @@
+"""
+Benchmark GET /projects/{id}/tasks queries on a project with many tasks.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m scripts.bench_project_tasks --tasks 100000
+
+Needs a PostgreSQL database migrated to head. Seeds one user / workspace /
+project with --tasks tasks (removed again unless --keep), then for each
+listing variant prints the plan's scan types and the latency over --runs.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.v1.routes_project_tasks import project_tasks_query
+from app.core.config import settings
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.utils.pagination import encode_cursor
+
+
+def _variants(project_id: int, assignee_id: int) -> dict:
+    mid = datetime(2026, 1, 1) + timedelta(minutes=50_000)
+    return {
+        "newest page": dict(),
+        "status=TODO": dict(status=[TaskStatus.TODO]),
+        "status=TODO,IN_PROGRESS": dict(status=[TaskStatus.TODO, TaskStatus.IN_PROGRESS]),
+        "assignee (1 in 10)": dict(assignee_id=assignee_id),
+        "created range": dict(created_from=mid - timedelta(days=1), created_to=mid),
+        "title prefix": dict(q="task 4242"),
+        "deep cursor": dict(cursor=encode_cursor(mid, 0)),
+        "oldest page": dict(descending=False),
+    }
+
+
+def _scans(plan) -> list[str]:
+    found = []
+    if isinstance(plan, dict):
+        if "Scan" in plan.get("Node Type", ""):
+            found.append(f"{plan['Node Type']}({plan.get('Index Name', plan.get('Relation Name'))})")
+        for value in plan.values():
+            found += _scans(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            found += _scans(value)
+    return found
+
+
+async def _seed(conn, tasks: int) -> tuple[int, int]:
+    user_id = await conn.scalar(
+        insert(User).values(email=f"bench-{time.time_ns()}@example.com", hashed_password="x").returning(User.id)
+    )
+    ws_id = await conn.scalar(insert(Workspace).values(name="bench", owner_id=user_id).returning(Workspace.id))
+    project_id = await conn.scalar(
+        insert(Project).values(name="bench", workspace_id=ws_id).returning(Project.id)
+    )
+    # One task a minute; statuses round-robin; every 10th assigned to the bench user
+    await conn.execute(text(
+        "INSERT INTO tasks (title, description, status, project_id, assignee_id, created_at) "
+        "SELECT 'task ' || g, repeat('lorem ipsum ', 20), "
+        "       (ARRAY['TODO','IN_PROGRESS','DONE'])[1 + g % 3]::taskstatus, :project_id, "
+        "       CASE WHEN g % 10 = 0 THEN :user_id END, "
+        "       timestamp '2026-01-01' + g * interval '1 minute' "
+        "FROM generate_series(1, :n) AS g"
+    ), {"project_id": project_id, "user_id": user_id, "n": tasks})
+    return user_id, project_id
+
+
+async def main(tasks: int, runs: int, keep: bool):
+    engine = create_async_engine(settings.DATABASE_URL)
+    user_id = project_id = None
+    try:
+        async with engine.begin() as conn:
+            user_id, project_id = await _seed(conn, tasks)
+        async with engine.connect() as conn:
+            await (await conn.execution_options(isolation_level="AUTOCOMMIT")).execute(text("VACUUM ANALYZE tasks"))
+        print(f"seeded {tasks} tasks in project {project_id}\n")
+
+        async with engine.connect() as conn:
+            for name, kwargs in _variants(project_id, user_id).items():
+                stmt = project_tasks_query(project_id, **kwargs)
+                compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+                plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar_one()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+
+                timings = []
+                for _ in range(runs):
+                    started = time.perf_counter()
+                    (await conn.execute(stmt)).all()
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                print(f"{name:26} median {statistics.median(timings):7.2f} ms   "
+                      f"p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms   {', '.join(_scans(plan))}")
+    finally:
+        if project_id is not None and not keep:
+            async with engine.begin() as conn:
+                await conn.execute(delete(Task).where(Task.project_id == project_id))
+                await conn.execute(delete(Project).where(Project.id == project_id))
+                await conn.execute(delete(Workspace).where(Workspace.owner_id == user_id))
+                await conn.execute(delete(User).where(User.id == user_id))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="leave the seeded rows in place")
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.runs, args.keep))
@@ -0,0 +1,75 @@
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import insert
+
+from app.api.v1 import routes_activity_logs
+from app.core.config import settings
+from app.models.activity_log import ActivityLog
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.services import export_service
+
+pytestmark = pytest.mark.anyio
+
+PAGE = {"page": 1, "page_size": 20, "cursor": None, "estimate_total": False}
+
+
+@pytest.fixture
+async def db(db_sessionmaker, monkeypatch):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", False)
+    async with db_sessionmaker() as db:
+        await db.execute(insert(User).values(id=1, email="auditor@example.com", hashed_password="x"))
+        await db.execute(insert(Workspace).values(id=1, name="w", owner_id=1))
+        await db.execute(insert(Project).values([
+            {"id": 1, "name": "p1", "workspace_id": 1}, {"id": 2, "name": "p2", "workspace_id": 1},
+        ]))
+        await db.execute(insert(Task).values([
+            {"id": 10, "title": "live", "project_id": 1}, {"id": 20, "title": "other", "project_id": 2},
+        ]))
+        # Task 11 of project 1 has been deleted; its history carries the project
+        await db.execute(insert(ActivityLog).values([
+            {"id": 1, "action": "COMMENT_ADDED", "user_id": 1, "task_id": 10, "project_id": None},
+            {"id": 2, "action": "STATUS_CHANGED", "user_id": 1, "task_id": 11, "project_id": 1},
+            {"id": 3, "action": "TASK_DELETED", "user_id": 1, "task_id": 11, "project_id": 1},
+            {"id": 4, "action": "TASK_CREATED", "user_id": 1, "task_id": 20, "project_id": 2},
+        ]))
+        await db.commit()
+        yield db
+
+
+async def test_project_logs_include_deleted_tasks(db):
+    logs = await routes_activity_logs.get_project_logs(1, Response(), **PAGE, db=db, _=None)
+    assert sorted(log.id for log in logs) == [1, 2, 3]
+
+
+async def test_global_project_filter_includes_deleted_tasks(db):
+    logs = await routes_activity_logs.get_logs(
+        Response(), action=None, user_id=None, project_id=1, task_id=None,
+        date_from=None, date_to=None, **PAGE, db=db, _=None,
+    )
+    assert sorted(log.id for log in logs) == [1, 2, 3]
+
+
+async def test_deleted_task_keeps_its_history(db):
+    logs = await routes_activity_logs.get_task_logs(11, Response(), **PAGE, db=db, _=None)
+    assert sorted(log.action for log in logs) == ["STATUS_CHANGED", "TASK_DELETED"]
+
+    with pytest.raises(HTTPException) as exc:
+        await routes_activity_logs.get_task_logs(99, Response(), **PAGE, db=db, _=None)
+    assert exc.value.status_code == 404
+
+
+async def test_export_includes_deleted_tasks(db):
+    stmt = export_service.activity_logs_export_query(
+        user_id=1, workspace_id=None, project_id=1, date_from=None, date_to=None,
+    )
+    rows = (await db.execute(stmt)).all()
+    assert [(r.id, r.task_id, r.project_id) for r in rows] == [(1, 10, None), (2, 11, 1), (3, 11, 1)]
+
+    # Scoping still applies: nothing for a caller without access
+    stmt = export_service.activity_logs_export_query(
+        user_id=2, workspace_id=None, project_id=None, date_from=None, date_to=None,
+    )
+    assert (await db.execute(stmt)).all() == []
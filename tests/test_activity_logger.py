@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.activity_log import ActivityLog
+from app.utils import activity_logger
+from app.utils.activity_logger import ActivityLogBatcher
+from app.utils.metrics import metrics
+
+pytestmark = pytest.mark.anyio
+
+
+def _row(action: str | None = "TASK_UPDATED") -> dict:
+    return {
+        "user_id": 1, "task_id": None, "action": action,
+        "old_value": None, "new_value": None, "created_at": datetime.utcnow(),
+    }
+
+
+def _counter(name: str) -> int:
+    return metrics.snapshot()["counters"].get(name, 0)
+
+
+@pytest.fixture
+def batcher(db_sessionmaker, monkeypatch):
+    monkeypatch.setattr(activity_logger, "async_session", db_sessionmaker)
+    return ActivityLogBatcher(batch_size=100, flush_interval=60, max_queue=1_000, backpressure_timeout=0.1)
+
+
+async def _stored(db_sessionmaker) -> int:
+    async with db_sessionmaker() as db:
+        return await db.scalar(select(func.count()).select_from(ActivityLog))
+
+
+async def test_stop_flushes_batch_being_collected(batcher, db_sessionmaker):
+    batcher.start()
+    batcher.submit_nowait([_row() for _ in range(3)])
+    await asyncio.sleep(0.05)  # worker has taken the rows and is waiting for more
+    assert batcher._queue.empty()
+
+    await batcher.stop()
+
+    assert await _stored(db_sessionmaker) == 3
+
+
+async def test_bad_row_only_drops_itself(batcher, db_sessionmaker):
+    dropped = _counter("activity_log.dropped")
+    rows = [_row() for _ in range(7)]
+    rows[4] = _row(action=None)  # NOT NULL violation
+
+    batcher.start()
+    batcher.submit_nowait(rows)
+    await batcher.stop()
+
+    assert await _stored(db_sessionmaker) == 6
+    assert _counter("activity_log.dropped") == dropped + 1
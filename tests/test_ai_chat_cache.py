@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.config import settings
+from app.services import ai_chat_cache
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeUpstream:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, messages, max_tokens=512):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        question = messages[-1]["content"]
+        return {"choices": [{"message": {"role": "assistant", "content": f"answer to {question}"}}]}
+
+
+@pytest.fixture
+def upstream(monkeypatch, fake_redis):
+    fake = FakeUpstream()
+    monkeypatch.setattr(ai_chat_cache, "deepseek_chat", fake)
+    monkeypatch.setattr(settings, "AI_CHAT_CACHE_ENABLED", True)
+    return fake
+
+
+def _messages(question: str, context: str = "T 1 p1 TODO Write docs") -> list:
+    return [{"role": "system", "content": context}, {"role": "user", "content": question}]
+
+
+def _answer(result: dict) -> str:
+    return result["choices"][0]["message"]["content"]
+
+
+async def test_identical_concurrent_requests_share_one_call(upstream):
+    results = await asyncio.gather(*(
+        ai_chat_cache.cached_chat(1, _messages("What is open?")) for _ in range(5)
+    ))
+    assert {_answer(r) for r in results} == {"answer to What is open?"}
+    assert upstream.calls == 1
+
+    # Normalised repeat is a hit; a changed context is not
+    await ai_chat_cache.cached_chat(1, _messages("what is   open"))
+    assert upstream.calls == 1
+    await ai_chat_cache.cached_chat(1, _messages("What is open?", context="T 1 p1 DONE Write docs"))
+    assert upstream.calls == 2
+
+
+async def test_lru_trims_least_recently_used(upstream, fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "AI_CHAT_CACHE_MAX_ENTRIES", 2)
+    keys = {q: ai_chat_cache.cache_key(1, _messages(q), 512) for q in ("one", "two", "three")}
+
+    await ai_chat_cache.cached_chat(1, _messages("one"))
+    await ai_chat_cache.cached_chat(1, _messages("two"))
+    await ai_chat_cache.cached_chat(1, _messages("one"))  # hit: "two" is now least recent
+    await ai_chat_cache.cached_chat(1, _messages("three"))
+
+    assert upstream.calls == 3
+    assert await fake_redis.zcard(ai_chat_cache.LRU_KEY) == 2
+    assert await fake_redis.exists(keys["two"]) == 0
+    assert await fake_redis.exists(keys["one"]) == await fake_redis.exists(keys["three"]) == 1
+
+
+class DownRedis:
+    def __getattr__(self, name):
+        async def fail(*args, **kwargs):
+            raise RedisConnectionError("connection refused")
+        return fail
+
+
+async def test_redis_down_falls_back_to_upstream(upstream, monkeypatch):
+    monkeypatch.setattr(ai_chat_cache, "get_redis", lambda: DownRedis())
+    result = await ai_chat_cache.cached_chat(1, _messages("What is open?"))
+    assert _answer(result) == "answer to What is open?"
+    assert upstream.calls == 1
+
+
+async def test_lock_release_failure_does_not_call_upstream_twice(upstream, fake_redis, monkeypatch):
+    async def broken_delete(*keys):
+        raise RedisConnectionError("connection reset")
+
+    monkeypatch.setattr(fake_redis, "delete", broken_delete)
+    result = await ai_chat_cache.cached_chat(1, _messages("What is open?"))
+    assert _answer(result) == "answer to What is open?"
+    assert upstream.calls == 1
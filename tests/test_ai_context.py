@@ -0,0 +1,153 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services import ai_context_service
+from app.services.ai_context_compiler import compile_context, estimate_tokens, record_savings
+from app.services.ai_context_service import ContextSnapshot
+from app.utils import embedding_index
+from app.utils.metrics import metrics
+
+
+def _snapshot(n_workspaces=2, projects_per_workspace=30, tasks_per_project=2) -> ContextSnapshot:
+    snapshot = ContextSnapshot(user={"id": 1, "email": "owner@example.com"})
+    project_id = task_id = 0
+    for w in range(1, n_workspaces + 1):
+        snapshot.put("workspaces", {"id": w, "name": f"Workspace {w}", "created_at": "2026-01-01 00:00:00"})
+        for _ in range(projects_per_workspace):
+            project_id += 1
+            snapshot.put("projects", {
+                "id": project_id, "name": f"Project {project_id}",
+                "description": "A project with a reasonably long description " * 2, "workspace_id": w,
+            })
+            for _ in range(tasks_per_project):
+                task_id += 1
+                snapshot.put("tasks", {
+                    "id": task_id, "title": f"Task {task_id}", "status": "TODO",
+                    "project_id": project_id, "version": 1,
+                })
+    return snapshot
+
+
+def _rendered_chars(snapshot: ContextSnapshot) -> int:
+    context = snapshot.to_context()
+    return len(str(context["user"])) + 2 + sum(
+        len(str(entry)) + 2 for section in ("workspaces", "projects", "tasks", "comments")
+        for entry in context[section]
+    )
+
+
+def test_skeleton_is_capped_by_the_budget():
+    snapshot = _snapshot()
+    compiled = compile_context(snapshot, budget=400)
+
+    skeleton_tokens = sum(estimate_tokens(line) + 1 for line in compiled.skeleton)
+    assert skeleton_tokens <= 400 * settings.AI_CONTEXT_SKELETON_SHARE + 20  # + omitted note
+    assert compiled.tokens <= 400 + 20
+    assert compiled.omitted_projects > 0
+    assert compiled.tasks  # the rest of the budget is left for tasks
+    assert compiled.skeleton[-1].startswith(f"({compiled.omitted_projects} less active projects")
+
+
+def test_skeleton_prefers_busy_projects_and_keeps_their_workspace():
+    snapshot = _snapshot(n_workspaces=2, projects_per_workspace=10, tasks_per_project=0)
+    # Project 3 (workspace 1) has open work; everything else is empty
+    for task_id in range(1, 4):
+        snapshot.put("tasks", {"id": task_id, "title": "t", "status": "TODO", "project_id": 3, "version": 1})
+
+    compiled = compile_context(snapshot, budget=200)
+
+    assert any(line.startswith("P 3 ") for line in compiled.skeleton)
+    assert any(line.startswith("W 1 ") for line in compiled.skeleton)
+    assert not any(line.startswith("P 20 ") for line in compiled.skeleton)  # newest, but idle
+
+
+def test_skeleton_does_not_depend_on_the_message():
+    snapshot = _snapshot()
+    first = compile_context(snapshot, "Project 7", budget=400)
+    second = compile_context(snapshot, "Task 90", budget=400)
+    assert first.skeleton == second.skeleton
+
+
+def test_small_account_skeleton_is_complete():
+    snapshot = _snapshot(n_workspaces=1, projects_per_workspace=2)
+    compiled = compile_context(snapshot)
+    assert compiled.omitted_projects == compiled.omitted_workspaces == 0
+    assert compiled.skeleton == [
+        "U 1 owner@example.com",
+        "W 1 Workspace 1",
+        *(f"P {k} w1 Project {k} - {' '.join(snapshot.projects[k]['description'].split())}" for k in (1, 2)),
+    ]
+
+
+def test_chars_follow_patches(monkeypatch):
+    monkeypatch.setattr(settings, "AI_EMBEDDING_ENABLED", False)
+    snapshot = _snapshot(n_workspaces=2, projects_per_workspace=3)
+    ai_context_service._snapshots.set(1, snapshot)
+    try:
+        assert snapshot.chars == _rendered_chars(snapshot)
+
+        ai_context_service.on_tasks_written([SimpleNamespace(
+            id=1, title="Renamed with a much longer title", status="DONE", project_id=1, version=2,
+        )])
+        ai_context_service.on_comment_written(SimpleNamespace(id=10, content="looks good", task_id=2, version=1))
+        ai_context_service.on_project_written(SimpleNamespace(
+            id=2, name="Renamed", description=None, workspace_id=1,
+        ))
+        assert snapshot.chars == _rendered_chars(snapshot)
+
+        ai_context_service.on_comment_deleted(10)
+        ai_context_service.on_tasks_deleted([3])
+        ai_context_service.on_project_deleted(4)
+        ai_context_service.on_workspace_deleted(2, owner_id=1)
+        assert snapshot.chars == _rendered_chars(snapshot)
+        assert not snapshot.workspaces.keys() & {2}
+    finally:
+        ai_context_service._snapshots.pop(1)
+
+
+def test_record_savings_uses_running_size(monkeypatch):
+    snapshot = _snapshot()
+    compiled = compile_context(snapshot, budget=400)
+    monkeypatch.setattr(ContextSnapshot, "to_context", lambda self: pytest.fail("full context rendered"))
+
+    before = metrics.snapshot()["timings"].get("ai_context.tokens_saved", {}).get("sum", 0.0)
+    record_savings(snapshot, compiled)
+    saved = metrics.snapshot()["timings"]["ai_context.tokens_saved"]["sum"] - before
+
+    assert saved == -(-snapshot.chars // settings.AI_CHARS_PER_TOKEN) - compiled.tokens
+
+
+def test_index_writes_run_off_the_calling_thread_in_order(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "AI_EMBEDDING_DIR", str(tmp_path))
+    monkeypatch.setattr(ai_context_service, "_indexes", {})
+    embedded_on = []
+    release = threading.Event()
+
+    def slow_embed(texts, dim):
+        embedded_on.append(threading.current_thread().name)
+        release.wait(5)
+        return embedding_index.embed(texts, dim)
+
+    monkeypatch.setattr(ai_context_service, "embed", slow_embed)
+    snapshot = _snapshot(n_workspaces=1, projects_per_workspace=1, tasks_per_project=1)
+    ai_context_service._snapshots.set(1, snapshot)
+    try:
+        # Returns while the embedding is still blocked on the index thread
+        ai_context_service.on_tasks_written([SimpleNamespace(
+            id=1, title="Write the release notes", status="TODO", project_id=1, version=2,
+        )])
+        ai_context_service.on_tasks_deleted([1])
+        assert 1 not in snapshot.tasks
+        release.set()
+        ai_context_service.shutdown_index_writer()
+    finally:
+        release.set()
+        ai_context_service._snapshots.pop(1)
+
+    assert embedded_on and not any(name == threading.current_thread().name for name in embedded_on)
+    key = ai_context_service._index_key("task", 1)
+    # The delete was applied after the upsert it followed
+    assert ai_context_service._workspace_index(1).versions([key]).tolist() == [-1]
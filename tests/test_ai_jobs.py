@@ -0,0 +1,184 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.ai_request import AIRequest, AIRequestStatus, AIRequestType
+from app.models.user import User
+from app.services import ai_job_service
+
+pytestmark = pytest.mark.anyio
+
+
+class _AsyncpgRecorder:
+    """Compiles statements the way the asyncpg driver receives them."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    async def execute(self, stmt, *args, **kwargs):
+        self.statements.append(str(stmt.compile(dialect=asyncpg.dialect())))
+        return type("Result", (), {"rowcount": 0})()
+
+    async def commit(self):
+        pass
+
+
+async def test_requeue_stale_casts_status_to_the_enum():
+    db = _AsyncpgRecorder()
+    await ai_job_service.requeue_stale(db)
+    sql = db.statements[0]
+    assert "THEN $2::airequeststatus ELSE $3::airequeststatus END" in sql
+
+
+# ---------------------------------------------------------
+# Against PostgreSQL (TEST_DATABASE_URL): the queue commits, so every test
+# starts from an empty ai_requests table and cleans up after itself.
+# ---------------------------------------------------------
+@pytest.fixture
+async def queue(migrated_pg_url):
+    engine = create_async_engine(migrated_pg_url)
+    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with Session() as db:
+        await db.execute(delete(AIRequest))
+        await db.execute(delete(User).where(User.email == "queue@example.com"))
+        user_id = await db.scalar(
+            insert(User).values(email="queue@example.com", hashed_password="x").returning(User.id)
+        )
+        await db.commit()
+    try:
+        yield Session, user_id
+    finally:
+        async with Session() as db:
+            await db.execute(delete(AIRequest))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+
+async def _add_jobs(Session, user_id, n=1, **values) -> list[int]:
+    values = {"type": AIRequestType.SUMMARY, "status": AIRequestStatus.PENDING, **values}
+    async with Session() as db:
+        ids = list(await db.scalars(
+            insert(AIRequest).returning(AIRequest.id), [dict(values, user_id=user_id) for _ in range(n)]
+        ))
+        await db.commit()
+    return sorted(ids)
+
+
+async def _job(Session, job_id) -> AIRequest:
+    async with Session() as db:
+        return await db.get(AIRequest, job_id)
+
+
+async def test_claim_skips_rows_locked_by_another_worker(queue):
+    Session, user_id = queue
+    first, *rest = await _add_jobs(Session, user_id, n=3)
+
+    async with Session() as holder:
+        # Another worker is mid-claim on the oldest job
+        await holder.execute(select(AIRequest.id).where(AIRequest.id == first).with_for_update())
+
+        async with Session() as worker:
+            claimed = await asyncio.wait_for(ai_job_service.claim_jobs(worker, 3), timeout=5)
+        assert [job.id for job in claimed] == rest
+        assert {job.attempts for job in claimed} == {1}
+        await holder.rollback()
+
+    async with Session() as worker:
+        assert [job.id for job in await ai_job_service.claim_jobs(worker, 3)] == [first]
+        assert await ai_job_service.claim_jobs(worker, 3) == []
+    assert (await _job(Session, first)).status == AIRequestStatus.PROCESSING
+
+
+async def test_finish_job_ignores_a_superseded_attempt(queue):
+    Session, user_id = queue
+    [job_id] = await _add_jobs(Session, user_id)
+    async with Session() as db:
+        [stale] = await ai_job_service.claim_jobs(db, 1)
+
+    # The first worker is presumed dead: reaped and claimed again
+    async with Session() as db:
+        await db.execute(update(AIRequest).values(started_at=datetime.utcnow() - timedelta(hours=1)))
+        await db.commit()
+        assert await ai_job_service.requeue_stale(db) == 1
+        [current] = await ai_job_service.claim_jobs(db, 1)
+    assert current.attempts == stale.attempts + 1
+
+    async with Session() as db:
+        assert not await ai_job_service.finish_job(db, stale, result_text="late")
+        assert await ai_job_service.finish_job(db, current, result_text="on time")
+    job = await _job(Session, job_id)
+    assert (job.status, job.result_text) == (AIRequestStatus.DONE, "on time")
+    assert job.finished_at is not None
+
+
+async def test_finish_job_retry_returns_to_pending_while_attempts_remain(queue, monkeypatch):
+    monkeypatch.setattr(settings, "AI_JOB_MAX_ATTEMPTS", 2)
+    Session, user_id = queue
+    [job_id] = await _add_jobs(Session, user_id)
+
+    for expected in (AIRequestStatus.PENDING, AIRequestStatus.ERROR):
+        async with Session() as db:
+            [job] = await ai_job_service.claim_jobs(db, 1)
+            assert await ai_job_service.finish_job(db, job, error="upstream down", retry=True)
+        assert (await _job(Session, job_id)).status == expected
+
+
+async def test_requeue_stale(queue, monkeypatch):
+    monkeypatch.setattr(settings, "AI_JOB_MAX_ATTEMPTS", 3)
+    Session, user_id = queue
+    old = datetime.utcnow() - timedelta(seconds=settings.AI_JOB_TIMEOUT_SECONDS + 60)
+    [retry] = await _add_jobs(Session, user_id, status=AIRequestStatus.PROCESSING, started_at=old, attempts=1)
+    [give_up] = await _add_jobs(Session, user_id, status=AIRequestStatus.PROCESSING, started_at=old, attempts=3)
+    [running] = await _add_jobs(Session, user_id, status=AIRequestStatus.PROCESSING,
+                                started_at=datetime.utcnow(), attempts=1)
+
+    async with Session() as db:
+        assert await ai_job_service.requeue_stale(db) == 2
+
+    job = await _job(Session, retry)
+    assert (job.status, job.error, job.finished_at) == (AIRequestStatus.PENDING, None, None)
+    job = await _job(Session, give_up)
+    assert (job.status, job.error) == (AIRequestStatus.ERROR, "worker timed out")
+    assert job.finished_at is not None
+    assert (await _job(Session, running)).status == AIRequestStatus.PROCESSING
+
+
+async def test_wait_for_job_returns_when_finished(queue, monkeypatch):
+    monkeypatch.setattr(settings, "AI_JOB_WAIT_POLL_SECONDS", 0.05)
+    Session, user_id = queue
+    [job_id] = await _add_jobs(Session, user_id)
+
+    async def finish_soon():
+        await asyncio.sleep(0.2)
+        async with Session() as db:
+            await db.execute(
+                update(AIRequest).where(AIRequest.id == job_id)
+                .values(status=AIRequestStatus.DONE, result_text="summary")
+            )
+            await db.commit()
+
+    async with Session() as db:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        job, _ = await asyncio.gather(ai_job_service.wait_for_job(db, user_id, job_id, wait=10), finish_soon())
+        assert loop.time() - started < 5
+        assert (job.status, job.result_text) == (AIRequestStatus.DONE, "summary")
+        assert not db.in_transaction()  # no connection held between polls
+
+
+async def test_wait_for_job_times_out_and_scopes_to_owner(queue, monkeypatch):
+    monkeypatch.setattr(settings, "AI_JOB_WAIT_POLL_SECONDS", 0.05)
+    Session, user_id = queue
+    [job_id] = await _add_jobs(Session, user_id)
+
+    async with Session() as db:
+        job = await ai_job_service.wait_for_job(db, user_id, job_id, wait=0.2)
+        assert job.status == AIRequestStatus.PENDING
+        assert await ai_job_service.wait_for_job(db, user_id + 1, job_id, wait=0.2) is None
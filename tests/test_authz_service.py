@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, insert
+
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.models.workspace_member import WorkspaceMember
+from app.services import authz_service
+from app.services.authz_service import invalidate_workspace_role, require_workspace_role
+from app.utils.metrics import metrics
+
+pytestmark = pytest.mark.anyio
+
+OWNER, ADMIN, MEMBER, OUTSIDER = 1, 2, 3, 4
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    authz_service._role_cache.clear()
+    yield
+    authz_service._role_cache.clear()
+
+
+@pytest.fixture
+async def workspace(db_engine, db_sessionmaker):
+    """Workspace 1 owned by OWNER with an ADMIN and a MEMBER; returns a query counter."""
+    async with db_sessionmaker() as db:
+        await db.execute(insert(User), [
+            {"id": uid, "email": f"user{uid}@example.com", "hashed_password": "x"}
+            for uid in (OWNER, ADMIN, MEMBER, OUTSIDER)
+        ])
+        await db.execute(insert(Workspace).values(id=1, name="W", owner_id=OWNER))
+        await db.execute(insert(WorkspaceMember), [
+            {"workspace_id": 1, "user_id": ADMIN, "role": "admin"},
+            {"workspace_id": 1, "user_id": MEMBER, "role": "member"},
+        ])
+        await db.commit()
+
+    queries = []
+
+    def count(conn, cursor, statement, *args):
+        queries.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", count)
+    yield queries
+    event.remove(db_engine.sync_engine, "before_cursor_execute", count)
+
+
+def _counter(name: str) -> int:
+    return metrics.snapshot()["counters"].get(name, 0)
+
+
+@pytest.mark.parametrize("user_id, min_role, expected", [
+    (OWNER, "owner", "owner"),
+    (ADMIN, "admin", "admin"),
+    (MEMBER, "member", "member"),
+    (MEMBER, "admin", 403),
+    (OUTSIDER, "member", 403),
+])
+async def test_role_resolves_in_one_query(workspace, db_sessionmaker, user_id, min_role, expected):
+    async with db_sessionmaker() as db:
+        if isinstance(expected, int):
+            with pytest.raises(HTTPException) as exc:
+                await require_workspace_role(db, user_id, 1, min_role)
+            assert exc.value.status_code == expected
+        else:
+            assert await require_workspace_role(db, user_id, 1, min_role) == expected
+    assert len(workspace) == 1
+
+
+async def test_missing_workspace_is_404_in_one_query(workspace, db_sessionmaker):
+    async with db_sessionmaker() as db:
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc:
+                await require_workspace_role(db, OWNER, 99)
+            assert exc.value.status_code == 404
+    assert len(workspace) == 1
+
+
+async def test_request_memo_then_process_cache(workspace, db_sessionmaker):
+    request_hits, cache_hits = _counter("authz.hit.request"), _counter("authz.hit.cache")
+
+    async with db_sessionmaker() as db:
+        await require_workspace_role(db, MEMBER, 1)
+        await require_workspace_role(db, MEMBER, 1)
+    assert _counter("authz.hit.request") == request_hits + 1
+
+    async with db_sessionmaker() as db:
+        await require_workspace_role(db, MEMBER, 1)
+    assert _counter("authz.hit.cache") == cache_hits + 1
+    assert len(workspace) == 1
+
+
+async def test_invalidate_one_user_or_whole_workspace(workspace, db_sessionmaker):
+    async with db_sessionmaker() as db:
+        for user_id in (OWNER, ADMIN, MEMBER):
+            await require_workspace_role(db, user_id, 1)
+    cached = lambda: {key for key, _ in authz_service._role_cache.items()}  # noqa: E731
+    assert cached() == {(OWNER, 1), (ADMIN, 1), (MEMBER, 1)}
+
+    invalidate_workspace_role(1, MEMBER)
+    assert cached() == {(OWNER, 1), (ADMIN, 1)}
+
+    invalidate_workspace_role(1)
+    assert cached() == set()
+
+    async with db_sessionmaker() as db:
+        await require_workspace_role(db, ADMIN, 1)
+    assert len(workspace) == 4
+
+
+async def test_invalidations_reach_other_workers(fake_redis):
+    remote = _counter("authz.invalidated.remote")
+    authz_service.start_listener()
+    try:
+        # Wait for the subscription (which also clears the cache)
+        for _ in range(100):
+            if (await fake_redis.pubsub_numsub(authz_service.INVALIDATION_CHANNEL))[0][1]:
+                break
+            await asyncio.sleep(0.01)
+
+        for key in ((OWNER, 1), (MEMBER, 1), (MEMBER, 2)):
+            authz_service._role_cache.set(key, "member")
+
+        # As published by the worker that removed MEMBER from workspace 1
+        await fake_redis.publish(authz_service.INVALIDATION_CHANNEL, f"1:{MEMBER}")
+        for _ in range(100):
+            if authz_service._role_cache.get((MEMBER, 1)) is None:
+                break
+            await asyncio.sleep(0.01)
+        assert authz_service._role_cache.get((MEMBER, 1)) is None
+        assert authz_service._role_cache.get((OWNER, 1)) == "member"
+
+        # Our own invalidation is published for the others
+        invalidate_workspace_role(2)
+        assert authz_service._role_cache.get((MEMBER, 2)) is None
+        for _ in range(100):
+            if _counter("authz.invalidated.remote") == remote + 2:
+                break
+            await asyncio.sleep(0.01)
+        assert _counter("authz.invalidated.remote") == remote + 2
+        assert authz_service._role_cache.get((OWNER, 1)) == "member"
+    finally:
+        await authz_service.stop_listener()
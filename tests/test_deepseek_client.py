@@ -0,0 +1,134 @@
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.services import deepseek_client
+from app.utils.metrics import metrics
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeDeepSeek:
+    """In-process stand-in for the chat completions endpoint."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.status = 200
+        self.usage = {
+            "prompt_tokens": 100,
+            "completion_tokens": 7,
+            "prompt_cache_hit_tokens": 60,
+            "prompt_cache_miss_tokens": 40,
+        }
+        self.deltas = ["Hel", "lo", "!"]
+        self.app = FastAPI()
+        self.app.post("/v1/chat/completions")(self.completions)
+
+    async def completions(self, request: Request):
+        body = await request.json()
+        self.requests.append({"headers": dict(request.headers), "body": body})
+        if self.status != 200:
+            return JSONResponse({"error": {"message": "upstream failure"}}, status_code=self.status)
+        if body.get("stream"):
+            return StreamingResponse(self._events(body), media_type="text/event-stream")
+        return {
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(self.deltas)}}],
+            "usage": self.usage,
+        }
+
+    async def _events(self, body):
+        for delta in self.deltas:
+            yield f"data: {json.dumps({'choices': [{'index': 0, 'delta': {'content': delta}}]})}\n\n"
+        if (body.get("stream_options") or {}).get("include_usage"):
+            yield f"data: {json.dumps({'choices': [], 'usage': self.usage})}\n\n"
+        yield "data: [DONE]\n\n"
+
+
+@pytest.fixture
+async def upstream():
+    fake = FakeDeepSeek()
+    await deepseek_client.start(transport=httpx.ASGITransport(app=fake.app))
+    yield fake
+    await deepseek_client.close()
+
+
+def _counters() -> dict:
+    return metrics.snapshot()["counters"]
+
+
+def _delta(before: dict, name: str) -> int:
+    return _counters().get(name, 0) - before.get(name, 0)
+
+
+async def test_chat_returns_completion_and_records_usage(upstream):
+    before = _counters()
+    result = await deepseek_client.deepseek_chat([{"role": "user", "content": "hi"}], max_tokens=32)
+
+    assert result["choices"][0]["message"]["content"] == "Hello!"
+    sent = upstream.requests[0]
+    assert sent["headers"]["authorization"] == "Bearer test-key"
+    assert sent["body"] == {
+        "model": "deepseek-chat",
+        "messages": [{"role": "user", "content": "hi"}],
+        "max_tokens": 32,
+    }
+    assert _delta(before, "deepseek.requests") == 1
+    assert _delta(before, "deepseek.prompt_tokens") == 100
+    assert _delta(before, "deepseek.completion_tokens") == 7
+    assert _delta(before, "deepseek.prompt_cache_hit_tokens") == 60
+    assert _delta(before, "deepseek.prompt_cache_miss_tokens") == 40
+
+
+async def test_chat_reads_openai_style_cached_tokens(upstream):
+    upstream.usage = {"prompt_tokens": 50, "completion_tokens": 3, "prompt_tokens_details": {"cached_tokens": 20}}
+    before = _counters()
+    await deepseek_client.deepseek_chat([{"role": "user", "content": "hi"}])
+
+    assert _delta(before, "deepseek.prompt_cache_hit_tokens") == 20
+    assert _delta(before, "deepseek.prompt_cache_miss_tokens") == 30
+
+
+async def test_chat_upstream_error_raises_and_counts(upstream):
+    upstream.status = 503
+    before = _counters()
+    with pytest.raises(httpx.HTTPStatusError):
+        await deepseek_client.deepseek_chat([{"role": "user", "content": "hi"}])
+
+    assert _delta(before, "deepseek.errors") == 1
+    assert _delta(before, "deepseek.prompt_tokens") == 0
+
+
+async def test_stream_yields_deltas_and_records_final_usage(upstream):
+    before = _counters()
+    deltas = [d async for d in deepseek_client.deepseek_chat_stream([{"role": "user", "content": "hi"}])]
+
+    assert deltas == ["Hel", "lo", "!"]
+    body = upstream.requests[0]["body"]
+    assert body["stream"] is True
+    assert body["stream_options"] == {"include_usage": True}
+    assert _delta(before, "deepseek.prompt_tokens") == 100
+    assert _delta(before, "deepseek.prompt_cache_hit_tokens") == 60
+
+
+async def test_stream_error_raises_before_yielding(upstream):
+    upstream.status = 429
+    before = _counters()
+    with pytest.raises(httpx.HTTPStatusError):
+        async for _ in deepseek_client.deepseek_chat_stream([{"role": "user", "content": "hi"}]):
+            pytest.fail("no deltas expected from a failed request")
+
+    assert _delta(before, "deepseek.errors") == 1
+
+
+async def test_stream_closed_early_stops_reading(upstream):
+    before = _counters()
+    stream = deepseek_client.deepseek_chat_stream([{"role": "user", "content": "hi"}])
+    assert await stream.__anext__() == "Hel"
+    await stream.aclose()
+
+    # The usage chunk at the end was never read
+    assert _delta(before, "deepseek.prompt_tokens") == 0
+    assert _delta(before, "deepseek.errors") == 0
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import delete, func, insert, select, update
+
+from app.models.project import Project
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.utils.etag import collection_version, make_etag
+
+pytestmark = pytest.mark.anyio
+
+
+async def _etag(db, workspace_id):
+    versions = (await db.execute(
+        select(*collection_version(Project.version)).where(Project.workspace_id == workspace_id)
+    )).one()
+    return make_etag("projects", workspace_id, *versions)
+
+
+async def test_late_commit_below_max_changes_etag(db_sessionmaker):
+    async with db_sessionmaker() as db:
+        await db.execute(insert(User).values(id=1, email="owner@example.com", hashed_password="x"))
+        await db.execute(insert(Workspace).values(id=1, name="w", owner_id=1))
+        await db.execute(insert(Project), [
+            {"id": 1, "name": "a", "workspace_id": 1, "version": 5},
+            {"id": 2, "name": "b", "workspace_id": 1, "version": 10},
+        ])
+        await db.commit()
+        before = await _etag(db, 1)
+
+        # Version 7 was drawn before project 2 was written but commits after it
+        await db.execute(update(Project).where(Project.id == 1).values(version=7))
+        await db.commit()
+
+        assert await db.scalar(select(func.max(Project.version))) == 10
+        assert await _etag(db, 1) != before
+
+
+async def test_delete_changes_etag(db_sessionmaker):
+    async with db_sessionmaker() as db:
+        await db.execute(insert(User).values(id=1, email="owner@example.com", hashed_password="x"))
+        await db.execute(insert(Workspace).values(id=1, name="w", owner_id=1))
+        await db.execute(insert(Project), [
+            {"id": 1, "name": "a", "workspace_id": 1, "version": 5},
+            {"id": 2, "name": "b", "workspace_id": 1, "version": 10},
+        ])
+        await db.commit()
+        before = await _etag(db, 1)
+
+        await db.execute(delete(Project).where(Project.id == 1))
+        await db.commit()
+
+        assert await _etag(db, 1) != before
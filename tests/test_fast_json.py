@@ -0,0 +1,45 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+
+from app.models.activity_log import ActivityLog
+from app.schemas.activity_log_schema import ActivityLogResponse
+from app.utils import fast_json
+
+COLUMNS = [
+    ActivityLog.id, ActivityLog.action, ActivityLog.old_value, ActivityLog.new_value,
+    ActivityLog.user_id, ActivityLog.task_id, ActivityLog.created_at,
+]
+
+
+@pytest.fixture
+def rows():
+    engine = create_engine("sqlite://")
+    ActivityLog.__table__.create(engine)
+    start = datetime(2026, 10, 17, 12)
+    with engine.begin() as conn:
+        conn.execute(insert(ActivityLog), [
+            {"id": 1, "action": "TASK_CREATED", "old_value": None, "new_value": "Write docs",
+             "user_id": 1, "task_id": 7, "created_at": start},
+            {"id": 2, "action": "STATUS_CHANGED", "old_value": "TODO", "new_value": "DONE \"ü\"",
+             "user_id": 2, "task_id": None, "created_at": start + timedelta(microseconds=1)},
+        ])
+        yield conn.execute(select(*COLUMNS)).all()
+
+
+def test_encode_rows_matches_response_model(rows):
+    adapter = TypeAdapter(list[ActivityLogResponse])
+    expected = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+
+    assert json.loads(fast_json.encode_rows(rows)) == expected
+
+
+def test_encode_rows_empty():
+    assert fast_json.encode_rows([]) == b"[]"
+
+
+def test_aware_datetimes_end_in_z():
+    assert fast_json.encode({"at": datetime(2026, 1, 1, tzinfo=timezone.utc)}) == b'{"at":"2026-01-01T00:00:00Z"}'
@@ -0,0 +1,77 @@
+"""
+EXPLAIN checks for the hot-path indexes (migration 9c41d2a7e3b8 and later).
+Runs `alembic upgrade head` against TEST_DATABASE_URL, then asserts each hot
+query's plan uses its index. Sequential scans are disabled for the check:
+on near-empty test tables the planner would rightly prefer them.
+"""
+import json
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from conftest import ROOT
+
+pytestmark = pytest.mark.anyio
+
+HOT_QUERIES = [
+    # routes_activity_logs: by task / by user, newest first
+    ("ix_activity_logs_task_id_created_at",
+     "SELECT id FROM activity_logs WHERE task_id = 1 ORDER BY created_at DESC, id DESC LIMIT 20"),
+    ("ix_activity_logs_user_id_created_at",
+     "SELECT id FROM activity_logs WHERE user_id = 1 ORDER BY created_at DESC, id DESC LIMIT 20"),
+    ("ix_activity_logs_project_id_created_at",
+     "SELECT id FROM activity_logs WHERE project_id = 1 ORDER BY created_at DESC, id DESC LIMIT 20"),
+    # date_from / date_to
+    ("ix_activity_logs_created_at_brin",
+     "SELECT id FROM activity_logs WHERE created_at >= '2026-01-01' AND created_at <= '2026-02-01'"),
+    # routes_comments.get_comments
+    ("ix_comments_task_id_created_at",
+     "SELECT id FROM comments WHERE task_id = 1 ORDER BY created_at"),
+    # project log join (the plain project_id index was folded into the listing indexes)
+    ("ix_tasks_project_id",
+     "SELECT activity_logs.id FROM activity_logs JOIN tasks ON activity_logs.task_id = tasks.id "
+     "WHERE tasks.project_id = 1"),
+    # require_owner_or_admin / membership lookups
+    ("uq_workspace_members_workspace_id_user_id",
+     "SELECT role FROM workspace_members WHERE workspace_id = 1 AND user_id = 1"),
+    ("ix_projects_workspace_id", "SELECT id FROM projects WHERE workspace_id = 1"),
+    ("ix_workspaces_owner_id", "SELECT id FROM workspaces WHERE owner_id = 1"),
+]
+
+
+def _index_names(plan) -> set[str]:
+    names = set()
+    if isinstance(plan, dict):
+        if "Index Name" in plan:
+            names.add(plan["Index Name"])
+        for value in plan.values():
+            names |= _index_names(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            names |= _index_names(value)
+    return names
+
+
+@pytest.mark.parametrize("index, sql", HOT_QUERIES, ids=[name for name, _ in HOT_QUERIES])
+async def test_hot_query_uses_index(migrated_pg_url, index, sql):
+    engine = create_async_engine(migrated_pg_url)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("SET LOCAL enable_seqscan = off"))
+            plan = await conn.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    finally:
+        await engine.dispose()
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    used = _index_names(plan)
+    assert any(name.startswith(index) for name in used), f"{index} not used: {used or 'seq scan'}"
+
+
+async def test_downgrade_reverses_upgrade(migrated_pg_url):
+    cfg = Config(str(ROOT / "alembic.ini"))
+    command.downgrade(cfg, "base")
+    command.upgrade(cfg, "head")
@@ -0,0 +1,55 @@
+import orjson
+import pytest
+
+from app.core.config import settings
+from app.services import import_service
+from app.services.import_service import ImportFailed, comment_record
+from app.utils.ttl_cache import LRUTTLCache
+
+
+def test_comment_record_ignores_user_id_column():
+    assert comment_record({"task_id": "7", "user_id": "99", "content": "hi"}, 2) == (7, "hi")
+
+
+@pytest.mark.parametrize("row", [{"task_id": "7", "content": " "}, {"content": "hi"}])
+def test_comment_record_rejects_incomplete_rows(row):
+    with pytest.raises(ImportFailed):
+        comment_record(row, 2)
+
+
+@pytest.mark.anyio
+async def test_progress_is_only_visible_to_its_owner(fake_redis):
+    progress = await import_service.new_import("client-id", "comments", user_id=1)
+
+    assert await import_service.get_import("client-id", 1) is progress
+    assert await import_service.get_import("client-id", 2) is None
+
+
+@pytest.mark.anyio
+async def test_progress_is_visible_from_other_workers(fake_redis, monkeypatch):
+    progress = await import_service.new_import("shared-id", "tasks", user_id=1)
+    progress["rows"] = 40
+    await import_service.finish_import(progress, status="DONE", rows=50)
+
+    # Another worker: nothing in its local cache
+    monkeypatch.setattr(import_service, "import_progress", LRUTTLCache(maxsize=10, ttl=60))
+    polled = await import_service.get_import("shared-id", 1)
+    assert (polled["status"], polled["rows"], polled["kind"]) == ("DONE", 50, "tasks")
+    assert await import_service.get_import("shared-id", 2) is None
+    assert 0 < await fake_redis.ttl(import_service._progress_key(1, "shared-id")) <= settings.IMPORT_PROGRESS_TTL_SECONDS
+
+
+@pytest.mark.anyio
+async def test_progress_publishes_are_throttled(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_PROGRESS_PUBLISH_SECONDS", 60)
+    progress = await import_service.new_import("throttled", "tasks", user_id=1)
+
+    async def rows():
+        for line in range(2, 5):
+            yield line, {"task_id": "1", "content": "x"}
+
+    assert len([r async for r in import_service._records(rows(), comment_record, progress)]) == 3
+    assert progress["rows"] == 3
+    # Only the initial state reached Redis; the final state is forced by finish_import
+    stored = await fake_redis.get(import_service._progress_key(1, "throttled"))
+    assert orjson.loads(stored)["rows"] == 0
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.api.v1.routes_project_tasks import project_tasks_query
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.utils.pagination import encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+async def db(db_sessionmaker):
+    async with db_sessionmaker() as db:
+        await db.execute(insert(User).values(id=1, email="owner@example.com", hashed_password="x"))
+        await db.execute(insert(Workspace).values(id=1, name="w", owner_id=1))
+        await db.execute(insert(Project), [
+            {"id": 1, "name": "a", "workspace_id": 1},
+            {"id": 2, "name": "b", "workspace_id": 1},
+        ])
+        await db.execute(insert(Task), [
+            {
+                "id": i, "title": f"Task {i}", "description": f"d{i}", "project_id": 1,
+                "status": TaskStatus.DONE if i % 2 else TaskStatus.TODO,
+                "assignee_id": 1 if i % 3 == 0 else None,
+                "created_at": START + timedelta(minutes=i),
+            }
+            for i in range(1, 10)
+        ])
+        await db.execute(insert(Task).values(id=10, title="Other", project_id=2, created_at=START))
+        await db.commit()
+        yield db
+
+
+async def _ids(db, **kwargs):
+    return [row.id for row in (await db.execute(project_tasks_query(1, **kwargs))).all()]
+
+
+async def test_pages_newest_first_with_full_rows(db):
+    rows = (await db.execute(project_tasks_query(1, page_size=3))).all()
+
+    assert [r.id for r in rows] == [9, 8, 7]
+    assert rows[0].description == "d9"
+
+
+async def test_filters(db):
+    assert await _ids(db, status=[TaskStatus.TODO]) == [8, 6, 4, 2]
+    assert await _ids(db, assignee_id=1) == [9, 6, 3]
+    assert await _ids(db, q="task 1") == [1]
+    assert await _ids(db, created_from=START + timedelta(minutes=4),
+                      created_to=START + timedelta(minutes=5)) == [5, 4]
+
+
+async def test_cursor_continues_in_both_directions(db):
+    assert await _ids(db, cursor=encode_cursor(START + timedelta(minutes=7), 7), page_size=2) == [6, 5]
+    assert await _ids(db, descending=False, cursor=encode_cursor(START + timedelta(minutes=7), 7)) == [8, 9]
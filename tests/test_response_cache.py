@@ -0,0 +1,64 @@
+import orjson
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+from starlette.responses import Response
+
+import app.models  # noqa: F401
+from app.core.config import settings
+from app.db.base import Base
+from app.models.user import User
+from app.utils import response_cache as response_cache_module
+from app.utils.response_cache import ResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def replica(tmp_path):
+    """A second database standing in for a replica that has not seen the latest write."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def primary(db_sessionmaker, monkeypatch):
+    async with db_sessionmaker() as db:
+        await db.execute(insert(User).values(id=1, email="fresh@example.com", hashed_password="x"))
+        await db.commit()
+    monkeypatch.setattr(response_cache_module, "async_session", db_sessionmaker)
+    return db_sessionmaker
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/users", "query_string": b"", "headers": []})
+
+
+async def _emails(db):
+    return [{"email": email} for email in (await db.scalars(select(User.email))).all()]
+
+
+async def _get(cache, db):
+    out = await cache.cached(
+        _request(), Response(), scope="test", tags=["users"], model=list[dict], loader=_emails, db=db,
+    )
+    return orjson.loads(out.body)
+
+
+async def test_fill_reads_primary_not_request_session(primary, replica, fake_redis):
+    cache = ResponseCache()
+    async with replica() as lagging:
+        assert await _get(cache, lagging) == [{"email": "fresh@example.com"}]
+        # Second call is served from Redis
+        assert await _get(cache, lagging) == [{"email": "fresh@example.com"}]
+
+
+async def test_uncached_path_uses_request_session(primary, replica, fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+    async with replica() as lagging:
+        assert await _get(ResponseCache(), lagging) == []
@@ -0,0 +1,115 @@
+"""SQLite fallback of search_service.search (in-memory inverted index)."""
+import pytest
+from sqlalchemy import insert
+
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.services import search_service
+from app.services.search_service import SearchKind
+from app.utils.search_index import highlight
+
+pytestmark = pytest.mark.anyio
+
+OWNER, OUTSIDER = 1, 2
+
+
+@pytest.fixture
+async def db(db_sessionmaker):
+    async with db_sessionmaker() as db:
+        await db.execute(insert(User), [
+            {"id": OWNER, "email": "owner@example.com", "hashed_password": "x"},
+            {"id": OUTSIDER, "email": "outsider@example.com", "hashed_password": "x"},
+        ])
+        await db.execute(insert(Workspace), [
+            {"id": 1, "name": "mine", "owner_id": OWNER},
+            {"id": 2, "name": "theirs", "owner_id": OUTSIDER},
+        ])
+        await db.execute(insert(Project), [
+            {"id": 1, "name": "web", "workspace_id": 1},
+            {"id": 2, "name": "api", "workspace_id": 1},
+            {"id": 3, "name": "secret", "workspace_id": 2},
+        ])
+        await db.execute(insert(Task), [
+            {"id": 1, "title": "Fix login redirect", "description": "Users bounce back", "project_id": 1},
+            {"id": 2, "title": "Refresh tokens", "description": "Also fixes the login timeout", "project_id": 2},
+            {"id": 3, "title": "Login audit", "description": None, "project_id": 3},
+            {"id": 4, "title": "Escape login <b>names</b>",
+             "description": "<script>alert(1)</script> login", "project_id": 1},
+        ])
+        await db.execute(insert(Comment), [
+            {"id": 1, "task_id": 1, "user_id": OWNER, "content": "login works on staging"},
+            {"id": 2, "task_id": 3, "user_id": OUTSIDER, "content": "login audit started"},
+        ])
+        await db.commit()
+        yield db
+
+
+def _keys(hits):
+    return [(hit["kind"], hit["id"]) for hit in hits]
+
+
+async def test_title_match_outranks_description_match(db):
+    hits = await search_service.search(db, OWNER, "login", kind=SearchKind.tasks)
+
+    keys = _keys(hits)
+    assert set(keys) == {("task", 1), ("task", 2), ("task", 4)}
+    assert keys.index(("task", 1)) < keys.index(("task", 2))
+    assert [hit["rank"] for hit in hits] == sorted((hit["rank"] for hit in hits), reverse=True)
+
+
+async def test_required_and_excluded_terms(db):
+    assert _keys(await search_service.search(db, OWNER, "login redirect")) == [("task", 1)]
+    assert ("task", 1) not in _keys(await search_service.search(db, OWNER, "login -redirect"))
+
+
+async def test_results_limited_to_accessible_workspaces(db):
+    assert {hit["workspace_id"] for hit in await search_service.search(db, OWNER, "login")} == {1}
+    assert set(_keys(await search_service.search(db, OUTSIDER, "login"))) == {("task", 3), ("comment", 2)}
+
+
+async def test_workspace_project_and_kind_filters(db):
+    assert _keys(await search_service.search(db, OWNER, "login", workspace_id=2)) == []
+    assert {hit["project_id"] for hit in await search_service.search(db, OWNER, "login", project_id=2)} == {2}
+    assert _keys(await search_service.search(db, OWNER, "login", kind=SearchKind.comments)) == [("comment", 1)]
+
+
+async def test_snippets_are_escaped(db):
+    hits = await search_service.search(db, OWNER, "login", kind=SearchKind.tasks)
+    snippet = next(hit["snippet"] for hit in hits if hit["id"] == 4)
+
+    assert "<script>" not in snippet and "<b>" not in snippet
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in snippet
+    assert "<mark>login</mark>" in snippet
+
+
+def test_highlight_escapes_matched_words():
+    assert highlight('"login"<img src=x>', "login") == "<mark>&quot;login&quot;&lt;img</mark> src=x&gt;"
+
+
+async def test_postgres_snippets_are_escaped(migrated_pg_url):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    engine = create_async_engine(migrated_pg_url)
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            db = AsyncSession(bind=conn)
+            user_id = await db.scalar(
+                insert(User).values(email="search-xss@example.com", hashed_password="x").returning(User.id))
+            ws_id = await db.scalar(insert(Workspace).values(name="w", owner_id=user_id).returning(Workspace.id))
+            project_id = await db.scalar(
+                insert(Project).values(name="p", workspace_id=ws_id).returning(Project.id))
+            await db.execute(insert(Task).values(
+                title="zebrafish <img src=x onerror=alert(1)>", project_id=project_id))
+
+            hits = await search_service.search(db, user_id, "zebrafish", workspace_id=ws_id)
+
+            assert "<img" not in hits[0]["snippet"]
+            assert "<mark>zebrafish</mark>" in hits[0]["snippet"]
+            await db.close()
+            await trans.rollback()
+    finally:
+        await engine.dispose()
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.utils.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+LOCK_SECONDS = 30
+
+
+def _flight() -> SingleFlight:
+    # Separate instances with the same name behave like two worker processes
+    return SingleFlight("sf_test", lambda: LOCK_SECONDS, poll_seconds=0.01)
+
+
+class Cache:
+    def __init__(self):
+        self.value: bytes | None = None
+
+    async def fetch(self):
+        return self.value
+
+    async def store(self, value: bytes):
+        self.value = value
+
+
+async def test_waiter_in_another_process_gets_the_leaders_result(fake_redis):
+    cache, release = Cache(), asyncio.Event()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await release.wait()
+        return b"answer"
+
+    leader = asyncio.create_task(_flight().run("k", load, fetch=cache.fetch, store=cache.store))
+    await asyncio.sleep(0.05)
+    waiter = asyncio.create_task(_flight().run("k", load, fetch=cache.fetch, store=cache.store))
+    await asyncio.sleep(0.05)
+    release.set()
+
+    assert await asyncio.gather(leader, waiter) == [b"answer", b"answer"]
+    assert len(calls) == 1
+
+
+async def test_waiter_takes_over_when_the_leader_fails(fake_redis):
+    cache, fail = Cache(), asyncio.Event()
+
+    async def failing_load():
+        await fail.wait()
+        raise RuntimeError("upstream down")
+
+    async def load():
+        return b"second try"
+
+    leader = asyncio.create_task(_flight().run("k", failing_load, fetch=cache.fetch, store=cache.store))
+    await asyncio.sleep(0.05)
+    waiter = asyncio.create_task(_flight().run("k", load, fetch=cache.fetch, store=cache.store))
+    await asyncio.sleep(0.05)
+
+    loop = asyncio.get_running_loop()
+    failed_at = loop.time()
+    fail.set()
+    with pytest.raises(RuntimeError):
+        await leader
+    # Not after LOCK_SECONDS: the released lock is noticed on the next poll
+    assert await asyncio.wait_for(waiter, timeout=2) == b"second try"
+    assert loop.time() - failed_at < 2
+    assert cache.value == b"second try"
+
+
+async def test_redis_failure_after_load_keeps_the_result(fake_redis, monkeypatch):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return b"paid for"
+
+    async def broken_store(value):
+        raise RedisConnectionError("gone")
+
+    async def broken_delete(*keys):
+        raise RedisConnectionError("gone")
+
+    monkeypatch.setattr(fake_redis, "delete", broken_delete)
+    body = await _flight().run("k", load, fetch=Cache().fetch, store=broken_store)
+
+    assert body == b"paid for"
+    assert len(calls) == 1
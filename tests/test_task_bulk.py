@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.activity_log import ActivityLog
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.services import task_service
+from conftest import RecordingSession
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bulk_delete_clears_references_in_same_statement():
+    db = RecordingSession()
+    await task_service.bulk_delete(db, [1, 2], user_id=1, atomic=False)
+
+    assert len(db.statements) == 1
+    sql = db.statements[0]
+    assert "DELETE FROM comments" in sql
+    assert "UPDATE activity_logs SET project_id" in sql
+    assert "UPDATE ai_requests SET task_id" in sql
+    assert "INSERT INTO activity_logs" in sql
+
+
+async def _seed(db, email: str):
+    user_id = await db.scalar(insert(User).values(email=email, hashed_password="x").returning(User.id))
+    ws_id = await db.scalar(insert(Workspace).values(name="w", owner_id=user_id).returning(Workspace.id))
+    project_id = await db.scalar(insert(Project).values(name="p", workspace_id=ws_id).returning(Project.id))
+    task_id = await db.scalar(insert(Task).values(title="t", project_id=project_id).returning(Task.id))
+    await db.execute(insert(Comment).values(content="c", user_id=user_id, task_id=task_id))
+    await db.execute(insert(ActivityLog).values(action="TASK_CREATED", user_id=user_id, task_id=task_id))
+    return user_id, task_id, project_id
+
+
+async def test_bulk_delete_with_comments_and_logs(migrated_pg_url):
+    engine = create_async_engine(migrated_pg_url)
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            db = AsyncSession(bind=conn)
+            user_id, own_task, project_id = await _seed(db, "bulk-owner@example.com")
+            _, other_task, _ = await _seed(db, "bulk-other@example.com")
+
+            outcome = await task_service.bulk_delete(
+                db, [own_task, other_task], user_id=user_id, atomic=False
+            )
+
+            assert [r.id for r in outcome.rows] == [own_task]
+            assert outcome.errors == [(1, "Task not found")]  # not the caller's workspace
+            assert await db.scalar(select(Task.id).where(Task.id == other_task)) == other_task
+
+            # The task's history, including the delete, stays tied to the task and its project
+            logs = (await db.execute(
+                select(ActivityLog.action, ActivityLog.task_id, ActivityLog.project_id, ActivityLog.old_value)
+                .where(ActivityLog.user_id == user_id)
+                .order_by(ActivityLog.id)
+            )).all()
+            assert [(log.action, log.task_id, log.project_id) for log in logs] == [
+                ("TASK_CREATED", own_task, project_id), ("TASK_DELETED", own_task, project_id),
+            ]
+            assert f'"title" : "t"' in logs[1].old_value
+
+            await db.close()
+            await trans.rollback()
+    finally:
+        await engine.dispose()
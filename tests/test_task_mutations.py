@@ -0,0 +1,68 @@
+"""
+Every single-task mutation is one round trip: the DML and its activity log
+go out as one statement (run_task_mutation).
+"""
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.services import task_service
+from conftest import RecordingSession
+
+pytestmark = pytest.mark.anyio
+
+MUTATIONS = {
+    "create": lambda db, task_id, user_id, project_id: task_service.create_task(
+        db, project_id=project_id, title="t", description=None, user_id=user_id),
+    "update_fields": lambda db, task_id, user_id, project_id: task_service.update_task_fields(
+        db, task_id, title="renamed", description=None, user_id=user_id),
+    "change_status": lambda db, task_id, user_id, project_id: task_service.change_task_status(
+        db, task_id, TaskStatus.DONE, user_id=user_id),
+    "assign": lambda db, task_id, user_id, project_id: task_service.assign_task(
+        db, task_id, user_id, user_id=user_id),
+    "unassign": lambda db, task_id, user_id, project_id: task_service.unassign_task(
+        db, task_id, user_id=user_id),
+    "delete": lambda db, task_id, user_id, project_id: task_service.delete_task(
+        db, task_id, user_id=user_id),
+}
+
+
+@pytest.mark.parametrize("name", MUTATIONS)
+async def test_mutation_is_one_statement_with_its_log(name):
+    db = RecordingSession()
+    await MUTATIONS[name](db, 1, 1, 1)
+
+    assert len(db.statements) == 1
+    assert "INSERT INTO activity_logs" in db.statements[0]
+
+
+@pytest.mark.parametrize("name", MUTATIONS)
+async def test_mutation_is_one_round_trip(migrated_pg_url, name):
+    engine = create_async_engine(migrated_pg_url)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, sql, *args: statements.append(sql))
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            db = AsyncSession(bind=conn)
+            user_id = await db.scalar(
+                insert(User).values(email=f"{name}@example.com", hashed_password="x").returning(User.id))
+            ws_id = await db.scalar(insert(Workspace).values(name="w", owner_id=user_id).returning(Workspace.id))
+            project_id = await db.scalar(
+                insert(Project).values(name="p", workspace_id=ws_id).returning(Project.id))
+            task_id = await db.scalar(insert(Task).values(
+                title="t", project_id=project_id, assignee_id=user_id).returning(Task.id))
+
+            statements.clear()
+            await MUTATIONS[name](db, task_id, user_id, project_id)
+            assert len(statements) == 1, statements
+
+            await db.close()
+            await trans.rollback()
+    finally:
+        await engine.dispose()